@@ -10,7 +10,29 @@
 import os
 import sys
 import argparse
-import json
+import functools
+
+
+def _load_config(config_path):
+    """读取配置文件为字典
+
+    解析结果按文件修改时间与大小缓存，同一进程内重复调用且文件未改动时直接复用；
+    返回的字典在调用方之间共享，只能读取。
+    """
+    stat = os.stat(config_path)
+    return _load_config_cached(config_path, stat.st_mtime_ns, stat.st_size)
+
+
+@functools.lru_cache(maxsize=8)
+def _load_config_cached(config_path, mtime_ns, size):
+    """解析配置文件（mtime_ns、size 仅作为缓存键）
+
+    JSON 解析模块在此处按需导入：参数解析失败或仅查看 --help 时不再付出导入开销。
+    """
+    from src.core import json_utils
+
+    with open(config_path, 'rb') as f:
+        return json_utils.loads(f.read())
 
 
 def main():
@@ -68,6 +90,11 @@ def main():
         action="store_true",
         help="使用异步并行生成图片（仅在api模式下有效，性能提升约60%%）"
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="本次运行不读取也不写入内容缓存，强制重新生成文案"
+    )
     parser.add_argument(
         "--max-concurrent",
         type=int,
@@ -77,14 +104,13 @@ def main():
     args = parser.parse_args()
 
     config_path = args.config
-    if not os.path.exists(config_path):
+    # _load_config 本身会 stat 配置文件，不存在时直接捕获异常，不再单独检查一次
+    try:
+        config = _load_config(config_path)
+    except FileNotFoundError:
         print(f"❌ 配置文件不存在: {config_path}")
         sys.exit(1)
 
-    config = {}
-    with open(config_path, 'r', encoding='utf-8') as f:
-        config = json.load(f)
-
     # 验证topic模式的参数
     if args.mode == "topic":
         if not args.topic:
@@ -186,6 +212,10 @@ def main():
     # 如果命令行指定了 provider，覆盖配置文件中的设置
     if args.provider:
         config_manager.set("image_api_provider", args.provider)
+
+    # 强制重新生成时关闭内容缓存
+    if args.no_cache:
+        config_manager.set("cache.enabled", False)
     
     # 如果是topic模式，临时修改输入文件路径
     if args.mode == "topic":
@@ -219,6 +249,7 @@ def main():
         if use_async:
             print(f"🎨 使用异步并行模式生成图片（{max_concurrent}并发）\n")
             import asyncio
+            from concurrent.futures import ThreadPoolExecutor
             from src.async_image_service import AsyncImageService
             from src.image_generator import ImageGenerator
             
@@ -228,67 +259,79 @@ def main():
             
             # 使用异步服务生成图片
             async_service = AsyncImageService(config_manager)
-            
-            async def generate_images_async():
-                results = await async_service.generate_batch_images_async(
-                    prompts=prompts,
-                    max_concurrent=max_concurrent
-                )
-                return results, body_text
-            
-            # 运行异步任务
-            results, body_text = asyncio.run(generate_images_async())
-            
-            # 处理结果：下载图片并添加文字叠加
+
+            # 下载和文字叠加的保存目录
             prompts_dir = os.path.dirname(prompts_file)
-            
+
             # 分段正文内容
             content_segments = []
             if body_text:
                 story_scenes = [p.get('scene', '') for p in prompts if not p.get('is_cover', False)]
                 content_segments = image_gen.split_content_by_scenes(body_text, story_scenes)
-            
-            # 处理每张图片
-            success_count = 0
-            failed_count = 0
-            
-            for i, result in enumerate(results):
-                prompt_data = prompts[i]
+
+            def process_result(result, prompt_data):
+                """下载单张图片并添加文字叠加，返回是否成功"""
                 is_cover = prompt_data.get('is_cover', False)
-                index = prompt_data.get('index', i)
-                
-                if result.success:
-                    # 下载图片
+                index = prompt_data.get('index', result.index)
+                label = '封面' if is_cover else f'图{index}'
+
+                if not result.success:
+                    print(f"❌ {label} 生成失败: {result.error}")
+                    return False
+
+                # 下载图片
+                if is_cover:
+                    image_filename = "cover.png"
+                else:
+                    image_filename = f"image_{index:02d}.png"
+
+                save_path = os.path.join(prompts_dir, image_filename)
+
+                try:
+                    image_gen.download_image(result.image_url, save_path)
+
+                    # 添加文字叠加
                     if is_cover:
-                        image_filename = "cover.png"
+                        title = prompt_data.get('title', '')
+                        if title:
+                            image_gen.add_text_overlay(save_path, title, is_cover=True, position="top")
                     else:
-                        image_filename = f"image_{index:02d}.png"
-                    
-                    save_path = os.path.join(prompts_dir, image_filename)
-                    
-                    try:
-                        image_gen.download_image(result.image_url, save_path)
-                        
-                        # 添加文字叠加
-                        if is_cover:
-                            title = prompt_data.get('title', '')
-                            if title:
-                                image_gen.add_text_overlay(save_path, title, is_cover=True, position="top")
+                        if content_segments and index > 0 and index <= len(content_segments):
+                            content_segment = content_segments[index - 1]
+                            if content_segment:
+                                image_gen.add_text_overlay(save_path, content_segment, is_cover=False, position="bottom")
+
+                    print(f"✅ {label} 生成成功")
+                    return True
+                except Exception as e:
+                    print(f"❌ {label} 处理失败: {e}")
+                    return False
+
+            # 每张图片生成完立即下载并叠加文字，与其余图片的生成重叠进行；
+            # 后处理放在单个工作线程中串行执行，共享的字体对象不会被多个线程同时使用
+            success_count = 0
+            failed_count = 0
+
+            async def generate_images_async():
+                loop = asyncio.get_running_loop()
+
+                with ThreadPoolExecutor(max_workers=1) as post_process_pool:
+                    async def on_result(result, prompt_data):
+                        nonlocal success_count, failed_count
+                        if await loop.run_in_executor(post_process_pool, process_result, result, prompt_data):
+                            success_count += 1
                         else:
-                            if content_segments and index > 0 and index <= len(content_segments):
-                                content_segment = content_segments[index - 1]
-                                if content_segment:
-                                    image_gen.add_text_overlay(save_path, content_segment, is_cover=False, position="bottom")
-                        
-                        success_count += 1
-                        print(f"✅ {'封面' if is_cover else f'图{index}'} 生成成功")
-                    except Exception as e:
-                        failed_count += 1
-                        print(f"❌ {'封面' if is_cover else f'图{index}'} 处理失败: {e}")
-                else:
-                    failed_count += 1
-                    print(f"❌ {'封面' if is_cover else f'图{index}'} 生成失败: {result.error}")
-            
+                            failed_count += 1
+
+                    return await async_service.generate_batch_images_async(
+                        prompts=prompts,
+                        max_concurrent=max_concurrent,
+                        on_result=on_result
+                    )
+
+            # 运行异步任务
+            results = asyncio.run(generate_images_async())
+
             print(f"\n📊 生成统计: 成功 {success_count}/{len(results)}, 失败 {failed_count}/{len(results)}")
         else:
             print("🎨 使用串行模式生成图片\n")
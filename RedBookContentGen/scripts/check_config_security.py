@@ -13,14 +13,50 @@
     python scripts/check_config_security.py
     python scripts/check_config_security.py --config path/to/config.json
     python scripts/check_config_security.py --fix  # 自动修复（生成建议的配置文件）
+    python scripts/check_config_security.py --stream  # 流式检查超大配置文件（需要 ijson）
 """
 
 import argparse
+import copy
+import functools
+import io
 import json
 import re
 import sys
 from pathlib import Path
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, Iterator, List, Tuple, TypedDict
+
+# 添加项目根目录到路径，直接运行脚本时也能导入 src
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.core import json_utils
+
+try:
+    import ijson
+except ImportError:  # ijson 为可选依赖，仅 --stream 需要
+    HAS_IJSON = False
+else:
+    HAS_IJSON = True
+
+# 键路径中的数组索引，如 [0]
+_ARRAY_INDEX_PATTERN = re.compile(r"\[\d+\]")
+
+
+class _SensitivePattern(TypedDict):
+    """敏感值模式：值匹配 pattern 时按 severity、description 报告问题"""
+
+    pattern: re.Pattern[str]
+    severity: str
+    description: str
+
+
+@functools.lru_cache(maxsize=8)
+def _load_config_cached(path: str, mtime_ns: int, size: int) -> Any:
+    """按 (路径, 修改时间, 大小) 缓存解析结果，同一进程内重复检查未改动的配置时不再读盘解析
+
+    返回的字典在调用方之间共享，只能读取；需要修改时先深拷贝。
+    """
+    return json_utils.loads(Path(path).read_bytes())
 
 
 class SecurityIssue:
@@ -51,35 +87,39 @@ class SecurityIssue:
         self.description = description
         self.suggestion = suggestion
         self.value = value
+        # 报告中多行建议的续行缩进，构造时算一次
+        self.indented_suggestion = suggestion.replace("\n", "\n   ")
+        # 去掉数组索引后按点号拆分的键路径，生成修复配置时直接使用
+        self.path_parts = tuple(_ARRAY_INDEX_PATTERN.sub("", key_path).split("."))
 
 
 class ConfigSecurityChecker:
     """配置安全检查器"""
 
-    # 敏感信息模式
-    SENSITIVE_PATTERNS = {
+    # 敏感信息模式（正则在类定义时编译一次）
+    SENSITIVE_PATTERNS: Dict[str, _SensitivePattern] = {
         "api_key": {
-            "pattern": r"^(sk-[a-zA-Z0-9]{32,}|dashscope-[a-zA-Z0-9]{32,})",
+            "pattern": re.compile(r"^(sk-[a-zA-Z0-9]{32,}|dashscope-[a-zA-Z0-9]{32,})"),
             "severity": "critical",
             "description": "发现明文 API Key",
         },
         "password": {
-            "pattern": r".+",  # 任何非空值
+            "pattern": re.compile(r".+"),  # 任何非空值
             "severity": "critical",
             "description": "发现明文密码",
         },
         "token": {
-            "pattern": r"^[a-zA-Z0-9_-]{20,}$",
+            "pattern": re.compile(r"^[a-zA-Z0-9_-]{20,}$"),
             "severity": "critical",
             "description": "发现明文 Token",
         },
         "secret": {
-            "pattern": r".+",
+            "pattern": re.compile(r".+"),
             "severity": "critical",
             "description": "发现明文密钥",
         },
         "auth": {
-            "pattern": r"^Bearer\s+[a-zA-Z0-9_-]+$",
+            "pattern": re.compile(r"^Bearer\s+[a-zA-Z0-9_-]+$"),
             "severity": "warning",
             "description": "发现明文认证信息",
         },
@@ -102,6 +142,15 @@ class ConfigSecurityChecker:
         "access_key",
         "secret_key",
     ]
+    # 敏感字段名合并为一个交替正则，一次扫描判断字段名是否包含任一敏感词
+    SENSITIVE_FIELD_PATTERN = re.compile("|".join(map(re.escape, SENSITIVE_FIELD_NAMES)))
+
+    # 未匹配到具体类型的敏感字段
+    DEFAULT_SENSITIVE_PATTERN: _SensitivePattern = {
+        "pattern": re.compile(r".+"),
+        "severity": "warning",
+        "description": "发现敏感信息",
+    }
 
     # 环境变量引用模式
     ENV_VAR_PATTERN = re.compile(r"^\$\{[^}]+\}$")
@@ -122,13 +171,14 @@ class ConfigSecurityChecker:
         Returns:
             加载是否成功
         """
-        if not self.config_path.exists():
+        try:
+            stat = self.config_path.stat()
+        except FileNotFoundError:
             print(f"❌ 配置文件不存在: {self.config_path}")
             return False
 
         try:
-            with open(self.config_path, "r", encoding="utf-8") as f:
-                self.config_data = json.load(f)
+            self.config_data = _load_config_cached(str(self.config_path), stat.st_mtime_ns, stat.st_size)
             return True
         except json.JSONDecodeError as e:
             print(f"❌ 配置文件 JSON 格式错误: {e}")
@@ -144,55 +194,124 @@ class ConfigSecurityChecker:
             发现的安全问题列表
         """
         self.issues = []
-        self._check_dict(self.config_data, "")
+        self._walk()
         return self.issues
 
-    def _check_dict(self, data: Dict[str, Any], parent_path: str) -> None:
-        """递归检查字典
+    def _walk(self) -> None:
+        """遍历配置树，检查敏感字段的字符串值
 
-        Args:
-            data: 字典数据
-            parent_path: 父路径
+        用显式栈保存每一层尚未遍历完的迭代器，访问顺序与逐层递归相同（深度优先、按键顺序），
+        但不再为每层嵌套调用一次函数；字符串值只有字段名敏感时才拼接键路径。
         """
-        for key, value in data.items():
-            # 跳过注释字段
-            if key.startswith("_"):
+        stack: List[Tuple[Iterator[Tuple[Any, Any]], str, bool]] = [(iter(self.config_data.items()), "", False)]
+
+        while stack:
+            entries, parent_path, in_list = stack[-1]
+            entry = next(entries, None)
+            if entry is None:
+                stack.pop()
                 continue
 
-            current_path = f"{parent_path}.{key}" if parent_path else key
+            # 字典条目为 (键, 值)，列表条目为 (下标, 值)
+            key, value = entry
+            if not in_list and key.startswith("_"):
+                # 跳过注释字段
+                continue
 
             if isinstance(value, dict):
-                # 递归检查嵌套字典
-                self._check_dict(value, current_path)
+                stack.append((iter(value.items()), self._child_path(parent_path, key, in_list), False))
             elif isinstance(value, list):
-                # 检查列表
-                self._check_list(value, current_path)
+                stack.append((iter(enumerate(value)), self._child_path(parent_path, key, in_list), True))
             elif isinstance(value, str):
-                # 检查字符串值
-                self._check_string_value(key, value, current_path)
+                field_name = f"item_{key}" if in_list else key
+                if self._is_sensitive_field(field_name):
+                    self._check_string_value(field_name, value, self._child_path(parent_path, key, in_list))
 
-    def _check_list(self, data: List[Any], parent_path: str) -> None:
-        """递归检查列表
+    def check_stream(self) -> bool:
+        """流式读取并检查配置文件（需要 ijson），不在内存中构建完整的配置树
 
-        Args:
-            data: 列表数据
-            parent_path: 父路径
+        逐个处理 ijson 解析事件，结果与 load_config + check 相同：同样跳过 _ 开头的字段及其子树，
+        列表元素的字段名为 item_{下标}。ijson 会自动选用可用的最快后端（如 yajl2_c）。
+
+        Returns:
+            检查是否完成（文件不存在或 JSON 格式错误时为 False），发现的问题保存在 self.issues
         """
-        for i, item in enumerate(data):
-            current_path = f"{parent_path}[{i}]"
+        self.issues = []
+
+        # 每层打开的容器：[键路径, 是否列表, 当前键（字典）或当前下标（列表）]
+        stack: List[List[Any]] = []
+        # 位于被跳过的注释字段内部时，记录尚未闭合的容器层数
+        skip_depth = 0
+
+        try:
+            with open(self.config_path, "rb") as f:
+                for _, event, value in ijson.parse(f):
+                    if skip_depth:
+                        if event in ("start_map", "start_array"):
+                            skip_depth += 1
+                        elif event in ("end_map", "end_array"):
+                            skip_depth -= 1
+                        continue
+
+                    if event == "map_key":
+                        stack[-1][2] = value
+                        continue
+                    if event in ("end_map", "end_array"):
+                        stack.pop()
+                        continue
+
+                    # 其余事件都是一个值：容器开始或标量
+                    if not stack:
+                        # 根节点
+                        if event == "start_map":
+                            stack.append(["", False, None])
+                        elif event == "start_array":
+                            skip_depth = 1
+                        continue
+
+                    frame = stack[-1]
+                    parent_path, in_list = frame[0], frame[1]
+                    if in_list:
+                        frame[2] += 1
+                    key = frame[2]
+                    if not in_list and key.startswith("_"):
+                        # 跳过注释字段
+                        if event in ("start_map", "start_array"):
+                            skip_depth = 1
+                        continue
+
+                    if event == "start_map":
+                        stack.append([self._child_path(parent_path, key, in_list), False, None])
+                    elif event == "start_array":
+                        stack.append([self._child_path(parent_path, key, in_list), True, -1])
+                    elif event == "string":
+                        field_name = f"item_{key}" if in_list else key
+                        if self._is_sensitive_field(field_name):
+                            self._check_string_value(field_name, value, self._child_path(parent_path, key, in_list))
+        except FileNotFoundError:
+            print(f"❌ 配置文件不存在: {self.config_path}")
+            return False
+        except ijson.JSONError as e:
+            print(f"❌ 配置文件 JSON 格式错误: {e}")
+            return False
+
+        return True
 
-            if isinstance(item, dict):
-                self._check_dict(item, current_path)
-            elif isinstance(item, list):
-                self._check_list(item, current_path)
-            elif isinstance(item, str):
-                # 检查列表中的字符串值
-                self._check_string_value(f"item_{i}", item, current_path)
+    @staticmethod
+    def _child_path(parent_path: str, key: Any, in_list: bool) -> str:
+        """拼接子节点的键路径，如 api.openai.key、items[0]"""
+        if in_list:
+            return f"{parent_path}[{key}]"
+        return f"{parent_path}.{key}" if parent_path else key
+
+    def _is_sensitive_field(self, key: str) -> bool:
+        """字段名是否包含敏感词（不区分大小写）"""
+        return self.SENSITIVE_FIELD_PATTERN.search(key.lower()) is not None
 
     def _check_string_value(
         self, key: str, value: str, key_path: str
     ) -> None:
-        """检查字符串值
+        """检查敏感字段的字符串值（调用方已确认字段名敏感）
 
         Args:
             key: 配置键名
@@ -207,14 +326,7 @@ class ConfigSecurityChecker:
         if self.ENV_VAR_PATTERN.match(value):
             return
 
-        # 检查是否是敏感字段
         key_lower = key.lower()
-        is_sensitive_field = any(
-            sensitive in key_lower for sensitive in self.SENSITIVE_FIELD_NAMES
-        )
-
-        if not is_sensitive_field:
-            return
 
         # 确定问题类型
         issue_type = None
@@ -228,11 +340,9 @@ class ConfigSecurityChecker:
             issue_type = "sensitive"
 
         # 检查值是否匹配敏感模式
-        pattern_info = self.SENSITIVE_PATTERNS.get(
-            issue_type, {"pattern": r".+", "severity": "warning", "description": "发现敏感信息"}
-        )
+        pattern_info = self.SENSITIVE_PATTERNS.get(issue_type, self.DEFAULT_SENSITIVE_PATTERN)
 
-        if re.match(pattern_info["pattern"], value):
+        if pattern_info["pattern"].match(value):
             # 生成修复建议
             env_var_name = self._generate_env_var_name(key_path)
             suggestion = (
@@ -265,27 +375,24 @@ class ConfigSecurityChecker:
             环境变量名称（大写，下划线分隔）
         """
         # 移除数组索引
-        key_path = re.sub(r"\[\d+\]", "", key_path)
+        key_path = _ARRAY_INDEX_PATTERN.sub("", key_path)
 
         # 转换为大写，点号替换为下划线
         env_var = key_path.upper().replace(".", "_")
 
         return env_var
 
-    def _mask_value(self, value: str) -> str:
+    @staticmethod
+    def _mask_value(value: str) -> str:
         """隐藏敏感值的部分内容
 
         Args:
             value: 原始值
 
         Returns:
-            隐藏后的值
+            隐藏后的值（超过 8 个字符时显示前 4 个和后 4 个字符）
         """
-        if len(value) <= 8:
-            return "***"
-
-        # 显示前4个和后4个字符
-        return f"{value[:4]}...{value[-4:]}"
+        return f"{value[:4]}...{value[-4:]}" if len(value) > 8 else "***"
 
     def generate_report(self) -> str:
         """生成检查报告
@@ -301,64 +408,66 @@ class ConfigSecurityChecker:
         warning_issues = [i for i in self.issues if i.severity == "warning"]
         info_issues = [i for i in self.issues if i.severity == "info"]
 
-        report_lines = []
-        report_lines.append("=" * 70)
-        report_lines.append("配置安全检查报告")
-        report_lines.append("=" * 70)
-        report_lines.append(f"配置文件: {self.config_path}")
-        report_lines.append(
+        # 直接写入 StringIO，每行自带换行符，最后一行除外
+        buf = io.StringIO()
+        w = buf.write
+        w("=" * 70 + "\n")
+        w("配置安全检查报告\n")
+        w("=" * 70 + "\n")
+        w(f"配置文件: {self.config_path}\n")
+        w(
             f"发现问题: {len(self.issues)} 个 "
-            f"(严重: {len(critical_issues)}, 警告: {len(warning_issues)}, 信息: {len(info_issues)})"
+            f"(严重: {len(critical_issues)}, 警告: {len(warning_issues)}, 信息: {len(info_issues)})\n"
         )
-        report_lines.append("=" * 70)
-        report_lines.append("")
+        w("=" * 70 + "\n")
+        w("\n")
 
         # 输出严重问题
         if critical_issues:
-            report_lines.append("🔴 严重问题 (Critical)")
-            report_lines.append("-" * 70)
+            w("🔴 严重问题 (Critical)\n")
+            w("-" * 70 + "\n")
             for i, issue in enumerate(critical_issues, 1):
-                report_lines.append(f"\n{i}. {issue.description}")
-                report_lines.append(f"   位置: {issue.key_path}")
-                report_lines.append(f"   类型: {issue.issue_type}")
-                report_lines.append(f"   修复建议:\n   {issue.suggestion.replace(chr(10), chr(10) + '   ')}")
-            report_lines.append("")
+                w(f"\n{i}. {issue.description}\n")
+                w(f"   位置: {issue.key_path}\n")
+                w(f"   类型: {issue.issue_type}\n")
+                w(f"   修复建议:\n   {issue.indented_suggestion}\n")
+            w("\n")
 
         # 输出警告问题
         if warning_issues:
-            report_lines.append("🟡 警告问题 (Warning)")
-            report_lines.append("-" * 70)
+            w("🟡 警告问题 (Warning)\n")
+            w("-" * 70 + "\n")
             for i, issue in enumerate(warning_issues, 1):
-                report_lines.append(f"\n{i}. {issue.description}")
-                report_lines.append(f"   位置: {issue.key_path}")
-                report_lines.append(f"   类型: {issue.issue_type}")
-                report_lines.append(f"   修复建议:\n   {issue.suggestion.replace(chr(10), chr(10) + '   ')}")
-            report_lines.append("")
+                w(f"\n{i}. {issue.description}\n")
+                w(f"   位置: {issue.key_path}\n")
+                w(f"   类型: {issue.issue_type}\n")
+                w(f"   修复建议:\n   {issue.indented_suggestion}\n")
+            w("\n")
 
         # 输出信息问题
         if info_issues:
-            report_lines.append("ℹ️  信息提示 (Info)")
-            report_lines.append("-" * 70)
+            w("ℹ️  信息提示 (Info)\n")
+            w("-" * 70 + "\n")
             for i, issue in enumerate(info_issues, 1):
-                report_lines.append(f"\n{i}. {issue.description}")
-                report_lines.append(f"   位置: {issue.key_path}")
-                report_lines.append(f"   修复建议:\n   {issue.suggestion.replace(chr(10), chr(10) + '   ')}")
-            report_lines.append("")
+                w(f"\n{i}. {issue.description}\n")
+                w(f"   位置: {issue.key_path}\n")
+                w(f"   修复建议:\n   {issue.indented_suggestion}\n")
+            w("\n")
 
         # 总结和建议
-        report_lines.append("=" * 70)
-        report_lines.append("修复步骤总结")
-        report_lines.append("=" * 70)
-        report_lines.append("1. 创建 .env 文件（如果不存在）")
-        report_lines.append("2. 将敏感信息移动到 .env 文件中")
-        report_lines.append("3. 在配置文件中使用 ${ENV_VAR} 语法引用环境变量")
-        report_lines.append("4. 确保 .env 文件已添加到 .gitignore")
-        report_lines.append("5. 重新运行此脚本验证修复结果")
-        report_lines.append("")
-        report_lines.append("参考文档: docs/CONFIG.md")
-        report_lines.append("=" * 70)
-
-        return "\n".join(report_lines)
+        w("=" * 70 + "\n")
+        w("修复步骤总结\n")
+        w("=" * 70 + "\n")
+        w("1. 创建 .env 文件（如果不存在）\n")
+        w("2. 将敏感信息移动到 .env 文件中\n")
+        w("3. 在配置文件中使用 ${ENV_VAR} 语法引用环境变量\n")
+        w("4. 确保 .env 文件已添加到 .gitignore\n")
+        w("5. 重新运行此脚本验证修复结果\n")
+        w("\n")
+        w("参考文档: docs/CONFIG.md\n")
+        w("=" * 70)
+
+        return buf.getvalue()
 
     def generate_fixed_config(self) -> Tuple[Dict[str, Any], Dict[str, str]]:
         """生成修复后的配置
@@ -366,7 +475,7 @@ class ConfigSecurityChecker:
         Returns:
             (修复后的配置字典, 环境变量字典)
         """
-        fixed_config = self._deep_copy_dict(self.config_data)
+        fixed_config = copy.deepcopy(self.config_data)
         env_vars = {}
 
         for issue in self.issues:
@@ -375,49 +484,29 @@ class ConfigSecurityChecker:
                 env_var_name = self._generate_env_var_name(issue.key_path)
 
                 # 替换配置值为环境变量引用
-                self._set_nested_value(fixed_config, issue.key_path, f"${{{env_var_name}}}")
+                self._set_nested_value(fixed_config, issue.path_parts, f"${{{env_var_name}}}")
 
                 # 记录环境变量
                 env_vars[env_var_name] = issue.value
 
         return fixed_config, env_vars
 
-    def _deep_copy_dict(self, data: Any) -> Any:
-        """深拷贝字典
-
-        Args:
-            data: 数据
-
-        Returns:
-            拷贝后的数据
-        """
-        if isinstance(data, dict):
-            return {key: self._deep_copy_dict(value) for key, value in data.items()}
-        elif isinstance(data, list):
-            return [self._deep_copy_dict(item) for item in data]
-        else:
-            return data
-
-    def _set_nested_value(self, data: Dict[str, Any], key_path: str, value: Any) -> None:
+    def _set_nested_value(self, data: Dict[str, Any], path_parts: Tuple[str, ...], value: Any) -> None:
         """设置嵌套值
 
         Args:
             data: 字典数据
-            key_path: 键路径
+            path_parts: 已去掉数组索引（暂不支持）并拆分的键路径，见 SecurityIssue.path_parts
             value: 值
         """
-        # 移除数组索引（暂不支持）
-        key_path = re.sub(r"\[\d+\]", "", key_path)
-
-        keys = key_path.split(".")
         current = data
 
-        for key in keys[:-1]:
+        for key in path_parts[:-1]:
             if key not in current:
                 current[key] = {}
             current = current[key]
 
-        current[keys[-1]] = value
+        current[path_parts[-1]] = value
 
 
 def main():
@@ -438,6 +527,9 @@ def main():
 
   # 生成修复后的配置文件并指定输出路径
   python scripts/check_config_security.py --fix --output config/config.fixed.json
+
+  # 流式检查超大配置文件（需要 ijson）
+  python scripts/check_config_security.py --stream
         """,
     )
 
@@ -467,18 +559,39 @@ def main():
         help=".env 文件输出路径（默认: .env.generated）",
     )
 
+    parser.add_argument(
+        "--stream",
+        "-s",
+        action="store_true",
+        help="流式解析配置文件，不在内存中构建完整配置（需要 ijson，不能与 --fix 同时使用）",
+    )
+
     args = parser.parse_args()
 
+    if args.stream:
+        if args.fix:
+            parser.error("--stream 不能与 --fix 同时使用（生成修复配置需要完整的配置内容）")
+        if not HAS_IJSON:
+            print("❌ 流式检查需要 ijson，请先安装: pip install ijson")
+            sys.exit(1)
+
     # 创建检查器
     checker = ConfigSecurityChecker(args.config)
 
-    # 加载配置
-    if not checker.load_config():
-        sys.exit(1)
+    if args.stream:
+        # 流式读取时边解析边检查
+        print("🔍 正在检查配置文件安全性...\n")
+        if not checker.check_stream():
+            sys.exit(1)
+        issues = checker.issues
+    else:
+        # 加载配置
+        if not checker.load_config():
+            sys.exit(1)
 
-    # 执行检查
-    print("🔍 正在检查配置文件安全性...\n")
-    issues = checker.check()
+        # 执行检查
+        print("🔍 正在检查配置文件安全性...\n")
+        issues = checker.check()
 
     # 生成报告
     report = checker.generate_report()
@@ -499,8 +612,7 @@ def main():
             output_file = Path(output_path)
             output_file.parent.mkdir(parents=True, exist_ok=True)
 
-            with open(output_file, "w", encoding="utf-8") as f:
-                json.dump(fixed_config, f, indent=2, ensure_ascii=False)
+            output_file.write_bytes(json_utils.dumps(fixed_config, indent=True))
 
             print(f"✅ 修复后的配置文件已保存: {output_path}")
         except Exception as e:
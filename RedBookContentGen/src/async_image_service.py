@@ -20,12 +20,17 @@ import asyncio
 import aiohttp
 import re
 import time
-from typing import List, Dict, Optional
+from typing import Awaitable, Callable, List, Dict, Optional
 from dataclasses import dataclass
 
 from src.core.config_manager import ConfigManager
 from src.core.logger import Logger
 
+# 简化提示词时移除的可能敏感的关键词，合并为一个正则，一次扫描完成移除
+_SIMPLIFY_SENSITIVE_WORDS = ("血腥", "暴力", "色情", "政治", "敏感", "争议", "战争", "武器", "裸露", "恐怖", "死亡")
+_SIMPLIFY_SENSITIVE_WORD_PATTERN = re.compile("|".join(map(re.escape, _SIMPLIFY_SENSITIVE_WORDS)))
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+
 
 @dataclass
 class ImageGenerationResult:
@@ -339,19 +344,18 @@ class AsyncImageService:
             简化后的提示词
         """
         # 移除可能敏感的关键词
-        sensitive_words = ["血腥", "暴力", "色情", "政治", "敏感", "争议", "战争", "武器", "裸露", "恐怖", "死亡"]
-
-        simplified = prompt
-        for word in sensitive_words:
-            simplified = simplified.replace(word, "")
+        simplified = _SIMPLIFY_SENSITIVE_WORD_PATTERN.sub("", prompt)
 
         # 清理多余空格
-        simplified = re.sub(r"\s+", " ", simplified).strip()
+        simplified = _WHITESPACE_PATTERN.sub(" ", simplified).strip()
 
         return simplified
 
     async def generate_batch_images_async(
-        self, prompts: List[Dict], max_concurrent: int = 3
+        self,
+        prompts: List[Dict],
+        max_concurrent: int = 3,
+        on_result: Optional[Callable[[ImageGenerationResult, Dict], Awaitable[None]]] = None,
     ) -> List[ImageGenerationResult]:
         """
         并行生成多张图片
@@ -359,9 +363,11 @@ class AsyncImageService:
         Args:
             prompts: 提示词列表，每个元素包含 prompt, index, is_cover 等字段
             max_concurrent: 最大并发数
+            on_result: 可选的异步回调，每张图片生成结束（成功或失败）后立即以 (结果, 提示词数据) 调用，
+                调用方可借此在其余图片仍在生成时开始下载和后处理；回调在释放并发名额后执行，其异常只记录日志
 
         Returns:
-            图片生成结果列表
+            图片生成结果列表（与 prompts 顺序一致）
         """
         Logger.info(
             f"开始并行生成{len(prompts)}张图片", logger_name="async_image_service", max_concurrent=max_concurrent
@@ -370,38 +376,36 @@ class AsyncImageService:
         # 创建信号量控制并发
         semaphore = asyncio.Semaphore(max_concurrent)
 
-        async def generate_with_semaphore(prompt_data: Dict) -> ImageGenerationResult:
-            """带信号量控制的生成函数"""
-            async with semaphore:
-                return await self.generate_single_image_async(
+        async def generate_with_semaphore(i: int, prompt_data: Dict) -> ImageGenerationResult:
+            """带信号量控制的生成函数，单张图片的异常转换为失败结果，确保错误隔离"""
+            try:
+                async with semaphore:
+                    result = await self.generate_single_image_async(
+                        prompt=prompt_data.get("prompt", ""),
+                        index=prompt_data.get("index", 0),
+                        is_cover=prompt_data.get("is_cover", False),
+                        size=prompt_data.get("size"),
+                    )
+            except Exception as e:
+                Logger.error(f"图片{i}生成时发生异常", logger_name="async_image_service", error=str(e))
+                result = ImageGenerationResult(
+                    success=False,
+                    error=str(e),
                     prompt=prompt_data.get("prompt", ""),
-                    index=prompt_data.get("index", 0),
+                    index=prompt_data.get("index", i),
                     is_cover=prompt_data.get("is_cover", False),
-                    size=prompt_data.get("size"),
                 )
 
-        # 创建所有任务
-        tasks = [generate_with_semaphore(p) for p in prompts]
-
-        # 并行执行，使用 return_exceptions=True 确保错误隔离
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-
-        # 处理异常结果
-        processed_results = []
-        for i, result in enumerate(results):
-            if isinstance(result, Exception):
-                Logger.error(f"图片{i}生成时发生异常", logger_name="async_image_service", error=str(result))
-                processed_results.append(
-                    ImageGenerationResult(
-                        success=False,
-                        error=str(result),
-                        prompt=prompts[i].get("prompt", ""),
-                        index=prompts[i].get("index", i),
-                        is_cover=prompts[i].get("is_cover", False),
-                    )
-                )
-            else:
-                processed_results.append(result)
+            if on_result is not None:
+                try:
+                    await on_result(result, prompt_data)
+                except Exception as e:
+                    Logger.error(f"图片{i}结果回调时发生异常", logger_name="async_image_service", error=str(e))
+
+            return result
+
+        # 并行执行所有任务
+        processed_results = list(await asyncio.gather(*(generate_with_semaphore(i, p) for i, p in enumerate(prompts))))
 
         # 统计结果
         success_count = sum(1 for r in processed_results if r.success)
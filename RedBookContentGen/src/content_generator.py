@@ -7,14 +7,22 @@
 
 import os
 import json
-from datetime import datetime
-import re
-from typing import List, Dict, Tuple, Optional, TYPE_CHECKING, Any, Callable
+import functools
+from datetime import datetime, timezone
+import threading
+import time
+import zipfile
+from collections import Counter
+from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Dict, Tuple, Optional, TYPE_CHECKING, Any, Callable, Iterable, Mapping, Sequence, Union
 
 import openpyxl
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Font, Alignment, PatternFill
 from openpyxl.utils import get_column_letter
 import openai
+from pydantic import BaseModel, ValidationError
 
 from src.core.logger import Logger
 from src.core.api_handler import APIHandler
@@ -23,16 +31,279 @@ from src.core.exceptions import (
     FileNotFoundError as CustomFileNotFoundError,
     ContentValidationError,
     ContentSafetyError,
+    APIError,
     wrap_exception,
 )
 
+from src.core import json_utils
+from src.text_processor import TextProcessor
+
+try:
+    # openpyxl 的内部接口，用于指定 xlsx 压缩级别；不可用时回退到 Workbook.save
+    from openpyxl.writer.excel import ExcelWriter
+except ImportError:
+    HAS_EXCEL_WRITER = False
+else:
+    HAS_EXCEL_WRITER = True
+
+try:
+    import xlsxwriter
+except ImportError:  # xlsxwriter 为可选依赖，未安装时回退到 openpyxl 导出
+    HAS_XLSXWRITER = False
+else:
+    HAS_XLSXWRITER = True
+
 if TYPE_CHECKING:
     from src.core.config_manager import ConfigManager
 
 
+# Excel 输出的表头与列宽（两者一一对应）
+_EXCEL_SHEET_TITLE = "小红书内容"
+_EXCEL_HEADERS = (
+    "生成时间",
+    "原始内容",
+    "标题1",
+    "标题2",
+    "标题3",
+    "标题4",
+    "标题5",
+    "正文内容",
+    "标签",
+    "图片提示词1",
+    "图片提示词2",
+    "图片提示词3",
+    "图片提示词4",
+    "封面标题",
+    "封面提示词",
+    "图片保存路径",
+)
+_EXCEL_COLUMN_WIDTHS = (18, 40, 30, 30, 30, 30, 30, 60, 40, 50, 50, 50, 50, 30, 50, 30)
+_EXCEL_COLUMN_LETTERS = tuple(get_column_letter(i) for i in range(1, len(_EXCEL_HEADERS) + 1))
+_EXCEL_HEADER_FILL = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
+_EXCEL_HEADER_FONT = Font(bold=True, color="FFFFFF", size=11)
+_EXCEL_HEADER_ALIGNMENT = Alignment(horizontal="center", vertical="center")
+_EXCEL_DATA_ALIGNMENT = Alignment(horizontal="left", vertical="top", wrap_text=True)
+# 使用 xlsxwriter 导出时的等价样式
+_XLSXWRITER_HEADER_FORMAT = {
+    "bold": True,
+    "font_color": "#FFFFFF",
+    "font_size": 11,
+    "bg_color": "#366092",
+    "pattern": 1,
+    "align": "center",
+    "valign": "vcenter",
+}
+_XLSXWRITER_DATA_FORMAT = {"align": "left", "valign": "top", "text_wrap": True}
+
+
+@functools.lru_cache(maxsize=4096)
+def _scan_sensitive_keywords(text: str) -> Tuple[Tuple[str, ...], str]:
+    """
+    扫描敏感词并给出移除后的文本，结果按文本缓存
+
+    检查与修复、可疑内容记录会对同一段文字重复检查，字符串不可变，缓存结果可直接复用。
+
+    Args:
+        text: 要检查的内容
+
+    Returns:
+        (命中的敏感词（去重并保持出现顺序）, 移除敏感词并折叠空白后的文本)
+    """
+    found_keywords = tuple(dict.fromkeys(TextProcessor.SENSITIVE_KEYWORD_PATTERN.findall(text)))
+    if not found_keywords:
+        return found_keywords, text
+    modified_text = TextProcessor.SENSITIVE_KEYWORD_PATTERN.sub("", text)
+    return found_keywords, TextProcessor.WHITESPACE_PATTERN.sub(" ", modified_text).strip()
+
+
+# 内容生成提示词模板：固定部分在模块加载时构建一次，原始内容拼接在末尾
+_GENERATION_SYSTEM_PROMPT = "你是一位专业的小红书内容创作专家。请严格按照JSON格式输出。"
+_GENERATION_PROMPT_BODY = """# Role: 老北京文化·小红书金牌运营 & 视觉导演
+
+    ## Goals
+    1. 读取用户输入的原始内容。
+    2. 改写为具备"爆款潜质"的小红书文案。文案必须充满生活气息，避免总结性、AI感的陈述，多用细节描写。
+    3. 生成 3 - 5 组 AI 绘画提示词。
+
+    ## Constraints
+    - **文字风格**：必须地道，多用短句，多用Emoji。拒绝"总分总"的枯燥结构。
+    - **画面风格**：90年代北京纪实，胶片质感。
+    - **牌匾文字**：如果涉及故宫牌匾，请明确要求文字为"建极绥猷"，并描述其颜色（蓝底金字）。
+
+    ## Workflow
+    ### Step 1: 文案创作
+    - 请提供 5 个【标题】。
+    - 正文：开头要抓人，中间要动人，结尾要有互动。
+
+    ### Step 2: 画面提取
+    - 包含至少 4 张故事图提示词。
+    - 牌匾策略：针对包含牌匾的图，在 Prompt 中强制加入"建极绥猷 (Jian Ji Sui You)"字样。
+
+    ## Output Format
+    {{
+      "titles": ["...", "..."],
+      "content": "...",
+      "tags": "...",
+      "image_prompts": [
+        {{"scene": "...", "prompt": "..."}},
+        ...
+      ],
+      "cover": {{"scene": "...", "title": "...", "prompt": "..."}}
+    }}
+
+"""
+_GENERATION_PROMPT_PREFIX = _GENERATION_PROMPT_BODY + "    ## 原始内容：\n    "
+
+# 主编评估提示词：待评估文案夹在固定的前后两段之间
+_EVALUATION_SYSTEM_PROMPT = "你是一位极其挑剔的小红书内容主编。"
+_EVALUATION_PROMPT_PREFIX = "请作为资深主编审阅以下小红书文案：\n    ---\n    "
+_EVALUATION_PROMPT_SUFFIX = """
+    ---
+    评价该文案是否符合：
+    1. 京味儿是否地道？
+    2. 情感是否细腻？
+    3. 排版是否舒适？
+    4. 是否通过"叙事"而不是"说教"？
+
+    如果评价为"优秀"，请直接返回"PASS"。
+    如果需要优化，请指出不足，并给出修改意见。"""
+
+# 开启 api.openai.self_review 时插在原始内容之前的自审要求，由模型在一次请求内完成初稿、自评和改写
+_SELF_REVIEW_INSTRUCTION = """    ## Self-Review
+    输出前请先在内部完成初稿，再以资深主编的标准逐条自审：
+    1. 京味儿是否地道？
+    2. 情感是否细腻？
+    3. 排版是否舒适？
+    4. 是否通过"叙事"而不是"说教"？
+    根据自审结果修改后，只输出修改后的最终 JSON，并额外附带 "_self_review" 字段，用一句话说明做了哪些修改。
+
+"""
+_SELF_REVIEW_PROMPT_PREFIX = _GENERATION_PROMPT_BODY + _SELF_REVIEW_INSTRUCTION + "    ## 原始内容：\n    "
+_GENERATION_PROMPT_SUFFIX = "\n    "
+
+# 多条输入合并为一次请求时追加的说明，{count} 为输入条数
+_COMBINED_PROMPT_INSTRUCTION = """    ## 批量要求
+    以下共有 {count} 段原始内容，请对每段分别完成上述创作。
+    输出 JSON 对象 {{"results": [...]}}，results 按原始内容的顺序排列，每一项都是一个符合 Output Format 的对象。
+
+"""
+
+
+# AI 生成结果的结构要求（与提示词中的 Output Format 一致），由 pydantic 在模块加载时构建一次校验器
+# 图片提示词数量与封面字段由保存环节按缺省值处理，这里只约束字段存在与类型
+class _GeneratedContentSchema(BaseModel):
+    """生成结果的顶层结构，只用于校验"""
+
+    titles: List[str]
+    content: str
+    tags: Union[str, List[Any]]
+    image_prompts: List[Dict[str, Any]]
+    cover: Dict[str, Any]
+
+
+# content.md 的固定结构，各段内容由 save_full_content 填入后一次渲染
+_CONTENT_MD_TEMPLATE = (
+    "# 小红书文案预览\n\n"
+    "**生成时间**: {generated_at}\n\n"
+    "## 📕 可选标题\n\n"
+    "{titles_block}\n"
+    "## 📝 正文内容\n\n"
+    "{content}\n\n"
+    "## 🏷️ 标签\n\n"
+    "{tags}\n\n"
+    "## 🎨 AI绘画提示词\n\n"
+    "{prompts_block}\n"
+    "---\n\n"
+    "## 📄 原始输入内容\n\n"
+    "{raw_content}"
+)
+_CONTENT_MD_PROMPT_TEMPLATE = "### {heading}\n\n```\n{prompt}\n```\n\n"
+
+
+@dataclass(slots=True)
+class ImagePromptItem:
+    """单张故事图的提示词"""
+
+    scene: str = ""
+    prompt: str = ""
+
+
+@dataclass(slots=True)
+class CoverItem:
+    """封面的短标题与提示词"""
+
+    title: str = ""
+    prompt: str = ""
+
+
+@dataclass(slots=True)
+class RedBookContent:
+    """
+    保存环节使用的生成结果
+
+    由 AI 返回的字典解析一次得到：缺省字段填充为空值，故事图只保留前 4 张，
+    生成时间也在此时取一次，Excel、JSONL、图片提示词、完整内容各处保存直接按属性读取。
+    """
+
+    titles: List[str] = field(default_factory=list)
+    content: str = ""
+    tags: str = ""
+    image_prompts: List[ImagePromptItem] = field(default_factory=list)
+    cover: CoverItem = field(default_factory=CoverItem)
+    generated_at: str = ""
+
+    # 保存的故事图数量
+    MAX_STORY_IMAGES = 4
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "RedBookContent":
+        """
+        从 AI 返回的字典构建
+
+        Args:
+            data: 生成的内容数据
+
+        Returns:
+            RedBookContent 实例
+        """
+        tags = data.get("tags") or ""
+        if isinstance(tags, list):
+            tags = " ".join(str(tag) for tag in tags)
+        cover = data.get("cover") or {}
+        return cls(
+            titles=list(data.get("titles") or []),
+            content=data.get("content") or "",
+            tags=tags,
+            image_prompts=[
+                ImagePromptItem(scene=item.get("scene", ""), prompt=item.get("prompt", ""))
+                for item in (data.get("image_prompts") or [])[: cls.MAX_STORY_IMAGES]
+            ],
+            cover=CoverItem(title=cover.get("title", ""), prompt=cover.get("prompt", "")),
+            generated_at=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        )
+
+    @classmethod
+    def coerce(cls, data: Union[Mapping[str, Any], "RedBookContent"]) -> "RedBookContent":
+        """已是 RedBookContent 时原样返回，否则从字典构建"""
+        if isinstance(data, RedBookContent):
+            return data
+        return cls.from_dict(data)
+
+
 class RedBookContentGenerator:
     """小红书内容生成器"""
 
+    # 合并请求时每组的最大条数与原始内容总字数
+    COMBINED_REQUEST_MAX_ITEMS = 5
+    COMBINED_REQUEST_MAX_CHARS = 6000
+
+    # 批量写入Excel时每多少行保存一次检查点
+    EXCEL_CHECKPOINT_INTERVAL = 100
+
+    # Batch API 轮询间隔与最长等待时间（秒）
+    BATCH_API_POLL_INTERVAL = 30
+    BATCH_API_MAX_WAIT = 24 * 3600
+
     def __init__(self, config_manager: Optional["ConfigManager"] = None, config_path: str = "config/config.json") -> None:
         """
         初始化生成器
@@ -68,11 +339,30 @@ class RedBookContentGenerator:
             tpm_limiter=self.tpm_limiter if hasattr(self, "tpm_limiter") else None,
             rate_limit_enabled=self._rate_limit_enabled if hasattr(self, "_rate_limit_enabled") else False,
             logger_name="content_generator",
+            stream=self.config_manager.get("api.openai.stream", False),
         )
 
         self.setup_paths()
 
-        # API Key会在调用时检查，这里不需要初始化
+        # OpenAI 客户端在首次调用时创建并复用（API Key 在调用时检查）
+        self._openai_client: Optional[Tuple[openai.OpenAI, str]] = None
+        self._openai_client_lock = threading.Lock()
+
+        # Excel / JSONL 为追加写入，同一时间只允许一个线程写
+        self._table_output_lock = threading.Lock()
+
+    def close(self) -> None:
+        """关闭复用的 OpenAI 客户端，释放连接池"""
+        with self._openai_client_lock:
+            if self._openai_client is not None:
+                self._openai_client[0].close()
+                self._openai_client = None
+
+    def __enter__(self) -> "RedBookContentGenerator":
+        return self
+
+    def __exit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        self.close()
 
     def _init_cache(self) -> None:
         """初始化缓存管理器"""
@@ -101,6 +391,22 @@ class RedBookContentGenerator:
             self._cache_enabled = False
             Logger.info("缓存已禁用", logger_name="content_generator")
 
+        # 持久化的内容缓存（跨运行复用），首次使用时创建
+        self._persist_cache_enabled = self._cache_enabled and self.config_manager.get(
+            "cache.persist_content_cache", False
+        )
+        self._file_cache = None
+
+    def _get_file_cache(self) -> Any:
+        """获取持久化内容缓存实例（延迟初始化，避免未使用时创建缓存目录）"""
+        if self._file_cache is None:
+            from src.core.cache_manager import FileCacheManager
+
+            cache_dir = os.path.join(self.config_manager.get("cache.cache_dir", "cache"), "content")
+            # 结果只由 (模型, 提示词) 决定，不设置过期时间
+            self._file_cache = FileCacheManager(cache_dir=cache_dir, serializer="json", default_ttl=None)
+        return self._file_cache
+
     def _init_rate_limiter(self) -> None:
         """初始化速率限制器"""
         from src.core.rate_limiter import RateLimiter
@@ -134,7 +440,9 @@ class RedBookContentGenerator:
 
     def _generate_cache_key(self, raw_content: str) -> str:
         """
-        生成缓存键（基于输入内容的hash）
+        生成缓存键（基于模型和生成提示词的hash）
+
+        提示词包含原始输入内容，模型或提示词模板变化时缓存自动失效
 
         Args:
             raw_content: 原始输入内容
@@ -144,8 +452,11 @@ class RedBookContentGenerator:
         """
         import hashlib
 
-        # 使用输入内容的hash作为缓存键
-        content_hash = hashlib.sha256(raw_content.encode("utf - 8")).hexdigest()
+        model = self.config_manager.get("openai_model", "gpt - 4")
+        key_source = json.dumps(
+            {"model": model, "prompt": self._build_generation_prompt(raw_content)}, ensure_ascii=False, sort_keys=True
+        )
+        content_hash = hashlib.sha256(key_source.encode("utf-8")).hexdigest()
 
         # 添加前缀以区分不同类型的缓存
         return f"content_gen:{content_hash}"
@@ -212,34 +523,9 @@ class RedBookContentGenerator:
         if not text:
             return True, text
 
-        # 真正敏感的词汇（只检查明显不当的内容）
-        # 注意：不包含"天安门"、"广场"、"故宫"等正常历史文化词汇
-        sensitive_keywords: List[str] = [
-            # 明显政治敏感（不含正常历史描述）
-            "革命",
-            "暴动",
-            "叛乱",
-            "政变",
-            # 明显暴力
-            "血腥",
-            "杀戮",
-            "屠杀",
-            "武器",
-            "枪",
-            "刀",
-            # 明显色情
-            "色情",
-            "裸露",
-            "情色",
-            # 其他明显敏感
-            "恐怖",
-            "爆炸",
-            "毒品",
-            "赌博",
-        ]
-
-        # 检查是否包含敏感词
-        found_keywords: List[str] = [keyword for keyword in sensitive_keywords if keyword in text]
+        # 一次扫描找出全部敏感词并移除（结果按文本缓存）
+        keywords, modified_text = _scan_sensitive_keywords(text)
+        found_keywords: List[str] = list(keywords)
 
         # 早返回：没有敏感词
         if not found_keywords:
@@ -250,14 +536,6 @@ class RedBookContentGenerator:
             "检测到敏感词", logger_name="content_generator", keywords=found_keywords, text_preview=text[:100]
         )
 
-        # 移除敏感词
-        modified_text: str = text
-        for keyword in found_keywords:
-            modified_text = modified_text.replace(keyword, "")
-
-        # 清理多余空格
-        modified_text = re.sub(r"\s+", " ", modified_text).strip()
-
         # 如果修改后的文本太短，抛出异常
         if len(modified_text) < 10:
             raise ContentSafetyError(
@@ -431,64 +709,58 @@ class RedBookContentGenerator:
 
         suspicious_file = os.path.join(self.image_dir, "suspicious_content.txt")
 
-        with open(suspicious_file, "w", encoding="utf - 8") as f:
-            f.write("# 可疑内容记录\n\n")
-            f.write("以下内容在生成时可能触发内容审核失败，请手动修改后重新生成。\n\n")
-            f.write("=" * 60 + "\n\n")
+        # 按正文、图片提示词、封面的顺序收集待检查的字段
+        entries: List[Tuple[str, str]] = [("正文内容", content_data.get("content", ""))]
+        entries.extend(
+            (f"图{idx}提示词", prompt_data.get("prompt", ""))
+            for idx, prompt_data in enumerate(content_data.get("image_prompts", []), start=1)
+        )
+        entries.append(("封面提示词", content_data.get("cover", {}).get("prompt", "")))
+
+        parts: List[str] = [
+            "# 可疑内容记录\n\n",
+            "以下内容在生成时可能触发内容审核失败，请手动修改后重新生成。\n\n",
+            "=" * 60 + "\n\n",
+        ]
+        # 只记录仍含敏感词的字段，扫描结果直接取自缓存
+        for title, text in entries:
+            if text and _scan_sensitive_keywords(text)[0]:
+                parts.append(f"## {title}\n\n```\n{text}\n```\n\n" + "-" * 60 + "\n\n")
 
-            self._write_suspicious_content(f, content_data.get("content", ""), "正文内容")
-            self._write_suspicious_image_prompts(f, content_data.get("image_prompts", []))
-            self._write_suspicious_cover(f, content_data.get("cover", {}))
+        # 拼接后一次写入
+        with open(suspicious_file, "w", encoding="utf-8") as f:
+            f.write("".join(parts))
 
         Logger.info("可疑内容已保存到文件", logger_name="content_generator", file_path="suspicious_content.txt")
         Logger.info("请查看并手动修改后重新运行脚本", logger_name="content_generator")
 
-    def _write_suspicious_content(self, file: Any, content: str, title: str) -> None:
-        """写入可疑正文内容"""
-        if not content or self.check_content_safety(content)[0]:
-            return
-
-        file.write(f"## {title}\n\n")
-        file.write(f"```\n{content}\n```\n\n")
-        file.write("-" * 60 + "\n\n")
-
-    def _write_suspicious_image_prompts(self, file: Any, image_prompts: List[Dict[str, Any]]) -> None:
-        """写入可疑图片提示词"""
-        for idx, prompt_data in enumerate(image_prompts):
-            prompt = prompt_data.get("prompt", "")
-            if prompt and not self.check_content_safety(prompt)[0]:
-                file.write(f"## 图{idx + 1}提示词\n\n")
-                file.write(f"```\n{prompt}\n```\n\n")
-                file.write("-" * 60 + "\n\n")
-
-    def _write_suspicious_cover(self, file: Any, cover: Dict[str, Any]) -> None:
-        """写入可疑封面提示词"""
-        cover_prompt = cover.get("prompt", "")
-        if cover_prompt and not self.check_content_safety(cover_prompt)[0]:
-            file.write("## 封面提示词\n\n")
-            file.write(f"```\n{cover_prompt}\n```\n\n")
-            file.write("-" * 60 + "\n\n")
-
     def setup_paths(self) -> None:
         """设置路径"""
         # 确保输出目录存在
         output_excel: str = self.config_manager.get("output_excel")
         excel_dir: str = os.path.dirname(output_excel)
-        if excel_dir and not os.path.exists(excel_dir):
-            os.makedirs(excel_dir)
+        if excel_dir:
+            os.makedirs(excel_dir, exist_ok=True)
 
         # 创建图片输出目录（以日期命名）
         today: str = datetime.now().strftime("%Y%m%d")
         output_image_dir: str = self.config_manager.get("output_image_dir")
         self.image_dir = os.path.join(output_image_dir, today)
-        if not os.path.exists(self.image_dir):
+        # 直接创建，已存在时忽略，省去先判断是否存在的一次文件系统查询
+        try:
             os.makedirs(self.image_dir)
+        except FileExistsError:
+            pass
+        else:
             Logger.info("已创建图片目录", logger_name="content_generator", directory=self.image_dir)
 
-    def read_input_file(self) -> str:
+    def read_input_file(self, input_path: Optional[str] = None) -> str:
         """
         读取输入文档
 
+        Args:
+            input_path: 输入文件路径，默认使用 input_file 配置
+
         Returns:
             文件内容
 
@@ -496,16 +768,15 @@ class RedBookContentGenerator:
             CustomFileNotFoundError: 文件不存在
             ContentValidationError: 文件内容为空
         """
-        input_path = self.config_manager.get("input_file")
-
-        if not os.path.exists(input_path):
-            raise CustomFileNotFoundError(
-                file_path=input_path, suggestion="请确保输入文件存在，或在配置文件中指定正确的路径"
-            )
+        input_path = input_path or self.config_manager.get("input_file")
 
         try:
             with open(input_path, "r", encoding="utf - 8") as f:
                 content = f.read().strip()
+        except FileNotFoundError:
+            raise CustomFileNotFoundError(
+                file_path=input_path, suggestion="请确保输入文件存在，或在配置文件中指定正确的路径"
+            )
         except Exception as e:
             raise wrap_exception(
                 e,
@@ -548,8 +819,12 @@ class RedBookContentGenerator:
         # 2. 初始化 OpenAI 客户端
         client, model = self._initialize_openai_client()
 
-        # 3. 迭代生成内容（包含自我评估）
-        best_result = self._generate_with_iterations(client, model, raw_content)
+        # 3. 迭代生成内容（包含自我评估），重试后仍失败时保存输入以便重放
+        try:
+            best_result = self._generate_with_iterations(client, model, raw_content)
+        except Exception as e:
+            self._save_failed_input(raw_content, e)
+            raise
 
         # 4. 安全检查
         Logger.info("正在检查生成内容的安全性", logger_name="content_generator")
@@ -561,6 +836,326 @@ class RedBookContentGenerator:
         Logger.info("AI内容生成成功", logger_name="content_generator")
         return best_result
 
+    def generate_content_batch(self, raw_contents: List[str], max_concurrent: Optional[int] = None) -> List[Any]:
+        """
+        并发生成多条内容
+
+        AI 调用的耗时主要是网络和模型推理等待，多条输入在线程池中并发执行，
+        总请求速率仍由 RPM/TPM 令牌桶限制。
+
+        Args:
+            raw_contents: 原始输入内容列表
+            max_concurrent: 最大并发数（默认读取 rate_limit.openai.max_concurrent）
+
+        Returns:
+            与输入一一对应的结果列表，生成失败的位置为对应的异常对象
+        """
+        if not raw_contents:
+            return []
+
+        if max_concurrent is None:
+            max_concurrent = self.config_manager.get("rate_limit.openai.max_concurrent", 4)
+        max_workers = max(1, min(int(max_concurrent), len(raw_contents)))
+
+        results: List[Any] = []
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(self.generate_content, raw_content) for raw_content in raw_contents]
+            for index, future in enumerate(futures):
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    Logger.error(
+                        "批量生成中单条内容生成失败",
+                        logger_name="content_generator",
+                        index=index,
+                        error=str(e),
+                    )
+                    results.append(e)
+
+        return results
+
+    def generate_content_combined(self, raw_contents: List[str]) -> List[Any]:
+        """
+        将多条输入合并到一次 AI 请求中生成
+
+        受 RPM 限制时，合并请求能减少请求次数和每次请求的 HTTP 开销。输入按
+        COMBINED_REQUEST_MAX_ITEMS / COMBINED_REQUEST_MAX_CHARS 分组，每组一次请求；
+        合并请求不做逐条的主编评估迭代。某组请求失败或返回结果数量不符时，
+        该组回退为 generate_content_batch 逐条并发生成。
+
+        Args:
+            raw_contents: 原始输入内容列表
+
+        Returns:
+            与输入一一对应的结果列表，生成失败的位置为对应的异常对象
+        """
+        results: List[Any] = [self._check_cache(raw_content) for raw_content in raw_contents]
+        pending: List[int] = [index for index, result in enumerate(results) if result is None]
+
+        for group in self._group_combined_requests([raw_contents[index] for index in pending]):
+            indexes = [pending[position] for position in group]
+            group_contents = [raw_contents[index] for index in indexes]
+
+            if len(group_contents) == 1:
+                group_results = self.generate_content_batch(group_contents)
+            else:
+                try:
+                    group_results = self._generate_combined_group(group_contents)
+                except Exception as e:
+                    Logger.warning(
+                        "合并请求失败，回退为逐条生成",
+                        logger_name="content_generator",
+                        count=len(group_contents),
+                        error=str(e),
+                    )
+                    group_results = self.generate_content_batch(group_contents)
+
+            for index, result in zip(indexes, group_results):
+                results[index] = result
+
+        return results
+
+    def _group_combined_requests(self, raw_contents: List[str]) -> List[List[int]]:
+        """
+        按条数和总字数上限把输入划分为多组（返回每组内输入的下标）
+
+        Args:
+            raw_contents: 原始输入内容列表
+
+        Returns:
+            分组后的下标列表
+        """
+        groups: List[List[int]] = []
+        current: List[int] = []
+        current_chars = 0
+        for index, raw_content in enumerate(raw_contents):
+            if current and (
+                len(current) >= self.COMBINED_REQUEST_MAX_ITEMS
+                or current_chars + len(raw_content) > self.COMBINED_REQUEST_MAX_CHARS
+            ):
+                groups.append(current)
+                current, current_chars = [], 0
+            current.append(index)
+            current_chars += len(raw_content)
+        if current:
+            groups.append(current)
+        return groups
+
+    def _generate_combined_group(self, raw_contents: List[str]) -> List[Dict[str, Any]]:
+        """
+        用一次请求生成一组输入的内容
+
+        Args:
+            raw_contents: 同一组的原始输入内容
+
+        Returns:
+            与输入一一对应的生成结果
+
+        Raises:
+            ContentValidationError: 响应中的结果数量或格式不符合要求
+        """
+        client, model = self._initialize_openai_client()
+        response = self._call_openai_with_rate_limit(
+            client=client,
+            model=model,
+            messages=[
+                {"role": "system", "content": _GENERATION_SYSTEM_PROMPT},
+                {"role": "user", "content": self._build_combined_prompt(raw_contents)},
+            ],
+            temperature=0.8,
+            response_format={"type": "json_object"},
+        )
+
+        data = json_utils.loads(response.choices[0].message.content.strip())
+        items = data.get("results") if isinstance(data, dict) else None
+        if (
+            not isinstance(items, list)
+            or len(items) != len(raw_contents)
+            or not all(isinstance(item, dict) for item in items)
+        ):
+            raise ContentValidationError(
+                "合并请求返回的结果数量或格式不正确",
+                content_type="combined_results",
+                validation_rule=f"results 应为包含 {len(raw_contents)} 个对象的数组",
+            )
+
+        results: List[Dict[str, Any]] = []
+        for item in items:
+            self._validate_generated_content(item)
+
+        for raw_content, item in zip(raw_contents, items):
+            item = self.check_and_fix_content_safety(item)
+            self._save_to_cache(raw_content, item)
+            results.append(item)
+
+        Logger.info("合并请求生成成功", logger_name="content_generator", count=len(results))
+        return results
+
+    def _build_combined_prompt(self, raw_contents: List[str]) -> str:
+        """构建多条输入合并请求的提示词（固定模板 + 批量要求 + 各段原始内容）"""
+        parts: List[str] = [_GENERATION_PROMPT_BODY, _COMBINED_PROMPT_INSTRUCTION.format(count=len(raw_contents))]
+        for index, raw_content in enumerate(raw_contents, start=1):
+            parts.append(f"    ## 原始内容{index}：\n    {raw_content}\n\n")
+        return "".join(parts)
+
+    def generate_content_batch_api(
+        self, raw_contents: List[str], poll_interval: Optional[float] = None, max_wait: Optional[float] = None
+    ) -> List[Any]:
+        """
+        通过 OpenAI 兼容的 Batch API 离线批量生成内容
+
+        适用于定时、非交互的大批量生成：请求以 JSONL 文件上传后由服务端异步处理，
+        费用更低且不占用实时接口的速率配额，但完成时间可能长达 24 小时。
+        Batch API 不做逐条的主编评估迭代。
+
+        Args:
+            raw_contents: 原始输入内容列表
+            poll_interval: 轮询任务状态的间隔秒数（默认 BATCH_API_POLL_INTERVAL）
+            max_wait: 最长等待秒数（默认 BATCH_API_MAX_WAIT）
+
+        Returns:
+            与输入一一对应的结果列表，生成失败的位置为对应的异常对象
+
+        Raises:
+            APIError: 批处理任务失败、过期、被取消或等待超时
+        """
+        if not raw_contents:
+            return []
+
+        poll_interval = self.BATCH_API_POLL_INTERVAL if poll_interval is None else poll_interval
+        max_wait = self.BATCH_API_MAX_WAIT if max_wait is None else max_wait
+        client, model = self._initialize_openai_client()
+
+        # 1. 构建并上传请求文件，每行一个请求
+        lines: List[str] = []
+        for index, raw_content in enumerate(raw_contents):
+            request = {
+                "custom_id": f"doc-{index}",
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {
+                    "model": model,
+                    "messages": [
+                        {"role": "system", "content": _GENERATION_SYSTEM_PROMPT},
+                        {"role": "user", "content": self._build_generation_prompt(raw_content)},
+                    ],
+                    "temperature": 0.8,
+                    "response_format": {"type": "json_object"},
+                },
+            }
+            lines.append(json_utils.dumps(request).decode("utf-8"))
+        batch_input = ("\n".join(lines) + "\n").encode("utf-8")
+        input_file = client.files.create(file=("batch_input.jsonl", batch_input), purpose="batch")
+
+        # 2. 创建批处理任务并轮询状态
+        batch = client.batches.create(
+            input_file_id=input_file.id, endpoint="/v1/chat/completions", completion_window="24h"
+        )
+        Logger.info("Batch 任务已创建", logger_name="content_generator", batch_id=batch.id, count=len(raw_contents))
+
+        start_time = time.time()
+        while batch.status not in ("completed", "failed", "expired", "cancelled"):
+            if time.time() - start_time > max_wait:
+                raise APIError(f"Batch 任务等待超时（{max_wait}秒）: {batch.id}", api_name="OpenAI Batch")
+            time.sleep(poll_interval)
+            batch = client.batches.retrieve(batch.id)
+
+        if batch.status != "completed" or not batch.output_file_id:
+            raise APIError(f"Batch 任务未完成: {batch.id}，状态 {batch.status}", api_name="OpenAI Batch")
+
+        # 3. 下载结果并按 custom_id 对应回输入
+        outputs: Dict[str, Dict[str, Any]] = {}
+        for line in client.files.content(batch.output_file_id).text.splitlines():
+            if line.strip():
+                record = json_utils.loads(line)
+                outputs[record.get("custom_id", "")] = record
+
+        results: List[Any] = []
+        for index, raw_content in enumerate(raw_contents):
+            try:
+                results.append(self._parse_batch_api_output(outputs.get(f"doc-{index}"), raw_content))
+            except Exception as e:
+                Logger.error("Batch 结果解析失败", logger_name="content_generator", index=index, error=str(e))
+                results.append(e)
+
+        Logger.info("Batch 任务结果已解析", logger_name="content_generator", batch_id=batch.id, count=len(results))
+        return results
+
+    def _parse_batch_api_output(self, record: Optional[Dict[str, Any]], raw_content: str) -> Dict[str, Any]:
+        """
+        解析 Batch API 输出文件中的单条记录，并做安全检查和缓存
+
+        Args:
+            record: 输出文件中对应的一行记录（缺失时为 None）
+            raw_content: 对应的原始输入内容
+
+        Returns:
+            生成的内容数据字典
+
+        Raises:
+            APIError: 记录缺失或请求失败
+        """
+        if record is None:
+            raise APIError("Batch 输出中缺少该条结果", api_name="OpenAI Batch")
+
+        response = record.get("response") or {}
+        if record.get("error") or response.get("status_code") != 200:
+            raise APIError(
+                "Batch 中该条请求失败",
+                api_name="OpenAI Batch",
+                status_code=response.get("status_code"),
+                response_body=json.dumps(record.get("error") or response.get("body"), ensure_ascii=False),
+            )
+
+        content = response["body"]["choices"][0]["message"]["content"]
+        result = json_utils.loads(content.strip())
+        self._validate_generated_content(result)
+        result = self.check_and_fix_content_safety(result)
+        self._save_to_cache(raw_content, result)
+        return result
+
+    def _validate_generated_content(self, result: Dict[str, Any]) -> None:
+        """
+        校验 AI 生成结果的结构
+
+        Args:
+            result: 解析后的生成结果
+
+        Raises:
+            ContentValidationError: 缺少必要字段或字段类型不符
+        """
+        try:
+            _GeneratedContentSchema.model_validate(result)
+        except ValidationError as e:
+            details = "; ".join(
+                f"{'.'.join(str(p) for p in error['loc']) or '<root>'}: {error['msg']}" for error in e.errors()[:3]
+            )
+            raise ContentValidationError(
+                f"生成结果结构不符合要求: {details}",
+                content_type="generated_content",
+                validation_rule="_GeneratedContentSchema",
+            )
+
+    def _save_failed_input(self, raw_content: str, error: Exception) -> None:
+        """
+        把生成失败的原始输入保存到输出目录下的 failed 目录，便于之后重新提交
+
+        Args:
+            raw_content: 原始输入内容
+            error: 导致失败的异常
+        """
+        failed_dir = os.path.join(os.path.dirname(self.config_manager.get("output_excel")), "failed")
+        failed_file = os.path.join(failed_dir, f"{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}.txt")
+        try:
+            os.makedirs(failed_dir, exist_ok=True)
+            with open(failed_file, "w", encoding="utf-8") as f:
+                f.write(f"# 失败原因: {error}\n\n")
+                f.write(raw_content)
+        except OSError as e:
+            Logger.warning("保存失败输入时出错", logger_name="content_generator", error=str(e))
+            return
+        Logger.warning("内容生成失败，原始输入已保存", logger_name="content_generator", file_path=failed_file)
+
     def _call_openai_with_rate_limit(
         self, 
         client: openai.OpenAI, 
@@ -587,43 +1182,14 @@ class RedBookContentGenerator:
         )
 
     def _build_generation_prompt(self, raw_content: str, attempt: int = 1) -> str:
-        """构建生成提示词"""
-        return f"""# Role: 老北京文化·小红书金牌运营 & 视觉导演
-
-    ## Goals
-    1. 读取用户输入的原始内容。
-    2. 改写为具备"爆款潜质"的小红书文案。文案必须充满生活气息，避免总结性、AI感的陈述，多用细节描写。
-    3. 生成 3 - 5 组 AI 绘画提示词。
-
-    ## Constraints
-    - **文字风格**：必须地道，多用短句，多用Emoji。拒绝"总分总"的枯燥结构。
-    - **画面风格**：90年代北京纪实，胶片质感。
-    - **牌匾文字**：如果涉及故宫牌匾，请明确要求文字为"建极绥猷"，并描述其颜色（蓝底金字）。
-
-    ## Workflow
-    ### Step 1: 文案创作
-    - 请提供 5 个【标题】。
-    - 正文：开头要抓人，中间要动人，结尾要有互动。
+        """构建生成提示词（固定模板 + 原始内容），开启自审时模板中包含自审要求"""
+        prefix = _SELF_REVIEW_PROMPT_PREFIX if self._self_review_enabled() else _GENERATION_PROMPT_PREFIX
+        return prefix + raw_content + _GENERATION_PROMPT_SUFFIX
 
-    ### Step 2: 画面提取
-    - 包含至少 4 张故事图提示词。
-    - 牌匾策略：针对包含牌匾的图，在 Prompt 中强制加入"建极绥猷 (Jian Ji Sui You)"字样。
+    def _self_review_enabled(self) -> bool:
+        """是否由模型在生成请求内自审，代替单独的主编评估请求"""
+        return bool(self.config_manager.get("api.openai.self_review", False))
 
-    ## Output Format
-    {{{{
-      "titles": ["...", "..."],
-      "content": "...",
-      "tags": "...",
-      "image_prompts": [
-        {{{{"scene": "...", "prompt": "..."}}}},
-        ...
-      ],
-      "cover": {{{{"scene": "...", "title": "...", "prompt": "..."}}}}
-    }}}}
-
-    ## 原始内容：
-    {raw_content}
-    """
     def _check_cache(self, raw_content: str) -> Optional[Dict[str, Any]]:
         """
         检查缓存中是否存在结果
@@ -641,6 +1207,12 @@ class RedBookContentGenerator:
         cache_key = self._generate_cache_key(raw_content)
         cached_result = self.cache.get(cache_key)
 
+        # 内存未命中时查询持久化缓存，命中后回填内存
+        if cached_result is None and self._persist_cache_enabled:
+            cached_result = self._get_file_cache().get(cache_key)
+            if cached_result is not None:
+                self.cache.set(cache_key, cached_result)
+
         # 早返回：缓存未命中
         if cached_result is None:
             Logger.info(
@@ -671,6 +1243,8 @@ class RedBookContentGenerator:
 
         cache_key = self._generate_cache_key(raw_content)
         self.cache.set(cache_key, result)
+        if self._persist_cache_enabled:
+            self._get_file_cache().set(cache_key, result)
 
         Logger.info("✅ 生成结果已保存到缓存", logger_name="content_generator", cache_key=cache_key[:16] + "...")
 
@@ -679,7 +1253,21 @@ class RedBookContentGenerator:
 
     def _initialize_openai_client(self) -> Tuple[openai.OpenAI, str]:
         """
-        初始化 OpenAI 客户端
+        获取 OpenAI 客户端
+
+        首次调用时创建，之后复用同一个客户端，使多次生成共享 HTTP 连接池（TCP/TLS 连接保持复用）。
+
+        Returns:
+            (客户端实例, 模型名称)
+        """
+        with self._openai_client_lock:
+            if self._openai_client is None:
+                self._openai_client = self._create_openai_client()
+            return self._openai_client
+
+    def _create_openai_client(self) -> Tuple[openai.OpenAI, str]:
+        """
+        创建 OpenAI 客户端
 
         Returns:
             (客户端实例, 模型名称)
@@ -696,8 +1284,11 @@ class RedBookContentGenerator:
         # 处理 Qwen 模型兼容性
         base_url, model = self._handle_qwen_compatibility(base_url, model)
 
-        # 构建客户端参数
-        client_kwargs = {"api_key": api_key}
+        # 构建客户端参数：429、5xx 和连接错误由客户端按 max_retries 指数退避重试
+        client_kwargs: Dict[str, Any] = {
+            "api_key": api_key,
+            "max_retries": self.config_manager.get("api.openai.max_retries", 3),
+        }
         if base_url:
             client_kwargs["base_url"] = base_url
 
@@ -744,7 +1335,7 @@ class RedBookContentGenerator:
             client=client,
             model=model,
             messages=[
-                {"role": "system", "content": "你是一位专业的小红书内容创作专家。请严格按照JSON格式输出。"},
+                {"role": "system", "content": _GENERATION_SYSTEM_PROMPT},
                 {"role": "user", "content": self._build_generation_prompt(raw_content)},
             ],
             temperature=0.8,
@@ -752,7 +1343,7 @@ class RedBookContentGenerator:
         )
 
         result_text = response.choices[0].message.content.strip()
-        return json.loads(result_text)
+        return json_utils.loads(result_text)
 
     def _evaluate_content(self, client: openai.OpenAI, model: str, content: str) -> str:
         """
@@ -766,25 +1357,12 @@ class RedBookContentGenerator:
         Returns:
             评估反馈
         """
-        eval_prompt = f"""请作为资深主编审阅以下小红书文案：
-    ---
-    {content}
-    ---
-    评价该文案是否符合：
-    1. 京味儿是否地道？
-    2. 情感是否细腻？
-    3. 排版是否舒适？
-    4. 是否通过"叙事"而不是"说教"？
-
-    如果评价为"优秀"，请直接返回"PASS"。
-    如果需要优化，请指出不足，并给出修改意见。"""
-
         eval_response = self._call_openai_with_rate_limit(
             client=client,
             model=model,
             messages=[
-                {"role": "system", "content": "你是一位极其挑剔的小红书内容主编。"},
-                {"role": "user", "content": eval_prompt},
+                {"role": "system", "content": _EVALUATION_SYSTEM_PROMPT},
+                {"role": "user", "content": _EVALUATION_PROMPT_PREFIX + content + _EVALUATION_PROMPT_SUFFIX},
             ],
             temperature=0.5,
         )
@@ -797,6 +1375,9 @@ class RedBookContentGenerator:
         """
         迭代生成内容，包含自我评估和改进
 
+        开启 api.openai.self_review 时自审已在生成请求内完成，不再发起评估请求，
+        只有结果结构校验失败时才重新生成。
+
         Args:
             client: OpenAI 客户端
             model: 模型名称
@@ -823,183 +1404,397 @@ class RedBookContentGenerator:
             )
             return True, eval_feedback  # 需要继续
 
-        return self.api_handler.call_openai_with_evaluation(
+        self_review = self._self_review_enabled()
+        result = self.api_handler.call_openai_with_evaluation(
             client=client,
             model=model,
             raw_content=raw_content,
             prompt_builder=self._build_generation_prompt,
             max_iterations=max_attempts,
-            evaluator=evaluator,
+            evaluator=None if self_review else evaluator,
+            validator=self._validate_generated_content,
         )
 
-    def save_to_excel(self, content_data: Dict[str, Any], raw_content: str) -> None:
+        review_note = result.pop("_self_review", None)
+        if review_note:
+            Logger.debug("模型自审说明", logger_name="content_generator", self_review=str(review_note)[:100])
+        return result
+
+    def save_outputs(self, content_data: Union[Dict[str, Any], RedBookContent], raw_content: str) -> None:
+        """
+        并发保存所有输出文件
+
+        Excel（含 JSONL 日志）、图片提示词、完整内容三者写入不同文件，且都是文件 IO，
+        放到线程池中同时执行，总耗时约等于最慢的一项（通常是 Excel 保存）。
+
+        Args:
+            content_data: 生成的内容数据
+            raw_content: 原始输入内容
+        """
+        # 只解析一次，三处保存共用
+        item = RedBookContent.coerce(content_data)
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            futures = [
+                executor.submit(self._save_table_outputs, item, raw_content),
+                executor.submit(self.save_image_prompts, item),
+                executor.submit(self.save_full_content, item, raw_content),
+            ]
+            for future in as_completed(futures):
+                future.result()
+
+    def _save_table_outputs(self, content_data: Union[Dict[str, Any], RedBookContent], raw_content: str) -> None:
+        """
+        保存 Excel 与 JSONL 日志，加锁保证多条内容同时保存时按行依次写入
+
+        JSONL 日志始终追加；output_excel_per_run 关闭时跳过 Excel，
+        每次保存只追加一行，Excel 需要时再用 export_excel_from_jsonl 一次性导出。
+        """
+        with self._table_output_lock:
+            if self.config_manager.get("output_excel_per_run", True):
+                self.save_to_excel(content_data, raw_content)
+            self.save_to_jsonl(content_data, raw_content)
+
+    def save_to_excel(self, content_data: Union[Dict[str, Any], RedBookContent], raw_content: str) -> None:
         """
         保存内容到Excel文件
 
+        文件不存在时使用 openpyxl 的 write_only 模式一次性写出表头和数据行，
+        避免为新文件构建完整的单元格对象模型；文件已存在时加载后追加一行。
+
         Args:
             content_data: 生成的内容数据
             raw_content: 原始输入内容
         """
+        self.save_batch_to_excel([(content_data, raw_content)])
+
+    def save_batch_to_excel(
+        self,
+        items: Sequence[Tuple[Union[Mapping[str, Any], RedBookContent], str]],
+        checkpoint_interval: int = EXCEL_CHECKPOINT_INTERVAL,
+    ) -> None:
+        """
+        批量保存多条内容到Excel文件
+
+        工作簿只打开一次、追加全部数据行后保存一次，避免每条内容都重新解析和重写整个文件；
+        每追加 checkpoint_interval 行保存一次，中途出错时已写入的行不会丢失。
+
+        Args:
+            items: (内容数据, 原始输入内容) 列表
+            checkpoint_interval: 每追加多少行保存一次检查点
+        """
+        if not items:
+            return
+
         excel_path: str = self.config_manager.get("output_excel")
-        headers: List[str] = [
-            "生成时间",
-            "原始内容",
-            "标题1",
-            "标题2",
-            "标题3",
-            "标题4",
-            "标题5",
-            "正文内容",
-            "标签",
-            "图片提示词1",
-            "图片提示词2",
-            "图片提示词3",
-            "图片提示词4",
-            "封面标题",
-            "封面提示词",
-            "图片保存路径",
-        ]
+        wb, ws, write_only = self._open_workbook(excel_path)
+
+        for count, (content_data, raw_content) in enumerate(items, start=1):
+            self._append_row(ws, self._build_excel_row(content_data, raw_content), write_only)
+            if count % checkpoint_interval == 0 and count < len(items):
+                self._close_workbook(wb, excel_path)
+                # write_only 工作簿只能保存一次，检查点之后以普通模式重新打开继续追加
+                if write_only:
+                    wb, ws, write_only = self._open_workbook(excel_path)
+
+        self._close_workbook(wb, excel_path)
+        Logger.info("内容已保存到Excel", logger_name="content_generator", file_path=excel_path, rows=len(items))
+
+    def _open_workbook(self, excel_path: str) -> Tuple[Any, Any, bool]:
+        """
+        打开用于追加的工作簿：文件已存在时加载，否则以 write_only 模式新建
+
+        Args:
+            excel_path: Excel 文件路径
 
-        # 检查文件是否存在
+        Returns:
+            (工作簿, 工作表, 是否为 write_only 模式)
+        """
         if os.path.exists(excel_path):
             wb = openpyxl.load_workbook(excel_path)
-            ws = wb.active
-        else:
-            wb = openpyxl.Workbook()
-            ws = wb.active
-            ws.title = "小红书内容"
+            return wb, wb.active, False
 
-            # 创建表头
+        wb, ws = self._create_write_only_workbook()
+        return wb, ws, True
 
-            # 设置表头样式
-            header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-            header_font = Font(bold=True, color="FFFFFF", size=11)
+    def _append_row(self, ws: Any, row_data: List[Any], write_only: bool) -> None:
+        """
+        向工作表追加一行数据并设置数据行样式
 
-            for col_idx, header in enumerate(headers, start=1):
-                cell = ws.cell(row=1, column=col_idx, value=header)
-                cell.fill = header_fill
-                cell.font = header_font
-                cell.alignment = Alignment(horizontal="center", vertical="center")
+        Args:
+            ws: 工作表
+            row_data: 单元格取值列表
+            write_only: 工作表是否为 write_only 模式
+        """
+        if write_only:
+            self._append_write_only_row(ws, row_data)
+            return
+
+        ws.append(row_data)
+        for cell in ws[ws.max_row]:
+            cell.alignment = _EXCEL_DATA_ALIGNMENT
+
+    def _close_workbook(self, wb: Any, excel_path: str) -> None:
+        """
+        保存工作簿到文件
+
+        xlsx 是 zip 包，openpyxl 固定以 zlib 默认级别 6 压缩；这里按 xlsx_compress_level 配置
+        （默认 1）自行创建 ZipFile 交给 ExcelWriter 写出，级别越低压缩越快、文件越大。
+        ExcelWriter 不是 openpyxl 的公开接口，不可用或调用方式变化时回退到 wb.save。
 
-            # 设置列宽
-            column_widths = [18, 40, 30, 30, 30, 30, 30, 60, 40, 50, 50, 50, 50, 30, 50, 30]
-            for col_idx, width in enumerate(column_widths, start=1):
-                ws.column_dimensions[get_column_letter(col_idx)].width = width
+        Args:
+            wb: 工作簿
+            excel_path: 保存路径
+        """
+        if not HAS_EXCEL_WRITER:
+            wb.save(excel_path)
+            return
 
-        # 添加新行
-        now: str = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        compress_level = int(self.config_manager.get("xlsx_compress_level", 1))
+        archive = zipfile.ZipFile(excel_path, "w", zipfile.ZIP_DEFLATED, allowZip64=True, compresslevel=compress_level)
+        # 与 openpyxl 的 save_workbook 一致，写入前更新修改时间
+        wb.properties.modified = datetime.now(timezone.utc).replace(tzinfo=None)
+        try:
+            ExcelWriter(wb, archive).save()
+        except (TypeError, AttributeError) as e:
+            archive.close()
+            Logger.warning("openpyxl ExcelWriter 不可用，按默认压缩级别保存", logger_name="content_generator", error=str(e))
+            wb.save(excel_path)
+
+    def save_to_jsonl(self, content_data: Union[Dict[str, Any], RedBookContent], raw_content: str) -> None:
+        """
+        以追加方式把本次结果写入 JSONL 日志，每次只写一行，耗时与历史记录数量无关
+
+        Args:
+            content_data: 生成的内容数据
+            raw_content: 原始输入内容
+        """
+        jsonl_path: str = self._get_jsonl_path()
+        record: Dict[str, Any] = dict(zip(_EXCEL_HEADERS, self._build_excel_row(content_data, raw_content)))
+        with open(jsonl_path, "a", encoding="utf-8") as f:
+            f.write(json_utils.dumps(record).decode("utf-8") + "\n")
+        Logger.info("内容已追加到JSONL日志", logger_name="content_generator", file_path=jsonl_path)
+
+    def export_excel_from_jsonl(self, jsonl_path: Optional[str] = None, excel_path: Optional[str] = None) -> int:
+        """
+        从 JSONL 日志重新生成 Excel 文件
+
+        逐行流式写出，不在内存中保留整张表。已安装 xlsxwriter 时使用其 constant_memory 模式
+        （整表导出明显快于 openpyxl），否则使用 openpyxl 的 write_only 模式。
+
+        Args:
+            jsonl_path: JSONL 日志路径，默认使用 _get_jsonl_path()
+            excel_path: 输出 Excel 路径，默认使用 output_excel 配置
+
+        Returns:
+            写入的数据行数
+        """
+        jsonl_path = jsonl_path or self._get_jsonl_path()
+        excel_path = excel_path or self.config_manager.get("output_excel")
+
+        with open(jsonl_path, "r", encoding="utf-8") as f:
+            rows = (
+                [record.get(header, "") for header in _EXCEL_HEADERS]
+                for record in (json_utils.loads(line) for line in f if line.strip())
+            )
+            if HAS_XLSXWRITER:
+                row_count = self._export_rows_with_xlsxwriter(rows, excel_path)
+            else:
+                row_count = self._export_rows_with_openpyxl(rows, excel_path)
+
+        Logger.info(
+            "已从JSONL日志导出Excel",
+            logger_name="content_generator",
+            file_path=excel_path,
+            rows=row_count,
+            engine="xlsxwriter" if HAS_XLSXWRITER else "openpyxl",
+        )
+        return row_count
+
+    def _export_rows_with_openpyxl(self, rows: Iterable[List[Any]], excel_path: str) -> int:
+        """用 openpyxl write_only 工作簿逐行写出表头和数据行，返回数据行数"""
+        wb, ws = self._create_write_only_workbook()
+        row_count = 0
+        for row_data in rows:
+            self._append_write_only_row(ws, row_data)
+            row_count += 1
+        self._close_workbook(wb, excel_path)
+        return row_count
+
+    @staticmethod
+    def _export_rows_with_xlsxwriter(rows: Iterable[List[Any]], excel_path: str) -> int:
+        """用 xlsxwriter constant_memory 模式逐行写出表头和数据行，返回数据行数"""
+        # strings_to_urls 关闭，与 openpyxl 一样把网址按普通文本写入
+        wb = xlsxwriter.Workbook(excel_path, {"constant_memory": True, "strings_to_urls": False})
+        try:
+            ws = wb.add_worksheet(_EXCEL_SHEET_TITLE)
+            for col, width in enumerate(_EXCEL_COLUMN_WIDTHS):
+                ws.set_column(col, col, width)
+            ws.write_row(0, 0, _EXCEL_HEADERS, wb.add_format(_XLSXWRITER_HEADER_FORMAT))
+
+            data_format = wb.add_format(_XLSXWRITER_DATA_FORMAT)
+            row_count = 0
+            for row_count, row_data in enumerate(rows, start=1):
+                ws.write_row(row_count, 0, row_data, data_format)
+        finally:
+            wb.close()
+        return row_count
+
+    def _get_jsonl_path(self) -> str:
+        """获取 JSONL 日志路径，未配置时与 output_excel 同名、扩展名为 .jsonl"""
+        jsonl_path: Optional[str] = self.config_manager.get("output_jsonl")
+        if jsonl_path:
+            return jsonl_path
+        return os.path.splitext(self.config_manager.get("output_excel"))[0] + ".jsonl"
+
+    @staticmethod
+    def _create_write_only_workbook() -> Tuple[Any, Any]:
+        """
+        创建 write_only 模式的工作簿，并写入带样式的表头和列宽
+
+        Returns:
+            (工作簿, 工作表)
+        """
+        wb = openpyxl.Workbook(write_only=True)
+        ws = wb.create_sheet(_EXCEL_SHEET_TITLE)
+
+        # 设置列宽（write_only 模式下必须在写入行之前设置）
+        for letter, width in zip(_EXCEL_COLUMN_LETTERS, _EXCEL_COLUMN_WIDTHS):
+            ws.column_dimensions[letter].width = width
+
+        # 创建表头并设置样式
+        header_cells = []
+        for header in _EXCEL_HEADERS:
+            cell = WriteOnlyCell(ws, value=header)
+            cell.fill = _EXCEL_HEADER_FILL
+            cell.font = _EXCEL_HEADER_FONT
+            cell.alignment = _EXCEL_HEADER_ALIGNMENT
+            header_cells.append(cell)
+        ws.append(header_cells)
+        return wb, ws
+
+    @staticmethod
+    def _append_write_only_row(ws: Any, row_data: List[Any]) -> None:
+        """向 write_only 工作表追加一行带数据样式的单元格"""
+        data_cells = []
+        for value in row_data:
+            cell = WriteOnlyCell(ws, value=value)
+            cell.alignment = _EXCEL_DATA_ALIGNMENT
+            data_cells.append(cell)
+        ws.append(data_cells)
+
+    def _build_excel_row(self, content_data: Union[Mapping[str, Any], RedBookContent], raw_content: str) -> List[Any]:
+        """
+        构建Excel数据行，列顺序与 _EXCEL_HEADERS 一致
+
+        Args:
+            content_data: 生成的内容数据
+            raw_content: 原始输入内容
+
+        Returns:
+            单元格取值列表
+        """
+        item = RedBookContent.coerce(content_data)
         row_data: List[Any] = [
-            now,  # 生成时间
+            item.generated_at,  # 生成时间
             raw_content[:500] if len(raw_content) > 500 else raw_content,  # 原始内容（截断）
         ]
 
         # 添加标题
-        titles: List[str] = content_data.get("titles", [])
+        titles = item.titles
         for i in range(5):
             row_data.append(titles[i] if i < len(titles) else "")
 
         # 添加正文和标签
-        row_data.append(content_data.get("content", ""))
-        row_data.append(content_data.get("tags", ""))
+        row_data.append(item.content)
+        row_data.append(item.tags)
 
         # 添加图片提示词（至少4张故事图）
-        image_prompts: List[Dict[str, Any]] = content_data.get("image_prompts", [])
-        for i in range(4):
-            if i < len(image_prompts):
-                prompt_text: str = f"{image_prompts[i].get('scene', '')}: {image_prompts[i].get('prompt', '')}"
-                row_data.append(prompt_text)
-            else:
-                row_data.append("")
+        image_prompts = item.image_prompts
+        for i in range(RedBookContent.MAX_STORY_IMAGES):
+            row_data.append(f"{image_prompts[i].scene}: {image_prompts[i].prompt}" if i < len(image_prompts) else "")
 
         # 封面标题、封面提示词
-        cover: Dict[str, Any] = content_data.get("cover", {})
-        row_data.append(cover.get("title", ""))
-        row_data.append(cover.get("prompt", ""))
+        row_data.append(item.cover.title)
+        row_data.append(item.cover.prompt)
 
         # 添加图片保存路径
         row_data.append(self.image_dir)
+        return row_data
 
-        # 写入数据
-        ws.append(row_data)
-
-        # 设置数据行样式
-        for col_idx in range(1, len(headers) + 1):
-            cell = ws.cell(row=ws.max_row, column=col_idx)
-            cell.alignment = Alignment(horizontal="left", vertical="top", wrap_text=True)
-
-        # 保存文件
-        wb.save(excel_path)
-        Logger.info("内容已保存到Excel", logger_name="content_generator", file_path=excel_path)
-
-    def save_image_prompts(self, content_data: Dict[str, Any]) -> None:
+    def save_image_prompts(
+        self, content_data: Union[Dict[str, Any], RedBookContent], output_dir: Optional[str] = None
+    ) -> None:
         """
         保存图片提示词到文件：4 张故事图 + 1 张封面（带短标题）
+
+        Args:
+            content_data: 生成的内容数据
+            output_dir: 输出目录，默认使用当天的图片目录
         """
-        prompts_file: str = os.path.join(self.image_dir, "image_prompts.txt")
+        item = RedBookContent.coerce(content_data)
+        prompts_file: str = os.path.join(output_dir or self.image_dir, "image_prompts.txt")
+
+        parts: List[str] = ["# AI绘画提示词\n\n", f"生成时间: {item.generated_at}\n\n"]
 
-        with open(prompts_file, "w", encoding="utf - 8") as f:
-            f.write("# AI绘画提示词\n\n")
-            f.write(f"生成时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
+        # 保存正文内容（用于后续分段叠加到图片上）
+        content: str = item.content.strip()
+        if content:
+            parts.append(f"## 正文内容\n\n{content}\n\n---\n\n")
 
-            # 保存正文内容（用于后续分段叠加到图片上）
-            content: str = content_data.get("content", "").strip()
-            if content:
-                f.write("## 正文内容\n\n")
-                f.write(f"{content}\n\n")
-                f.write("---\n\n")
+        # 故事图：至少 4 张
+        for idx, prompt_item in enumerate(item.image_prompts, start=1):
+            parts.append(f"## 图{idx}: {prompt_item.scene}\n\n```\n{prompt_item.prompt}\n```\n\n")
 
-            # 故事图：至少 4 张
-            image_prompts: List[Dict[str, Any]] = content_data.get("image_prompts", [])[:4]
-            for idx, prompt_data in enumerate(image_prompts, start=1):
-                f.write(f"## 图{idx}: {prompt_data.get('scene', '')}\n\n")
-                f.write(f"```\n{prompt_data.get('prompt', '')}\n```\n\n")
+        # 封面：短标题 + 带标题的 prompt
+        cover = item.cover
+        if cover.title and cover.prompt:
+            parts.append(f"## 封面: {cover.title}\n\n```\n{cover.prompt}\n```\n\n")
 
-            # 封面：短标题 + 带标题的 prompt
-            cover: Dict[str, Any] = content_data.get("cover", {})
-            if cover.get("title") and cover.get("prompt"):
-                f.write(f"## 封面: {cover.get('title', '')}\n\n")
-                f.write(f"```\n{cover.get('prompt', '')}\n```\n\n")
+        # 拼接后一次写入
+        with open(prompts_file, "w", encoding="utf-8") as f:
+            f.write("".join(parts))
 
         Logger.info("图片提示词已保存", logger_name="content_generator", file_path=prompts_file)
 
-    def save_full_content(self, content_data: Dict[str, Any], raw_content: str) -> None:
+    def save_full_content(
+        self,
+        content_data: Union[Dict[str, Any], RedBookContent],
+        raw_content: str,
+        output_dir: Optional[str] = None,
+    ) -> None:
         """
         保存完整内容到Markdown文件
 
         Args:
             content_data: 生成的内容数据
             raw_content: 原始输入内容
+            output_dir: 输出目录，默认使用当天的图片目录
         """
-        md_file: str = os.path.join(self.image_dir, "content.md")
-
-        with open(md_file, "w", encoding="utf - 8") as f:
-            f.write("# 小红书文案预览\n\n")
-            f.write(f"**生成时间**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
-
-            f.write("## 📕 可选标题\n\n")
-            titles: List[str] = content_data.get("titles", [])
-            for idx, title in enumerate(titles, start=1):
-                f.write(f"{idx}. {title}\n")
-
-            f.write("\n## 📝 正文内容\n\n")
-            f.write(content_data.get("content", ""))
+        item = RedBookContent.coerce(content_data)
+        md_file: str = os.path.join(output_dir or self.image_dir, "content.md")
 
-            f.write("\n\n## 🏷️ 标签\n\n")
-            f.write(content_data.get("tags", ""))
-
-            f.write("\n\n## 🎨 AI绘画提示词\n\n")
-            image_prompts: List[Dict[str, Any]] = content_data.get("image_prompts", [])[:4]
-            for idx, prompt_data in enumerate(image_prompts, start=1):
-                f.write(f"### 图{idx}: {prompt_data.get('scene', '')}\n\n")
-                f.write(f"```\n{prompt_data.get('prompt', '')}\n```\n\n")
-            cover: Dict[str, Any] = content_data.get("cover", {})
-            if cover.get("title") and cover.get("prompt"):
-                f.write(f"### 封面: {cover.get('title', '')}\n\n")
-                f.write(f"```\n{cover.get('prompt', '')}\n```\n\n")
+        prompt_blocks: List[str] = [
+            _CONTENT_MD_PROMPT_TEMPLATE.format(heading=f"图{idx}: {prompt_item.scene}", prompt=prompt_item.prompt)
+            for idx, prompt_item in enumerate(item.image_prompts, start=1)
+        ]
+        cover = item.cover
+        if cover.title and cover.prompt:
+            prompt_blocks.append(_CONTENT_MD_PROMPT_TEMPLATE.format(heading=f"封面: {cover.title}", prompt=cover.prompt))
+
+        markdown = _CONTENT_MD_TEMPLATE.format_map(
+            {
+                "generated_at": item.generated_at,
+                "titles_block": "".join(f"{idx}. {title}\n" for idx, title in enumerate(item.titles, start=1)),
+                "content": item.content,
+                "tags": item.tags,
+                "prompts_block": "".join(prompt_blocks),
+                "raw_content": raw_content,
+            }
+        )
 
-            f.write("\n---\n\n")
-            f.write("## 📄 原始输入内容\n\n")
-            f.write(raw_content)
+        # 渲染后一次写入
+        with open(md_file, "w", encoding="utf-8") as f:
+            f.write(markdown)
 
         Logger.info("完整内容已保存", logger_name="content_generator", file_path=md_file)
 
@@ -1065,27 +1860,102 @@ class RedBookContentGenerator:
             Logger.info("正在调用AI生成内容", logger_name="content_generator")
             content_data = self.generate_content(raw_content)
 
-            # 3. 保存到Excel
-            Logger.info("正在保存到Excel", logger_name="content_generator")
-            self.save_to_excel(content_data, raw_content)
-
-            # 4. 保存图片提示词
-            Logger.info("正在保存图片提示词", logger_name="content_generator")
-            self.save_image_prompts(content_data)
+            # 3. 保存结果：Excel/JSONL、图片提示词、完整内容写入互不相关的文件，并发执行
+            Logger.info("正在保存Excel、图片提示词和完整内容", logger_name="content_generator")
+            self.save_outputs(content_data, raw_content)
 
-            # 5. 保存完整内容
-            Logger.info("正在保存完整内容", logger_name="content_generator")
-            self.save_full_content(content_data, raw_content)
+            cache_stats = self.get_cache_stats()
+            if cache_stats is not None:
+                Logger.info(
+                    "内容缓存命中情况",
+                    logger_name="content_generator",
+                    hits=cache_stats["hits"],
+                    misses=cache_stats["misses"],
+                    hit_rate=cache_stats["hit_rate"],
+                )
 
             Logger.info("=" * 60, logger_name="content_generator")
             Logger.info("所有任务完成！", logger_name="content_generator")
-            Logger.info(f"Excel文件: {self.config_manager.get('output_excel')}", logger_name="content_generator")
+            if self.config_manager.get("output_excel_per_run", True):
+                Logger.info(f"Excel文件: {self.config_manager.get('output_excel')}", logger_name="content_generator")
+            Logger.info(f"JSONL日志: {self._get_jsonl_path()}", logger_name="content_generator")
             Logger.info(f"图片目录: {self.image_dir}", logger_name="content_generator")
             Logger.info("=" * 60, logger_name="content_generator")
 
         except Exception as e:
             ErrorHandler.handle_error(error=e, logger_name="content_generator", operation_name="主流程运行")
 
+    @staticmethod
+    def _path_digest(path: str) -> str:
+        """返回文件绝对路径的 8 位 SHA-256 十六进制摘要"""
+        import hashlib
+
+        return hashlib.sha256(os.path.abspath(path).encode("utf-8")).hexdigest()[:8]
+
+    def run_batch(self, input_paths: List[str]) -> List[Any]:
+        """
+        并发处理多个输入文件
+
+        所有文件先读取，再经 generate_content_batch 并发调用 AI（受 RPM/TPM 与最大并发数限制），
+        总耗时接近最慢的一条而不是逐条相加。Excel 只打开和保存一次，图片提示词与完整内容
+        按输入文件名分别写入当天图片目录下的子目录，互不覆盖；不同目录下的输入文件同名时，
+        子目录名追加绝对路径的 8 位哈希，如 input_1a2b3c4d。
+
+        Args:
+            input_paths: 输入文件路径列表
+
+        Returns:
+            与输入一一对应的结果列表，读取或生成失败的位置为对应的异常对象
+        """
+        results: List[Any] = [None] * len(input_paths)
+        pending: List[int] = []
+        raw_contents: List[str] = []
+        for index, input_path in enumerate(input_paths):
+            try:
+                raw_contents.append(self.read_input_file(input_path))
+                pending.append(index)
+            except Exception as e:
+                Logger.error("读取输入文件失败", logger_name="content_generator", file_path=input_path, error=str(e))
+                results[index] = e
+
+        for index, result in zip(pending, self.generate_content_batch(raw_contents)):
+            results[index] = result
+
+        # 不同目录下的同名文件追加完整路径的短哈希，避免输出目录相同而互相覆盖
+        stems = [os.path.splitext(os.path.basename(path))[0] for path in input_paths]
+        stem_counts = Counter(stems)
+        dir_names = [
+            stem if stem_counts[stem] == 1 else f"{stem}_{self._path_digest(path)}"
+            for stem, path in zip(stems, input_paths)
+        ]
+
+        saved: List[Tuple[RedBookContent, str]] = []
+        for index, raw_content in zip(pending, raw_contents):
+            if isinstance(results[index], Exception):
+                continue
+            item = RedBookContent.coerce(results[index])
+            output_dir = os.path.join(self.image_dir, dir_names[index])
+            os.makedirs(output_dir, exist_ok=True)
+            self.save_image_prompts(item, output_dir)
+            self.save_full_content(item, raw_content, output_dir)
+            saved.append((item, raw_content))
+
+        if saved:
+            with self._table_output_lock:
+                if self.config_manager.get("output_excel_per_run", True):
+                    self.save_batch_to_excel(saved)
+                for item, raw_content in saved:
+                    self.save_to_jsonl(item, raw_content)
+
+        Logger.info(
+            "批量处理完成",
+            logger_name="content_generator",
+            total=len(input_paths),
+            succeeded=len(saved),
+            failed=len(input_paths) - len(saved),
+        )
+        return results
+
 
 def main() -> None:
     """主函数"""
@@ -1094,12 +1964,23 @@ def main() -> None:
 
     parser = argparse.ArgumentParser(description="老北京文化·小红书内容生成器")
     parser.add_argument("-c", "--config", default="config/config.json", help="配置文件路径 (默认: config/config.json)")
+    parser.add_argument("--export-excel", action="store_true", help="不生成内容，仅从 JSONL 日志重新导出 Excel 文件")
+    parser.add_argument("-i", "--inputs", nargs="+", help="并发处理多个输入文件（默认读取配置中的 input_file）")
+    parser.add_argument("--no-cache", action="store_true", help="本次运行不读取也不写入内容缓存，强制重新生成")
 
     args = parser.parse_args()
 
     # 使用 ConfigManager 加载配置
     config_manager = ConfigManager(args.config)
+    if args.no_cache:
+        config_manager.set("cache.enabled", False)
     generator = RedBookContentGenerator(config_manager=config_manager)
+    if args.export_excel:
+        generator.export_excel_from_jsonl()
+        return
+    if args.inputs:
+        generator.run_batch(args.inputs)
+        return
     generator.run()
 
 
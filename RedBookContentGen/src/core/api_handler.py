@@ -6,10 +6,11 @@ API 调用处理器模块
 提供统一的 API 调用逻辑，包括速率限制、重试、错误处理
 """
 
-from typing import List, Dict, Optional, Any, Callable
+from types import SimpleNamespace
+from typing import List, Dict, Optional, Any, Callable, Iterable
 import openai
+from src.core import json_utils
 from src.core.logger import Logger
-from src.core.retry_handler import retry
 from src.core.exceptions import (
     APIError,
     APITimeoutError,
@@ -29,6 +30,7 @@ class APIHandler:
         tpm_limiter: Any = None,
         rate_limit_enabled: bool = False,
         logger_name: str = "api_handler",
+        stream: bool = False,
     ) -> None:
         """
         初始化 API 处理器
@@ -38,11 +40,13 @@ class APIHandler:
             tpm_limiter: 每分钟 token 数限制器
             rate_limit_enabled: 是否启用速率限制
             logger_name: 日志记录器名称
+            stream: 是否以流式方式接收响应（边生成边接收，记录接收进度）
         """
         self.rpm_limiter = rpm_limiter
         self.tpm_limiter = tpm_limiter
         self.rate_limit_enabled = rate_limit_enabled
         self.logger_name = logger_name
+        self.stream = stream
 
     def _acquire_rate_limit_tokens(self, messages: List[Dict], timeout: int = 60) -> None:
         """
@@ -121,13 +125,6 @@ class APIHandler:
         # 至少预留 100 tokens
         return max(estimated_tokens, 100)
 
-    @retry(
-        max_retries=3,
-        retry_delay=2.0,
-        backoff_factor=2.0,
-        exceptions=(openai.APIError, openai.APITimeoutError, openai.RateLimitError),
-        operation_name="OpenAI API 调用",
-    )
     def call_openai(
         self,
         client: openai.OpenAI,
@@ -138,7 +135,10 @@ class APIHandler:
         timeout: int = 60,
     ) -> Any:
         """
-        调用 OpenAI API（带速率限制和重试）
+        调用 OpenAI API（带速率限制）
+
+        429、5xx 和连接错误的重试由 OpenAI 客户端自身完成（max_retries，指数退避并遵循 Retry-After），
+        这里只负责把最终的失败转换为项目内的异常类型。
 
         Args:
             client: OpenAI 客户端实例
@@ -168,7 +168,15 @@ class APIHandler:
             if response_format:
                 kwargs["response_format"] = response_format
 
-            response = client.chat.completions.create(**kwargs)  # type: ignore[call-overload]
+            if self.stream:
+                kwargs["stream"] = True
+                chunks = client.chat.completions.create(**kwargs)  # type: ignore[call-overload]
+                # 拼接为与非流式响应相同的结构，调用方统一读取 choices[0].message.content
+                content = self._collect_stream_content(chunks)
+                response = SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+            else:
+                response = client.chat.completions.create(**kwargs)  # type: ignore[call-overload]
+                self._log_prompt_cache_usage(response, model)
 
             Logger.debug("✅ OpenAI API 调用成功", logger_name=self.logger_name, model=model)
 
@@ -187,6 +195,58 @@ class APIHandler:
                 e, message=f"OpenAI API 调用失败: {str(e)}", exception_class=APIError, api_name="OpenAI"
             )
 
+    def _log_prompt_cache_usage(self, response: Any, model: str) -> None:
+        """
+        记录服务端提示词前缀缓存的命中情况
+
+        提示词的固定部分在前、原始内容在末尾，相同模型下的多次调用可复用服务端的前缀缓存；
+        响应中的 usage.prompt_tokens_details.cached_tokens 即为命中缓存的 token 数。
+
+        Args:
+            response: API 响应对象
+            model: 模型名称
+        """
+        usage = getattr(response, "usage", None)
+        prompt_tokens = getattr(usage, "prompt_tokens", None)
+        cached_tokens = getattr(getattr(usage, "prompt_tokens_details", None), "cached_tokens", None)
+        if not isinstance(prompt_tokens, int) or not isinstance(cached_tokens, int) or prompt_tokens <= 0:
+            return
+
+        Logger.debug(
+            "提示词前缀缓存命中情况",
+            logger_name=self.logger_name,
+            model=model,
+            prompt_tokens=prompt_tokens,
+            cached_tokens=cached_tokens,
+            cache_hit_ratio=f"{cached_tokens / prompt_tokens:.2%}",
+        )
+
+    def _collect_stream_content(self, chunks: Iterable[Any], progress_interval: int = 50) -> str:
+        """
+        接收流式响应并拼接文本
+
+        Args:
+            chunks: 流式响应的分片迭代器
+            progress_interval: 每接收多少个分片记录一次进度
+
+        Returns:
+            完整的响应文本
+        """
+        parts: List[str] = []
+        for count, chunk in enumerate(chunks, start=1):
+            if chunk.choices:
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    parts.append(delta)
+            if count % progress_interval == 0:
+                Logger.debug(
+                    "正在接收流式响应",
+                    logger_name=self.logger_name,
+                    chunks=count,
+                    received_chars=sum(map(len, parts)),
+                )
+        return "".join(parts)
+
     def call_openai_with_evaluation(
         self,
         client: openai.OpenAI,
@@ -195,6 +255,7 @@ class APIHandler:
         prompt_builder: Callable[[str, int], str],
         max_iterations: int = 3,
         evaluator: Optional[Callable[[str], bool]] = None,
+        validator: Optional[Callable[[Dict], None]] = None,
     ) -> Dict:
         """
         调用 OpenAI API 并进行迭代评估
@@ -206,6 +267,7 @@ class APIHandler:
             prompt_builder: 提示词构建函数
             max_iterations: 最大迭代次数
             evaluator: 评估函数（可选）
+            validator: 结构校验函数（可选），校验不通过时抛出异常，本次结果作废并进入下一次尝试
 
         Returns:
             最佳生成结果
@@ -239,9 +301,10 @@ class APIHandler:
                     response_format={"type": "json_object"},
                 )
 
-                import json
-
-                result = json.loads(response.choices[0].message.content.strip())
+                result_text = response.choices[0].message.content.strip()
+                result = json_utils.loads(result_text)
+                if validator:
+                    validator(result)
                 best_result = result
 
                 # 如果提供了评估函数，进行评估
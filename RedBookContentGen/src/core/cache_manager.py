@@ -10,6 +10,7 @@
 
 import hashlib
 import json
+import os
 import pickle
 import threading
 import time
@@ -17,6 +18,8 @@ from collections import OrderedDict
 from pathlib import Path
 from typing import Any, Callable, Dict, Optional, Tuple, Union
 
+from src.core import json_utils
+
 
 class CacheManager:
     """缓存管理器
@@ -380,7 +383,7 @@ class FileCacheManager:
             序列化后的字节数据
         """
         if self._serializer == "json":
-            return json.dumps(value, ensure_ascii=False).encode("utf - 8")
+            return json_utils.dumps(value)
         else:  # pickle
             return pickle.dumps(value)
 
@@ -395,7 +398,7 @@ class FileCacheManager:
             反序列化后的值
         """
         if self._serializer == "json":
-            return json.loads(data.decode("utf - 8"))
+            return json_utils.loads(data)
         else:  # pickle
             return pickle.loads(data)
 
@@ -531,8 +534,11 @@ class FileCacheManager:
                 data = self._serialize(value)
                 cache_path = self._get_cache_path(key)
 
-                with open(cache_path, "wb") as f:
+                # 先写临时文件再替换，避免进程中断时留下不完整的缓存文件
+                temp_path = cache_path.with_suffix(cache_path.suffix + ".tmp")
+                with open(temp_path, "wb") as f:
                     f.write(data)
+                os.replace(temp_path, cache_path)
 
                 # 写入元数据
                 self._write_metadata(key, expire_time)
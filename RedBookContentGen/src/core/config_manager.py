@@ -14,6 +14,7 @@ from pathlib import Path
 from typing import Any, Callable, Dict, Optional
 from copy import deepcopy
 
+from src.core import json_utils
 
 class ConfigManager:
     """统一配置管理器
@@ -165,11 +166,10 @@ class ConfigManager:
             suffix = config_path.suffix.lower()
 
             if suffix == ".json":
-                with open(config_path, "r", encoding="utf - 8") as f:
-                    file_config = json.load(f)
+                file_config = json_utils.loads(config_path.read_bytes())
             elif suffix in [".yaml", ".yml"]:
                 try:
-                    import yaml  # type: ignore
+                    import yaml
 
                     with open(config_path, "r", encoding="utf - 8") as f:
                         file_config = yaml.safe_load(f)
@@ -25,6 +25,8 @@ class OpenAIAPIConfig(BaseModel):
 
     max_retries: int = Field(default=3, description="最大重试次数", ge=0, le=10)
 
+    stream: bool = Field(default=False, description="是否以流式方式接收生成结果")
+
     @field_validator("base_url")
     @classmethod
     def validate_base_url(cls, v: str) -> str:
@@ -50,6 +52,7 @@ class OpenAIAPIConfig(BaseModel):
                 "model": "qwen-plus",
                 "timeout": 30,
                 "max_retries": 3,
+                "stream": False,
             }
         }
 
@@ -129,6 +132,12 @@ class CacheConfig(BaseModel):
 
     image_cache_enabled: bool = Field(default=True, description="是否启用图片生成缓存")
 
+    rewrite_cache_enabled: bool = Field(default=True, description="是否启用AI改写结果缓存（持久化到 cache_dir）")
+
+    persist_content_cache: bool = Field(
+        default=False, description="是否将内容生成结果持久化到 cache_dir，跨运行复用（相同模型和输入不再调用 API）"
+    )
+
     cache_dir: str = Field(default="cache", description="缓存目录路径", min_length=1)
 
     @field_validator("max_size")
@@ -184,6 +193,8 @@ class CacheConfig(BaseModel):
                 "eviction_policy": "lru",
                 "content_cache_enabled": True,
                 "image_cache_enabled": True,
+                "rewrite_cache_enabled": True,
+                "persist_content_cache": False,
                 "cache_dir": "cache",
             }
         }
@@ -269,6 +280,8 @@ class OpenAIRateLimitConfig(BaseModel):
 
     enable_rate_limit: bool = Field(default=True, description="是否启用速率限制")
 
+    max_concurrent: int = Field(default=4, description="批量生成时的最大并发请求数", gt=0, le=50)
+
     @model_validator(mode="after")
     def validate_rate_limits(self):
         """验证速率限制设置的合理性"""
@@ -293,7 +306,12 @@ class OpenAIRateLimitConfig(BaseModel):
 
     class Config:
         json_schema_extra = {
-            "example": {"requests_per_minute": 60, "tokens_per_minute": 90000, "enable_rate_limit": True}
+            "example": {
+                "requests_per_minute": 60,
+                "tokens_per_minute": 90000,
+                "enable_rate_limit": True,
+                "max_concurrent": 4,
+            }
         }
 
 
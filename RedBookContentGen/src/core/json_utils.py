@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+JSON 编解码工具模块
+
+已安装 orjson 时使用 orjson，否则回退到标准库 json。
+两种实现的输出可以互相读取，解析错误均为 json.JSONDecodeError（ValueError 的子类）。
+"""
+
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # orjson 为可选依赖
+    HAS_ORJSON = False
+else:
+    HAS_ORJSON = True
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    """
+    解析 JSON 文本
+
+    Args:
+        data: JSON 字符串或 UTF-8 字节串
+
+    Returns:
+        解析后的对象
+    """
+    if HAS_ORJSON:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(value: Any, indent: bool = False) -> bytes:
+    """
+    序列化为保留中文原文的 UTF-8 JSON 字节串
+
+    Args:
+        value: 要序列化的对象（允许非字符串键，与标准库 json 行为一致）
+        indent: 是否缩进 2 格输出
+
+    Returns:
+        序列化后的字节数据
+    """
+    if HAS_ORJSON:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        result: bytes = orjson.dumps(value, option=option)
+        return result
+    return json.dumps(value, ensure_ascii=False, indent=2 if indent else None).encode("utf-8")
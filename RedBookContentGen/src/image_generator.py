@@ -5,10 +5,15 @@
 读取图片提示词文件，调用通义万相API生成图片
 """
 
+import bisect
+import itertools
 import os
 import re
+import threading
 import time
-from typing import List, Dict, Optional, Tuple, TYPE_CHECKING, Any
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, List, Dict, Optional, Tuple, TYPE_CHECKING, Any
 
 import requests
 
@@ -29,10 +34,52 @@ except ImportError:
     HAS_PIL = False
     Logger.warning("未安装PIL/Pillow，无法使用文字叠加功能。请运行: pip install Pillow", logger_name="image_generator")
 
+# 提示词文件解析模式
+_BODY_TEXT_PATTERN = re.compile(r"## 正文内容\n\n(.*?)\n\n---", re.DOTALL)
+# 故事图与封面提示词块：## 图N: 场景 / ## 封面: 短标题，后接 ``` prompt ```
+_PROMPT_BLOCK_PATTERN = re.compile(
+    r"## (?:图(?P<index>\d+): (?P<scene>.*?)|封面:\s*(?P<title>.*?))\n\n```(?P<prompt>.*?)```", re.DOTALL
+)
+
+# 内容审核未通过重试时移除的词汇：敏感词表加上额外的可能敏感词汇，一次替换完成
+_RETRY_SENSITIVE_WORDS = tuple(
+    dict.fromkeys(TextProcessor.SENSITIVE_KEYWORDS + ("血腥", "暴力", "色情", "政治", "敏感", "争议", "战争", "武器"))
+)
+_RETRY_SENSITIVE_WORD_PATTERN = re.compile(
+    "|".join(re.escape(word) for word in sorted(_RETRY_SENSITIVE_WORDS, key=len, reverse=True))
+)
+
+# 单行文字强制分割时优先断开的字（语义断点和句读）
+_FALLBACK_SPLIT_CHARS = frozenset(["的", "之", "前", "后", "上", "下", "里", "中", "为", "是", "，", "。", "！", "？"])
+
 
 class ImageGenerator:
     """图片生成器"""
 
+    # 文字叠加候选字体（按优先级）
+    FONT_PATHS = (
+        # macOS - 优先使用粗体字体
+        "/System/Library/Fonts/PingFang.ttc",
+        "/System/Library/Fonts/STHeiti Medium.ttc",
+        "/System/Library/Fonts/STHeiti Light.ttc",
+        "/System/Library/Fonts/Helvetica.ttc",
+        # Windows - 优先黑体
+        "C:/Windows/Fonts/simhei.ttf",
+        "C:/Windows/Fonts/simkai.ttf",
+        "C:/Windows/Fonts/simsun.ttc",
+        "C:/Windows/Fonts/msyhbd.ttc",
+        "C:/Windows/Fonts/msyh.ttc",
+        # Linux
+        "/usr/share/fonts/truetype/wqy/wqy-microhei.ttc",
+        "/usr/share/fonts/truetype/arphic/uming.ttc",
+    )
+
+    # 图片下载并发数（下载为网络 IO，可与后续图片的生成并行）
+    DOWNLOAD_WORKERS = 4
+
+    # 换行/截断结果缓存条目上限
+    TEXT_LAYOUT_CACHE_SIZE = 256
+
     def __init__(self, config_manager: Optional["ConfigManager"] = None, config_path: str = "config/config.json"):
         """
         初始化生成器
@@ -78,8 +125,12 @@ class ImageGenerator:
             "openai_base_url", "https://dashscope.aliyuncs.com/compatible-mode/v1"
         )
 
+        # 复用连接的 HTTP 会话（通义万相、任务轮询、文案改写共用）
+        self.session = self._create_http_session()
+
         # 可疑内容记录文件
         self.suspicious_content_file = None
+        self._suspicious_content_lock = threading.Lock()  # 多张图片并发生成时保护记录文件
 
         # 初始化缓存
         self._cache_enabled = self.config_manager.get("cache.enabled", False)
@@ -100,12 +151,104 @@ class ImageGenerator:
             self.cache = None
             Logger.info("缓存已禁用", logger_name="image_generator")
 
+        # AI改写结果缓存（内存LRU + 文件持久化，延迟初始化）
+        self._rewrite_cache_enabled = self.config_manager.get("cache.rewrite_cache_enabled", True)
+        self._rewrite_memory_cache = None
+        self._rewrite_file_cache = None
+
+        # 字体缓存：可用字体文件 (路径, 索引) 只查找一次，字体对象按字号缓存
+        self._font_source: Optional[Tuple[str, int]] = None
+        self._font_cache: Dict[int, Any] = {}
+
+        # 字体平均字符宽度缓存（按字体路径和字号）
+        self._avg_char_width_cache: Dict[Tuple[Any, Any], float] = {}
+
+        # 单字符宽度缓存（按字体路径、字号和字符），换行时累加行宽
+        self._char_width_cache: Dict[Tuple[Any, Any, str], float] = {}
+
+        # 文字高度探测缓存（按字体路径和字号）
+        self._text_height_cache: Dict[Tuple[Any, Any], float] = {}
+
+        # 行度量缓存（按字体路径、字号和是否封面），值为 (文字高度, 基础行高, 行高)
+        self._line_metrics_cache: Dict[Tuple[Any, Any, bool], Tuple[int, int, int]] = {}
+
+        # 换行/截断结果缓存（LRU），审核失败重试时叠加文字不变，无需重新排版
+        self._text_layout_cache: "OrderedDict[Tuple[Any, ...], Tuple[str, ...]]" = OrderedDict()
+        self._text_layout_lock = threading.Lock()  # move_to_end/popitem 非线程安全，多线程排版时保护缓存
+
         # 初始化速率限制器
         self._init_rate_limiter()
 
         # 初始化图片生成管道
         self._pipeline = None  # 延迟初始化
 
+    def _create_http_session(self) -> requests.Session:
+        """
+        创建复用连接的 HTTP 会话
+
+        同一主机的请求复用 TCP/TLS 连接（任务状态轮询每张图片可达上百次），
+        幂等请求（GET）遇到 429/5xx 时按指数退避自动重试；
+        POST 不自动重试，避免重复创建图片生成任务
+
+        Returns:
+            requests.Session 实例
+        """
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        retry = Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=[429, 500, 502, 503, 504],
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=10, pool_maxsize=10, max_retries=retry)
+
+        session = requests.Session()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers.update({"Authorization": f"Bearer {self.api_key}"})
+        return session
+
+    def _post_with_throttle_retry(
+        self, url: str, json: Dict, timeout: float, max_retries: int = 3
+    ) -> requests.Response:
+        """
+        发送 POST 请求，遇到 429 限流时按 Retry-After 等待后重试
+
+        429 表示请求未被受理（任务未创建），重试不会产生重复任务
+
+        Args:
+            url: 请求地址
+            json: 请求体
+            timeout: 超时时间（秒）
+            max_retries: 最大重试次数
+
+        Returns:
+            最后一次请求的响应
+        """
+        for attempt in range(max_retries + 1):
+            response = self.session.post(url, json=json, timeout=timeout)
+            if response.status_code != 429 or attempt == max_retries:
+                return response
+
+            try:
+                wait_time = float(response.headers.get("Retry-After", ""))
+            except ValueError:
+                wait_time = 2.0**attempt
+            wait_time = min(max(wait_time, 0.0), 60.0)
+
+            Logger.warning(
+                "接口限流（429），等待后重试",
+                logger_name="image_generator",
+                wait_seconds=wait_time,
+                attempt=attempt + 1,
+            )
+            print(f"  ⏳ 接口限流，{wait_time:.1f}秒后重试（{attempt + 1}/{max_retries}）...")
+            time.sleep(wait_time)
+
+        return response
+
     def _init_rate_limiter(self) -> None:
         """初始化速率限制器"""
         from src.core.rate_limiter import RateLimiter
@@ -220,47 +363,14 @@ class ImageGenerator:
         if not prompt:
             return True, prompt
 
-        # 真正敏感的词汇（只检查明显不当的内容）
-        # 注意：不包含"天安门"、"广场"、"故宫"等正常历史文化词汇
-        sensitive_keywords = [
-            # 明显政治敏感（不含正常历史描述）
-            "革命",
-            "暴动",
-            "叛乱",
-            "政变",
-            # 明显暴力
-            "血腥",
-            "杀戮",
-            "屠杀",
-            "武器",
-            "枪",
-            "刀",
-            # 明显色情
-            "色情",
-            "裸露",
-            "情色",
-            # 其他明显敏感
-            "恐怖",
-            "爆炸",
-            "毒品",
-            "赌博",
-        ]
-
         # 检查是否包含敏感词
         # 注意：中文没有词边界，所以直接检查是否包含关键词
         # 但只检查明显敏感的词，不误杀正常历史文化内容
-        found_keywords = []
-        for keyword in sensitive_keywords:
-            if keyword in prompt:
-                found_keywords.append(keyword)
-
-        if found_keywords:
-            # 尝试移除敏感词
-            modified_prompt = prompt
-            for keyword in found_keywords:
-                modified_prompt = modified_prompt.replace(keyword, "")
+        if TextProcessor.SENSITIVE_KEYWORD_PATTERN.search(prompt):
+            # 一次替换移除全部敏感词
+            modified_prompt = TextProcessor.SENSITIVE_KEYWORD_PATTERN.sub("", prompt)
             # 清理多余空格
-            modified_prompt = re.sub(r"\s+", " ", modified_prompt).strip()
+            modified_prompt = TextProcessor.WHITESPACE_PATTERN.sub(" ", modified_prompt).strip()
             return False, modified_prompt
 
         return True, prompt
@@ -288,6 +398,69 @@ class ImageGenerator:
 
         return f"image_gen:{hash_value}"
 
+    def _generate_rewrite_cache_key(self, text: str, max_chars: int) -> str:
+        """
+        生成AI改写缓存键（基于改写模型、原文和字数上限的 hash）
+
+        Args:
+            text: 原始文案
+            max_chars: 最大字符数
+
+        Returns:
+            缓存键
+        """
+        import hashlib
+        import json
+
+        cache_content = {"model": self.rewrite_model, "text": text, "max_chars": max_chars}
+        content_str = json.dumps(cache_content, sort_keys=True, ensure_ascii=False)
+        hash_value = hashlib.sha256(content_str.encode("utf-8")).hexdigest()
+
+        return f"rewrite:{hash_value}"
+
+    def _get_rewrite_caches(self) -> Tuple[Any, Any]:
+        """获取AI改写缓存实例（延迟初始化，避免未使用改写时创建缓存目录）"""
+        if self._rewrite_file_cache is None:
+            from src.core.cache_manager import CacheManager, FileCacheManager
+
+            cache_dir = os.path.join(self.config_manager.get("cache.cache_dir", "cache"), "rewrite")
+            # 改写结果只由 (模型, 原文, 字数上限) 决定，不设置过期时间
+            self._rewrite_memory_cache = CacheManager(max_size=256, default_ttl=None)
+            self._rewrite_file_cache = FileCacheManager(cache_dir=cache_dir, serializer="json", default_ttl=None)
+        return self._rewrite_memory_cache, self._rewrite_file_cache
+
+    def _get_cached_rewrite(self, cache_key: str) -> Optional[str]:
+        """
+        查询AI改写缓存（先查内存，再查文件）
+
+        Args:
+            cache_key: 缓存键
+
+        Returns:
+            缓存的改写结果，未命中返回 None
+        """
+        memory_cache, file_cache = self._get_rewrite_caches()
+
+        rewritten = memory_cache.get(cache_key)
+        if rewritten is None:
+            rewritten = file_cache.get(cache_key)
+            if rewritten is not None:
+                memory_cache.set(cache_key, rewritten)
+
+        return rewritten
+
+    def _save_rewrite_to_cache(self, cache_key: str, rewritten: str) -> None:
+        """
+        保存AI改写结果到缓存（内存 + 文件）
+
+        Args:
+            cache_key: 缓存键
+            rewritten: 改写后的文案
+        """
+        memory_cache, file_cache = self._get_rewrite_caches()
+        memory_cache.set(cache_key, rewritten)
+        file_cache.set(cache_key, rewritten)
+
     def get_cache_stats(self) -> Optional[Dict]:
         """
         获取缓存统计信息
@@ -316,19 +489,29 @@ class ImageGenerator:
             content_type: 内容类型
             reason: 失败原因
         """
-        if self.suspicious_content_file is None:
-            self.suspicious_content_file = os.path.join(prompts_dir, "suspicious_content.txt")
-            with open(self.suspicious_content_file, "w", encoding="utf - 8") as f:
-                f.write("# 可疑内容记录\n\n")
-                f.write("以下内容在生成图片时可能触发内容审核失败，请手动修改后重新生成。\n\n")
-                f.write("=" * 60 + "\n\n")
+        with self._suspicious_content_lock:
+            if self.suspicious_content_file is None:
+                self.suspicious_content_file = os.path.join(prompts_dir, "suspicious_content.txt")
+                with open(self.suspicious_content_file, "w", encoding="utf - 8") as f:
+                    f.write(
+                        "# 可疑内容记录\n\n"
+                        "以下内容在生成图片时可能触发内容审核失败，请手动修改后重新生成。\n\n"
+                        + "=" * 60
+                        + "\n\n"
+                    )
 
-        with open(self.suspicious_content_file, "a", encoding="utf - 8") as f:
-            f.write(f"## {content_type}\n\n")
-            f.write(f"**失败原因**: {reason}\n\n")
-            f.write(f"**原始内容**:\n```\n{content}\n```\n\n")
-            f.write("**建议**: 请移除或替换上述敏感词汇，然后重新运行脚本。\n\n")
-            f.write("-" * 60 + "\n\n")
+            # 整条记录拼接后一次写入
+            record = "".join(
+                [
+                    f"## {content_type}\n\n",
+                    f"**失败原因**: {reason}\n\n",
+                    f"**原始内容**:\n```\n{content}\n```\n\n",
+                    "**建议**: 请移除或替换上述敏感词汇，然后重新运行脚本。\n\n",
+                    "-" * 60 + "\n\n",
+                ]
+            )
+            with open(self.suspicious_content_file, "a", encoding="utf - 8") as f:
+                f.write(record)
 
     def parse_prompts_file(self, prompts_file: str) -> Tuple[List[Dict], str]:
         """
@@ -348,25 +531,26 @@ class ImageGenerator:
 
         # 解析正文内容
         body_text = ""
-        body_match = re.search(r"## 正文内容\n\n(.*?)\n\n---", content, re.DOTALL)
+        body_match = _BODY_TEXT_PATTERN.search(content)
         if body_match:
             body_text = body_match.group(1).strip()
 
-        # 解析提示词：图1 - 4（故事图）+ 封面
+        # 解析提示词：图1 - 4（故事图）+ 封面，一次扫描全文
         prompts = []
-        # 匹配 ## 图N: 场景\n\n``` prompt ```
-        for m in re.finditer(r"## 图(\d+): (.*?)\n\n```(.*?)```", content, re.DOTALL):
-            idx = int(m.group(1))
-            scene = m.group(2).strip()
-            prompt = m.group(3).strip()
-            prompts.append({"index": idx, "scene": scene, "prompt": prompt, "is_cover": False, "title": None})
-
-        # 匹配 ## 封面: 短标题\n\n``` prompt ```
-        cover_m = re.search(r"## 封面:\s*(.*?)\n\n```(.*?)```", content, re.DOTALL)
-        if cover_m:
-            title = cover_m.group(1).strip()
-            prompt = cover_m.group(2).strip()
-            prompts.append({"index": 0, "scene": f"封面：{title}", "prompt": prompt, "is_cover": True, "title": title})
+        cover = None
+        for m in _PROMPT_BLOCK_PATTERN.finditer(content):
+            prompt = m.group("prompt").strip()
+            if m.group("index") is not None:
+                idx = int(m.group("index"))
+                scene = m.group("scene").strip()
+                prompts.append({"index": idx, "scene": scene, "prompt": prompt, "is_cover": False, "title": None})
+            elif cover is None:
+                title = m.group("title").strip()
+                cover = {"index": 0, "scene": f"封面：{title}", "prompt": prompt, "is_cover": True, "title": title}
+
+        # 封面排在故事图之后
+        if cover:
+            prompts.append(cover)
 
         if not prompts:
             raise ValueError(f"❌ 无法从文件中解析出提示词: {prompts_file}")
@@ -448,16 +632,11 @@ class ImageGenerator:
 
         try:
             # 清理提示词
-            clean_prompt = re.sub(r"--ar\s*\d+:\d+", "", prompt)
-            clean_prompt = re.sub(r"--v\s*\d+(\.\d+)?", "", clean_prompt)
-            clean_prompt = re.sub(r"--style\s+\w+", "", clean_prompt)
-            clean_prompt = clean_prompt.strip()
+            clean_prompt = TextProcessor.PROMPT_PARAM_PATTERN.sub("", prompt).strip()
 
             # 千问 Qwen-Image 同步接口
             url = "https://dashscope.aliyuncs.com/api/v1/services/aigc/multimodal-generation/generation"
 
-            headers = {"Authorization": f"Bearer {self.api_key}", "Content-Type": "application/json"}
-
             # 解析尺寸
             width, height = 1024, 1365
             if size and "*" in size:
@@ -474,7 +653,7 @@ class ImageGenerator:
             print("  📤 正在调用千问 Qwen-Image 同步接口...")
 
             # 优化: 降低超时时间到60秒,同步接口通常10 - 30秒内返回
-            response = requests.post(url, headers=headers, json=data, timeout=60)
+            response = self._post_with_throttle_retry(url, json=data, timeout=60)
 
             if response.status_code != 200:
                 print(f"  ❌ 请求失败: {response.status_code} - {response.text[:200]}")
@@ -534,14 +713,14 @@ class ImageGenerator:
             图片URL
         """
         status_url = f"{self.task_status_url}/{task_id}"
-        headers = {"Authorization": f"Bearer {self.api_key}"}
 
         start_time = time.time()
-        # 优化: 缩短轮询间隔,从3秒降到2秒,加快获取结果
-        poll_interval = 2
+        # 轮询间隔指数退避：从0.5秒开始，每次乘1.5，最长4秒
+        # 快速完成的任务能尽早拿到结果，耗时较长的任务也不会过于频繁地轮询
+        poll_interval = 0.5
 
         while time.time() - start_time < max_wait:
-            response = requests.get(status_url, headers=headers)
+            response = self.session.get(status_url, timeout=30)
 
             if response.status_code != 200:
                 raise Exception(f"❌ 查询任务状态失败: {response.status_code} - {response.text}")
@@ -570,10 +749,12 @@ class ImageGenerator:
             elif task_status in ["PENDING", "RUNNING", "INITIALIZING"]:
                 print(f"  ⏳ 等待中... 状态: {task_status}", end="\r")
                 time.sleep(poll_interval)
+                poll_interval = min(poll_interval * 1.5, 4.0)
 
             else:
                 print(f"  ⚠️  未知状态: {task_status}")
                 time.sleep(poll_interval)
+                poll_interval = min(poll_interval * 1.5, 4.0)
 
         raise Exception(f"❌ 任务超时（{max_wait}秒）")
 
@@ -602,7 +783,7 @@ class ImageGenerator:
 
     def _load_font(self, size: int) -> Any:
         """
-        加载指定大小的字体
+        加载指定大小的字体（同一字号只解析一次字体文件）
 
         Args:
             size: 字体大小
@@ -610,37 +791,42 @@ class ImageGenerator:
         Returns:
             字体对象（ImageFont.FreeTypeFont 或 ImageFont.ImageFont）
         """
-        font_paths = [
-            # macOS - 优先使用粗体字体
-            "/System/Library/Fonts/PingFang.ttc",
-            "/System/Library/Fonts/STHeiti Medium.ttc",
-            "/System/Library/Fonts/STHeiti Light.ttc",
-            "/System/Library/Fonts/Helvetica.ttc",
-            # Windows - 优先黑体
-            "C:/Windows/Fonts/simhei.ttf",
-            "C:/Windows/Fonts/simkai.ttf",
-            "C:/Windows/Fonts/simsun.ttc",
-            "C:/Windows/Fonts/msyhbd.ttc",
-            "C:/Windows/Fonts/msyh.ttc",
-            # Linux
-            "/usr/share/fonts/truetype/wqy/wqy-microhei.ttc",
-            "/usr/share/fonts/truetype/arphic/uming.ttc",
-        ]
-
-        for font_path in font_paths:
-            if os.path.exists(font_path):
-                try:
-                    if font_path.endswith(".ttc"):
-                        from PIL import ImageFont
+        font = self._font_cache.get(size)
+        if font is None:
+            font = self._create_font(size)
+            self._font_cache[size] = font
+        return font
 
-                        try:
-                            return ImageFont.truetype(font_path, size, index=1)
-                        except Exception:
-                            return ImageFont.truetype(font_path, size, index=0)
-                    else:
-                        return ImageFont.truetype(font_path, size)
-                except Exception:
-                    continue
+    def _create_font(self, size: int) -> Any:
+        """
+        创建指定大小的字体对象
+
+        首次调用时按优先级查找可用的字体文件并记录下来，之后直接使用该字体文件
+
+        Args:
+            size: 字体大小
+
+        Returns:
+            字体对象（ImageFont.FreeTypeFont 或 ImageFont.ImageFont）
+        """
+        if self._font_source is not None:
+            font_path, font_index = self._font_source
+            try:
+                return ImageFont.truetype(font_path, size, index=font_index)
+            except Exception:
+                self._font_source = None
+
+        for font_path in self.FONT_PATHS:
+            if os.path.exists(font_path):
+                # .ttc 字体集优先使用第二个字体（通常为粗体），失败时退回第一个
+                font_indexes = (1, 0) if font_path.endswith(".ttc") else (0,)
+                for font_index in font_indexes:
+                    try:
+                        font = ImageFont.truetype(font_path, size, index=font_index)
+                    except Exception:
+                        continue
+                    self._font_source = (font_path, font_index)
+                    return font
 
         # 如果找不到字体，使用默认字体
         try:
@@ -648,6 +834,38 @@ class ImageGenerator:
         except Exception:
             return ImageFont.load_default()
 
+    @staticmethod
+    def _font_cache_key(font: Any) -> Tuple[Any, Any]:
+        """
+        生成字体度量缓存的键
+
+        Args:
+            font: 字体对象
+
+        Returns:
+            (字体路径, 字号)，无路径的字体使用对象 id
+        """
+        return (getattr(font, "path", id(font)), getattr(font, "size", None))
+
+    def _char_width(self, char: str, font: Any, draw: Any) -> float:
+        """
+        获取单个字符的宽度（按字体缓存）
+
+        Args:
+            char: 字符
+            font: 字体对象
+            draw: 绘图对象
+
+        Returns:
+            字符宽度（像素）
+        """
+        key = (*self._font_cache_key(font), char)
+        width = self._char_width_cache.get(key)
+        if width is None:
+            width = draw.textlength(char, font=font)
+            self._char_width_cache[key] = width
+        return width
+
     def _calculate_font_size(self, height: int, is_cover: bool) -> int:
         """
         根据图片类型计算字体大小
@@ -681,16 +899,20 @@ class ImageGenerator:
         margin = int(width * 0.1)
         available_width = width - 2 * margin
 
-        # 计算文字高度
-        test_chars = "测\n测"
-        bbox_test = draw.textbbox((0, 0), test_chars, font=font)
-
-        if bbox_test[3] - bbox_test[1] < font.size * 1.5:
-            test_chars = "测"
+        # 计算文字高度（探测结果只取决于字体，按字体缓存）
+        font_key = self._font_cache_key(font)
+        text_height = self._text_height_cache.get(font_key)
+        if text_height is None:
+            test_chars = "测\n测"
             bbox_test = draw.textbbox((0, 0), test_chars, font=font)
-            text_height = bbox_test[3] - bbox_test[1]
-        else:
-            text_height = (bbox_test[3] - bbox_test[1]) / 2
+
+            if bbox_test[3] - bbox_test[1] < font.size * 1.5:
+                test_chars = "测"
+                bbox_test = draw.textbbox((0, 0), test_chars, font=font)
+                text_height = bbox_test[3] - bbox_test[1]
+            else:
+                text_height = (bbox_test[3] - bbox_test[1]) / 2
+            self._text_height_cache[font_key] = text_height
 
         # 计算文字宽度
         bbox = draw.textbbox((0, 0), text, font=font)
@@ -724,17 +946,28 @@ class ImageGenerator:
         optimal_font_size = max_font_size
         optimal_font = font
 
-        for test_size in range(max_font_size, min_font_size - 1, -2):
+        # 候选字号从大到小（步长2），文字宽度随字号单调变化，
+        # 二分查找第一个能放下文字的字号，只需 O(log N) 次加载和测量
+        candidate_sizes = range(max_font_size, min_font_size - 1, -2)
+
+        def fits(test_size: int) -> bool:
             try:
-                test_font = self._load_font(test_size)
-                test_bbox = draw.textbbox((0, 0), text, font=test_font)
-                test_width = test_bbox[2] - test_bbox[0]
-                if test_width <= available_width:
-                    optimal_font_size = test_size
-                    optimal_font = test_font
-                    break
+                test_bbox = draw.textbbox((0, 0), text, font=self._load_font(test_size))
             except Exception:
-                continue
+                return False
+            return test_bbox[2] - test_bbox[0] <= available_width
+
+        lo, hi = 0, len(candidate_sizes)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if fits(candidate_sizes[mid]):
+                hi = mid
+            else:
+                lo = mid + 1
+
+        if lo < len(candidate_sizes):
+            optimal_font_size = candidate_sizes[lo]
+            optimal_font = self._load_font(optimal_font_size)
 
         # 重新计算文字尺寸
         bbox = draw.textbbox((0, 0), text, font=optimal_font)
@@ -757,7 +990,7 @@ class ImageGenerator:
         Returns:
             处理后的文字行列表
         """
-        lines = self._wrap_text(text, available_width, font, draw)
+        lines = self._wrap_text(text, available_width, font, draw, max_lines)
 
         # 如果文字超过最大行数,尝试AI改写
         if len(lines) > max_lines:
@@ -768,7 +1001,7 @@ class ImageGenerator:
 
             if rewritten_text and rewritten_text != text:
                 text = rewritten_text
-                lines = self._wrap_text(text, available_width, font, draw)
+                lines = self._wrap_text(text, available_width, font, draw, max_lines)
 
             if len(lines) > max_lines:
                 print("  ✂️  改写后仍超长,使用智能截断")
@@ -789,26 +1022,35 @@ class ImageGenerator:
         Returns:
             包含行度量信息的字典
         """
-        test_bbox = draw.textbbox((0, 0), "测", font=font)
-        text_height = test_bbox[3] - test_bbox[1]
+        # 文字高度、基础行高、行高只取决于字体和图片类型，按字体缓存，
+        # 底部溢出截断后重新计算时无需再次测量
+        metrics_key = (*self._font_cache_key(font), is_cover)
+        cached = self._line_metrics_cache.get(metrics_key)
+        if cached is None:
+            test_bbox = draw.textbbox((0, 0), "测", font=font)
+            text_height = test_bbox[3] - test_bbox[1]
 
-        try:
-            ascent, descent = font.getmetrics()
-            base_line_height = ascent + descent
-        except Exception:
-            base_line_height = int(text_height)
+            try:
+                ascent, descent = font.getmetrics()
+                base_line_height = ascent + descent
+            except Exception:
+                base_line_height = int(text_height)
 
-        n_lines = max(1, len(lines))
+            # 行间距比例
+            line_spacing_ratio = 0.25 if is_cover else 0.30
+            line_spacing = int(base_line_height * line_spacing_ratio)
 
-        # 行间距比例
-        line_spacing_ratio = 0.25 if is_cover else 0.30
-        line_spacing = int(base_line_height * line_spacing_ratio)
+            # 行高计算
+            line_height = base_line_height + line_spacing
+            min_line_height = int(base_line_height * 1.2)
+            max_line_height = int(base_line_height * 1.6)
+            line_height = max(min_line_height, min(line_height, max_line_height))
 
-        # 行高计算
-        line_height = base_line_height + line_spacing
-        min_line_height = int(base_line_height * 1.2)
-        max_line_height = int(base_line_height * 1.6)
-        line_height = max(min_line_height, min(line_height, max_line_height))
+            cached = (text_height, base_line_height, line_height)
+            self._line_metrics_cache[metrics_key] = cached
+
+        text_height, base_line_height, line_height = cached
+        n_lines = max(1, len(lines))
 
         total_height = (n_lines - 1) * line_height + base_line_height
 
@@ -894,7 +1136,15 @@ class ImageGenerator:
         return start_y
 
     def _draw_text_lines(
-        self, img: Any, lines: List[str], start_y: int, line_height: int, font: Any, font_size: int, is_cover: bool
+        self,
+        img: Any,
+        lines: List[str],
+        start_y: int,
+        line_height: int,
+        font: Any,
+        font_size: int,
+        is_cover: bool,
+        draw: Optional[Any] = None,
     ) -> None:
         """
         在图片上绘制文字行
@@ -907,8 +1157,10 @@ class ImageGenerator:
             font: 字体对象
             font_size: 字体大小
             is_cover: 是否为封面图
+            draw: 已创建的绘图对象（可选，未提供时基于 img 创建）
         """
-        draw = ImageDraw.Draw(img)
+        if draw is None:
+            draw = ImageDraw.Draw(img)
         width, height = img.size
 
         # 设置颜色
@@ -943,14 +1195,10 @@ class ImageGenerator:
             if y < margin_y or y + line_height > height - margin_y:
                 continue
 
-            # 绘制描边
-            for dx in range(-shadow_offset, shadow_offset + 1):
-                for dy in range(-shadow_offset, shadow_offset + 1):
-                    if abs(dx) + abs(dy) <= shadow_offset:
-                        draw.text((x + dx, y + dy), line, font=font, fill=shadow_color)
-
-            # 绘制主文字
-            draw.text((x, y), line, font=font, fill=text_color)
+            # 绘制描边和主文字（PIL 原生描边，一次光栅化完成）
+            draw.text(
+                (x, y), line, font=font, fill=text_color, stroke_width=shadow_offset, stroke_fill=shadow_color
+            )
 
     def _estimate_max_chars(self, max_width: int, max_lines: int, font: Any, draw: Any) -> int:
         """
@@ -968,15 +1216,14 @@ class ImageGenerator:
         # 使用常见中文字符测试平均宽度
         test_chars = "的一是在不了有和人这中大为上个国我以要他时来用们生到作地于出就分对成会可主发年动同工也能下过子说产种面而方后多定行学法所民得经十三之进着等部度家电力里如水化高自二理起小物现实加量都两体制机当使点从业本去把性好应开它合还因由其些然前外天政四日那社义事平形相全表间样与关各重新线内数正心反你明看原又么利比或但质气第向道命此变条只没结解问意建月公无系军很情者最立代想已通并提直题党程展五果料象员革位入常文总次品式活设及管特件长求老头基资边流路级少图山统接知较将组见计别她手角期根论运农指几九区强放决西被干做必战先回则任取据处队南给色光门即保治北造百规热领七海口东导器压志世金增争济阶油思术极交受联什认六共权收证改清己美再采转更单风切打白教速花带安场身车例真务具万每目至达走积示议声报斗完类八离华名确才科张信马节话米整空元况今集温传土许步群广石记需段研界拉林律叫且究观越织装影算低持音众书布复容儿须际商非验连断深难近矿千周委素技备半办青省列习响约支般史感劳便团往酸历市克何除消构府称太准精值号率族维划选标写存候毛亲快效斯院查江型眼王按格养易置派层片始却专状育厂京识适属圆包火住调满县局照参红细引听该铁价严"
 
-        # 计算单个字符平均宽度
-        total_width = 0
-        sample_size = min(50, len(test_chars))
-        for char in test_chars[:sample_size]:
-            bbox = draw.textbbox((0, 0), char, font=font)
-            char_width = bbox[2] - bbox[0]
-            total_width += char_width
-
-        avg_char_width = total_width / sample_size if sample_size > 0 else font.size
+        # 计算单个字符平均宽度（样本字符串固定，结果只取决于字体，按字体缓存）
+        font_key = self._font_cache_key(font)
+        avg_char_width = self._avg_char_width_cache.get(font_key)
+        if avg_char_width is None:
+            # 一次测量整段样本再求平均，代替逐字符调用 textbbox
+            sample_size = min(50, len(test_chars))
+            avg_char_width = draw.textlength(test_chars[:sample_size], font=font) / sample_size
+            self._avg_char_width_cache[font_key] = avg_char_width
 
         # 估算每行字符数
         chars_per_line = int(max_width / avg_char_width)
@@ -1006,6 +1253,29 @@ class ImageGenerator:
         if len(text) <= max_chars:
             return text
 
+        # 相同文案的改写结果可直接复用，无需再次调用API
+        cache_key = None
+        if self._rewrite_cache_enabled:
+            cache_key = self._generate_rewrite_cache_key(text, max_chars)
+            cached_rewrite = self._get_cached_rewrite(cache_key)
+            if cached_rewrite is not None:
+                print(f"  ✨ AI改写缓存命中: {len(text)}字 → {len(cached_rewrite)}字")
+                return cached_rewrite
+
+        return self._request_rewrite(text, max_chars, cache_key)
+
+    def _request_rewrite(self, text: str, max_chars: int, cache_key: Optional[str]) -> str:
+        """
+        调用API改写文案
+
+        Args:
+            text: 原始文案
+            max_chars: 最大字符数
+            cache_key: 改写结果缓存键（未启用缓存时为 None）
+
+        Returns:
+            改写后的文案,如果改写失败则返回原文
+        """
         try:
             # 构建改写提示词
             prompt = """请将以下文案精简改写,要求:
@@ -1020,8 +1290,6 @@ class ImageGenerator:
 改写后的文案:"""
 
             # 调用通义千问API
-            headers = {"Authorization": f"Bearer {self.api_key}", "Content-Type": "application/json"}
-
             data = {
                 "model": self.rewrite_model,
                 "messages": [{"role": "user", "content": prompt}],
@@ -1029,7 +1297,7 @@ class ImageGenerator:
                 "max_tokens": max_chars * 2,  # 留足够的token空间
             }
 
-            response = requests.post(f"{self.llm_base_url}/chat/completions", headers=headers, json=data, timeout=10)
+            response = self._post_with_throttle_retry(f"{self.llm_base_url}/chat/completions", json=data, timeout=10)
 
             if response.status_code == 200:
                 result = response.json()
@@ -1038,6 +1306,8 @@ class ImageGenerator:
                 # 验证改写结果
                 if rewritten and len(rewritten) <= max_chars * 1.1:  # 允许10%误差
                     print(f"  ✨ AI改写成功: {len(text)}字 → {len(rewritten)}字")
+                    if cache_key is not None:
+                        self._save_rewrite_to_cache(cache_key, rewritten)
                     return rewritten
                 else:
                     print("  ⚠️  AI改写结果不符合要求,使用原文")
@@ -1128,12 +1398,14 @@ class ImageGenerator:
                 )
 
                 # 绘制文字
-                self._draw_text_lines(img, lines, start_y, line_height, font, font_size, is_cover)
+                self._draw_text_lines(img, lines, start_y, line_height, font, font_size, is_cover, draw)
 
                 # 保存图片
                 if output_path is None:
                     output_path = image_path
-                ImageResourceManager.save_image_safely(img, output_path, "PNG", quality=95)
+                ImageResourceManager.save_image_safely(
+                    img, output_path, "PNG", compress_level=self.config_manager.get("image_compress_level", 1)
+                )
                 Logger.info("已添加文字叠加", logger_name="image_generator", text_preview=text[:30])
 
         except Exception as e:
@@ -1146,7 +1418,80 @@ class ImageGenerator:
         """根据图片场景描述，智能分段正文内容"""
         return TextProcessor.split_content_by_scenes(content, scenes)
 
+    def _fit_prefix_with_suffix(
+        self, line: str, max_len: int, suffix: str, max_width: int, font: Any, draw: Any
+    ) -> int:
+        """
+        二分查找加上后缀（如省略号）后仍能放入 max_width 的最长前缀长度
+
+        宽度随前缀长度单调增加，结果与逐字缩短逐次测量一致，只需 O(log N) 次 textbbox
+
+        Args:
+            line: 文字行
+            max_len: 前缀最大长度
+            suffix: 后缀
+            max_width: 最大宽度
+            font: 字体对象
+            draw: 绘图对象
+
+        Returns:
+            前缀长度（1 到 max_len），放不下任何字符时返回 0
+        """
+        lo, hi = 0, max_len
+        while lo < hi:
+            mid = (lo + hi + 1) // 2
+            bbox = draw.textbbox((0, 0), line[:mid] + suffix, font=font)
+            if bbox[2] - bbox[0] <= max_width:
+                lo = mid
+            else:
+                hi = mid - 1
+        return lo
+
+    def _cached_text_layout(self, key: Tuple[Any, ...], compute: Callable[[], List[str]]) -> List[str]:
+        """
+        从 LRU 缓存获取排版结果，未命中时计算并写入
+
+        Args:
+            key: 缓存键（操作类型、文字、字体键及宽度/行数参数）
+            compute: 未命中时计算分行结果的函数
+
+        Returns:
+            分行后的文字列表（副本，调用方可自由修改）
+        """
+        with self._text_layout_lock:
+            cached = self._text_layout_cache.get(key)
+            if cached is not None:
+                self._text_layout_cache.move_to_end(key)
+                return list(cached)
+
+        # 排版计算在锁外进行，并发未命中时各自计算，结果相同
+        lines = compute()
+        with self._text_layout_lock:
+            self._text_layout_cache[key] = tuple(lines)
+            if len(self._text_layout_cache) > self.TEXT_LAYOUT_CACHE_SIZE:
+                self._text_layout_cache.popitem(last=False)
+        return lines
+
     def _smart_truncate(self, text: str, max_lines: int, max_width: int, font: Any, draw: Any) -> List[str]:
+        """
+        智能截断文字，确保在最大行数内，并在末尾添加省略号（结果按文字、字体、行数和宽度缓存）
+
+        Args:
+            text: 原始文字
+            max_lines: 最大行数
+            max_width: 最大宽度
+            font: 字体对象
+            draw: 绘图对象
+
+        Returns:
+            截断后的文字行列表
+        """
+        key = ("truncate", text, *self._font_cache_key(font), max_lines, max_width)
+        return self._cached_text_layout(
+            key, lambda: self._compute_truncated_lines(text, max_lines, max_width, font, draw)
+        )
+
+    def _compute_truncated_lines(self, text: str, max_lines: int, max_width: int, font: Any, draw: Any) -> List[str]:
         """
         智能截断文字，确保不超过指定行数，并在合适位置添加省略号
 
@@ -1164,7 +1509,7 @@ class ImageGenerator:
             return []
 
         # 先按宽度换行
-        all_lines = self._wrap_text(text, max_width, font, draw)
+        all_lines = self._wrap_text(text, max_width, font, draw, max_lines)
 
         # 如果行数不超过限制，直接返回
         if len(all_lines) <= max_lines:
@@ -1173,25 +1518,27 @@ class ImageGenerator:
         # 如果超过，只取前max_lines - 1行，最后一行添加省略号
         result_lines = all_lines[: max_lines - 1]
 
-        # 计算省略号宽度
+        # 计算省略号宽度（与单字符宽度共用按字体的缓存）
         ellipsis = "…"
-        ellipsis_bbox = draw.textbbox((0, 0), ellipsis, font=font)
-        ellipsis_width = ellipsis_bbox[2] - ellipsis_bbox[0]
+        ellipsis_width = self._char_width(ellipsis, font, draw)
         available_for_last_line = max_width - ellipsis_width - 5  # 留5像素安全边距
 
         # 从剩余文字中截取能放入最后一行的内容
-        remaining_text = "".join(all_lines[max_lines - 1 :])
+        # 逐字惰性遍历剩余各行，放不下时即停止，无需先把剩余行重新拼成整串
+        remaining_chars = itertools.chain.from_iterable(all_lines[max_lines - 1 :])
         last_line = ""
 
         # 优先在标点符号处截断（更自然），但避免标点符号单独成行
-        punctuation_marks = ["。", "，", "！", "？", "；", "：", "、", "…", ".", ",", "!", "?", ";", ":"]
+        punctuation_marks = TextProcessor.PUNCTUATION
 
-        for char in remaining_text:
+        # 行宽按缓存的单字符宽度累加，不再逐字调用 textbbox
+        last_width = 0.0
+        for char in remaining_chars:
             test_line = last_line + char
-            bbox = draw.textbbox((0, 0), test_line, font=font)
-            test_width = bbox[2] - bbox[0]
+            test_width = last_width + self._char_width(char, font, draw)
             if test_width <= available_for_last_line:
                 last_line = test_line
+                last_width = test_width
                 # 如果遇到标点符号，且已经有足够内容，可以在这里截断（更自然）
                 # 但确保标点符号不会单独成行（即last_line长度>1）
                 if char in punctuation_marks and len(last_line) > 1:
@@ -1216,35 +1563,19 @@ class ImageGenerator:
             if test_width <= max_width:
                 result_lines.append(test_line)
             else:
-                # 如果超出，移除最后一个字符再添加省略号
-                while len(last_line) > 0:
-                    last_line = last_line[:-1]
-                    test_line = last_line + ellipsis
-                    bbox = draw.textbbox((0, 0), test_line, font=font)
-                    test_width = bbox[2] - bbox[0]
-                    if test_width <= max_width:
-                        result_lines.append(test_line)
-                        break
-                else:
-                    # 如果还是放不下，只用省略号
-                    result_lines.append(ellipsis)
+                # 如果超出，二分查找去掉末尾字符后能放下省略号的最长前缀
+                keep = self._fit_prefix_with_suffix(last_line, len(last_line) - 1, ellipsis, max_width, font, draw)
+                # 如果还是放不下，只用省略号
+                result_lines.append(last_line[:keep] + ellipsis if keep else ellipsis)
         else:
             # 如果最后一行放不下任何内容，在前一行的末尾添加省略号
             if result_lines:
                 prev_line = result_lines[-1]
                 if len(prev_line) > 0:
-                    # 尝试移除字符直到能放下省略号
-                    while len(prev_line) > 0:
-                        test_line = prev_line + ellipsis
-                        bbox = draw.textbbox((0, 0), test_line, font=font)
-                        test_width = bbox[2] - bbox[0]
-                        if test_width <= max_width:
-                            result_lines[-1] = test_line
-                            break
-                        prev_line = prev_line[:-1]
-                    else:
-                        # 如果还是放不下，直接用省略号替换
-                        result_lines[-1] = ellipsis
+                    # 二分查找能放下省略号的最长前缀
+                    keep = self._fit_prefix_with_suffix(prev_line, len(prev_line), ellipsis, max_width, font, draw)
+                    # 如果还是放不下，直接用省略号替换
+                    result_lines[-1] = prev_line[:keep] + ellipsis if keep else ellipsis
                 else:
                     result_lines.append(ellipsis)
             else:
@@ -1252,126 +1583,140 @@ class ImageGenerator:
 
         return result_lines
 
-    def _wrap_text(self, text: str, max_width: int, font: Any, draw: Any) -> List[str]:
+    def _fit_line_end(
+        self, text: str, start: int, max_width: int, font: Any, draw: Any, prefix_widths: List[float]
+    ) -> int:
         """
-        将文字按宽度自动换行，智能处理标点符号，避免标点单独成行
+        计算从 start 开始能放入一行的最长片段的结束位置
+
+        先在单字符宽度前缀和上二分查找估算断点，再对整段调用一次 textlength 校验
+        （包含字距调整），只在边界处逐字微调，每行通常只需 1 - 2 次 PIL 测量
 
         Args:
             text: 原始文字
+            start: 起始位置
             max_width: 最大宽度
             font: 字体对象
             draw: 绘图对象
+            prefix_widths: 单字符宽度前缀和，prefix_widths[i] 为前 i 个字符的宽度之和
 
         Returns:
-            分行后的文字列表（已优化，避免标点单独成行）
+            片段结束位置（不含），至少包含一个字符
+        """
+        end = bisect.bisect_right(prefix_widths, prefix_widths[start] + max_width) - 1
+        end = max(end, start + 1)
+
+        # 整段测量校验估算结果，向内收缩或向外扩展到真实边界
+        while end > start + 1 and draw.textlength(text[start:end], font=font) > max_width:
+            end -= 1
+        while end < len(text) and draw.textlength(text[start : end + 1], font=font) <= max_width:
+            end += 1
+        return end
+
+    def _wrap_text(
+        self, text: str, max_width: int, font: Any, draw: Any, max_lines: Optional[int] = None
+    ) -> List[str]:
+        """
+        将文字按宽度自动换行（结果按文字、字体、宽度和行数上限缓存）
+
+        Args:
+            text: 原始文字
+            max_width: 最大宽度
+            font: 字体对象
+            draw: 绘图对象
+            max_lines: 调用方最多使用的行数（可选），超长时提前结束换行
+
+        Returns:
+            分行后的文字列表
         """
         if not text:
             return []
 
-        # 定义标点符号（不应单独成行）
-        punctuation_marks = set(["。", "，", "！", "？", "；", "：", "、", "…", ".", ",", "!", "?", ";", ":", "…"])
-        # 前引号、后引号等特殊标点
-        set(["（", "(", "【", "[", "《", "<", '"', '"', """, """])
-        set(["）", ")", "】", "]", "》", ">", '"', '"', """, """])
+        key = ("wrap", text, *self._font_cache_key(font), max_width, max_lines)
+        return self._cached_text_layout(
+            key, lambda: self._compute_wrapped_lines(text, max_width, font, draw, max_lines)
+        )
 
-        lines = []
-        current_line = ""
-        i = 0
+    def _compute_wrapped_lines(
+        self, text: str, max_width: int, font: Any, draw: Any, max_lines: Optional[int] = None
+    ) -> List[str]:
+        """
+        将文字按宽度自动换行，智能处理标点符号，避免标点单独成行
 
-        while i < len(text):
-            char = text[i]
+        指定 max_lines 时，已得到多于 max_lines 行、且从第 max_lines 行起的内容超过一行宽度后
+        即停止换行：前 max_lines - 1 行已确定，溢出部分足够截断时填满最后一行，
+        返回的行数仍多于 max_lines，调用方可据此判断文字超长
 
-            # 测试添加当前字符后的宽度
-            test_line = current_line + char
-            bbox = draw.textbbox((0, 0), test_line, font=font)
-            test_width = bbox[2] - bbox[0]
+        Args:
+            text: 原始文字
+            max_width: 最大宽度
+            font: 字体对象
+            draw: 绘图对象
+            max_lines: 调用方最多使用的行数（可选）
 
-            if test_width <= max_width:
-                # 可以添加，继续
-                current_line = test_line
-                i += 1
-            else:
-                # 当前行已满，需要换行
-                if current_line:
-                    # 检查当前行末尾是否是标点符号
-                    # 如果是标点，应该保留在当前行，不换行
-                    if current_line[-1] in punctuation_marks:
-                        # 标点已经在行尾，保留在当前行
-                        lines.append(current_line)
-                        current_line = ""
-                    else:
-                        # 尝试向后查找，看下一个字符是否是标点
-                        if i < len(text) and text[i] in punctuation_marks:
-                            # 下一个字符是标点，应该保留在当前行
-                            # 尝试缩小字体或截断，但这里先尝试将标点加入当前行
-                            # 如果标点加入后仍然超出，则保留当前行，标点放到下一行
-                            test_with_punct = current_line + text[i]
-                            bbox_punct = draw.textbbox((0, 0), test_with_punct, font=font)
-                            if bbox_punct[2] - bbox_punct[0] <= max_width:
-                                # 标点可以加入当前行
-                                current_line = test_with_punct
-                                i += 1
-                                lines.append(current_line)
-                                current_line = ""
-                            else:
-                                # 标点加入后超出，保留当前行，标点放到下一行（但我们会后续优化）
-                                lines.append(current_line)
-                                current_line = text[i]
-                                i += 1
-                        else:
-                            # 下一个字符不是标点，正常换行
-                            lines.append(current_line)
-                            current_line = char
-                            i += 1
-                else:
-                    # 当前行为空，但单个字符就超出（不应该发生，但处理一下）
-                    # 强制添加，因为单个字符必须显示
-                    current_line = char
-                    i += 1
+        Returns:
+            分行后的文字列表（已优化，避免标点单独成行）
+        """
+        if not text:
+            return []
 
-        # 添加最后一行
-        if current_line:
-            lines.append(current_line)
+        # 标点符号（不应单独成行）
+        punctuation_marks = TextProcessor.PUNCTUATION
 
+        # 逐行取能放下的最长片段（至少一个字符），标点问题在后处理中合并
+        # 单字符宽度前缀和只计算一次，断点估算变为二分查找，无需逐字累加
+        prefix_widths = list(itertools.accumulate((self._char_width(c, font, draw) for c in text), initial=0.0))
         # 后处理：优化标点符号位置，避免标点单独成行
+        # 每个片段只会合并到上一行末尾或追加新行，因此与换行在同一趟循环中完成
+        # 各行宽度由前缀和得到并随合并累加，判断能否合并时无需拼接字符串再测量
         optimized_lines = []
-        for idx, line in enumerate(lines):
-            line = line.strip()
+        line_widths = []
+        i = 0
+        while i < len(text):
+            line_end = self._fit_line_end(text, i, max_width, font, draw, prefix_widths)
+            segment = text[i:line_end]
+            line = segment.strip()
             if not line:
+                i = line_end
                 continue
+            line_start = i + len(segment) - len(segment.lstrip())
+            line_width = prefix_widths[line_start + len(line)] - prefix_widths[line_start]
+            i = line_end
 
             # 如果当前行只有一个标点符号，尝试合并到上一行
             if len(line) == 1 and line in punctuation_marks:
                 if optimized_lines:
                     # 合并到上一行
-                    optimized_lines[-1] = optimized_lines[-1] + line
+                    optimized_lines[-1] += line
+                    line_widths[-1] += line_width
                 else:
                     # 没有上一行，保留（但这种情况应该很少）
                     optimized_lines.append(line)
-            # 如果当前行以标点开头，且上一行存在，尝试合并
-            elif line and line[0] in punctuation_marks and optimized_lines:
-                # 检查合并后是否超出宽度
-                merged = optimized_lines[-1] + line
-                bbox_merged = draw.textbbox((0, 0), merged, font=font)
-                if bbox_merged[2] - bbox_merged[0] <= max_width:
-                    optimized_lines[-1] = merged
-                else:
-                    optimized_lines.append(line)
+                    line_widths.append(line_width)
+            # 如果当前行以标点开头，且上一行存在，合并后不超出宽度时合并
+            elif line[0] in punctuation_marks and optimized_lines and line_widths[-1] + line_width <= max_width:
+                optimized_lines[-1] += line
+                line_widths[-1] += line_width
             else:
                 optimized_lines.append(line)
+                line_widths.append(line_width)
+
+            # 只需要前 max_lines 行时提前结束：之后的片段只会追加到末尾，不影响已确定的行
+            if max_lines is not None and len(optimized_lines) > max_lines:
+                if sum(line_widths[max_lines - 1 :]) > max_width:
+                    break
 
         # 如果只有一行且仍然超出，强制按字符数分割（每行最多10个字符）
         if len(optimized_lines) == 1 and len(text) > 10:
             # 智能分割：尽量在语义断点分割
             optimized_lines = []
             # 尝试在"的"、"之"、"前"、"后"等字后分割
-            split_points = ["的", "之", "前", "后", "上", "下", "里", "中", "为", "是", "，", "。", "！", "？"]
             current_line = ""
 
             for i, char in enumerate(text):
                 current_line += char
                 # 如果当前行达到一定长度，且在分割点，则换行
-                if len(current_line) >= 8 and char in split_points:
+                if len(current_line) >= 8 and char in _FALLBACK_SPLIT_CHARS:
                     optimized_lines.append(current_line)
                     current_line = ""
                 # 如果当前行超过10个字符，强制换行
@@ -1384,6 +1729,175 @@ class ImageGenerator:
 
         return optimized_lines if optimized_lines else [text]
 
+    def _overlay_image_text(self, save_path: str, prompt_data: Dict, content_segments: List[str]) -> None:
+        """
+        为已下载的图片添加文字叠加
+
+        Args:
+            save_path: 图片路径
+            prompt_data: 提示词数据
+            content_segments: 正文内容分段
+        """
+        if prompt_data.get("is_cover", False):
+            # 封面图：叠加标题
+            title = prompt_data.get("title", "")
+            if title:
+                print(f"  📝 正在添加文字叠加: {title}")
+                self.add_text_overlay(save_path, title, is_cover=True, position="top")
+        else:
+            # 故事图：叠加正文内容分段
+            idx = prompt_data.get("index", 0)
+            if content_segments and idx > 0 and idx <= len(content_segments):
+                content_segment = content_segments[idx - 1]
+                if content_segment:
+                    print(f"  📝 正在添加文字叠加: {content_segment[:30]}...")
+                    self.add_text_overlay(save_path, content_segment, is_cover=False, position="bottom")
+            else:
+                # 如果没有正文分段，使用场景描述作为后备
+                scene = prompt_data.get("scene", "")
+                if scene:
+                    print(f"  📝 正在添加文字叠加（场景描述）: {scene[:30]}...")
+                    self.add_text_overlay(save_path, scene, is_cover=False, position="bottom")
+
+    def _download_and_overlay(
+        self,
+        image_url: str,
+        save_path: str,
+        prompt_data: Dict,
+        content_segments: List[str],
+        overlay_executor: ThreadPoolExecutor,
+    ) -> Future:
+        """
+        下载图片，完成后提交文字叠加任务
+
+        Args:
+            image_url: 图片URL
+            save_path: 保存路径
+            prompt_data: 提示词数据
+            content_segments: 正文内容分段
+            overlay_executor: 文字叠加线程池
+
+        Returns:
+            文字叠加任务的 Future
+        """
+        self.download_image(image_url, save_path)
+        return overlay_executor.submit(self._overlay_image_text, save_path, prompt_data, content_segments)
+
+    def _generate_one_image(
+        self,
+        prompt_data: Dict,
+        content_segments: List[str],
+        prompts_dir: str,
+        download_executor: ThreadPoolExecutor,
+        overlay_executor: ThreadPoolExecutor,
+    ) -> Optional[Future]:
+        """
+        生成单张图片（内容审核未通过时修改提示词重试），并提交下载和文字叠加任务
+
+        Args:
+            prompt_data: 提示词数据
+            content_segments: 正文内容分段
+            prompts_dir: 输出目录
+            download_executor: 下载线程池
+            overlay_executor: 文字叠加线程池
+
+        Returns:
+            下载任务的 Future，生成失败返回 None
+        """
+        max_retries = 3  # 最多重试3次
+        retry_count = 0
+        original_prompt = prompt_data["prompt"]  # 保存原始提示词
+
+        while retry_count <= max_retries:
+            try:
+                is_cover = prompt_data.get("is_cover", False)
+                if is_cover:
+                    print(f"\n{'=' * 50}")
+                    print(f"封面: {prompt_data.get('title', '')}")
+                    print(f"{'=' * 50}")
+                    lbl = "封面"
+                else:
+                    print(f"\n{'=' * 50}")
+                    print(f"图{prompt_data['index']}: {prompt_data['scene'][:60]}...")
+                    print(f"{'=' * 50}")
+                    lbl = prompt_data["index"]
+
+                # 如果是重试，进一步修改提示词
+                current_prompt = prompt_data["prompt"]
+                if retry_count > 0:
+                    print(f"  🔄 第 {retry_count} 次重试，正在进一步修改提示词...")
+                    # 移除敏感词及更多可能敏感的关键词（预检查已处理过敏感词表，这里一次替换，不再重复检查）
+                    current_prompt = _RETRY_SENSITIVE_WORD_PATTERN.sub("", current_prompt)
+                    # 简化描述
+                    current_prompt = TextProcessor.WHITESPACE_PATTERN.sub(" ", current_prompt).strip()
+                    prompt_data["prompt"] = current_prompt
+                    print("  ✅ 提示词已修改")
+
+                image_url = self.generate_image_async(current_prompt, lbl, is_cover=is_cover)
+
+                if is_cover:
+                    image_filename = "cover.png"
+                else:
+                    image_filename = f"image_{prompt_data['index']:02d}.png"
+                save_path = os.path.join(prompts_dir, image_filename)
+
+                # 下载和文字叠加交给后台线程，当前线程可以继续生成其他图片
+                return download_executor.submit(
+                    self._download_and_overlay,
+                    image_url,
+                    save_path,
+                    prompt_data,
+                    content_segments,
+                    overlay_executor,
+                )
+
+            except ValueError as e:
+                # 内容审核未通过的错误
+                who = "封面" if prompt_data.get("is_cover") else f"图{prompt_data['index']}"
+                if retry_count < max_retries:
+                    retry_count += 1
+                    print(f"\n⚠️  生成{who}失败（内容审核未通过）: {e}")
+                    print("  🔄 将尝试修改提示词后重试...")
+                else:
+                    print(f"\n❌ 生成{who}失败（已重试{max_retries}次）: {e}")
+                    # 保存可疑内容到文件
+                    self.save_suspicious_content(
+                        prompts_dir,
+                        original_prompt,
+                        f"{who}提示词",
+                        f"内容审核未通过，已尝试{max_retries}次自动修改仍失败",
+                    )
+                    print(f"  📝 可疑内容已保存到: {os.path.basename(self.suspicious_content_file)}")
+                    print("  💡 请查看可疑内容文件，手动修改后重新运行脚本")
+                    break
+
+            except Exception as e:
+                who = "封面" if prompt_data.get("is_cover") else f"图{prompt_data['index']}"
+                error_msg = str(e)
+                # 检查是否是内容不当的错误
+                if "DataInspectionFailed" in error_msg or "inappropriate content" in error_msg.lower():
+                    if retry_count < max_retries:
+                        retry_count += 1
+                        print(f"\n⚠️  生成{who}失败（内容审核未通过）: {e}")
+                        print("  🔄 将尝试修改提示词后重试...")
+                    else:
+                        print(f"\n❌ 生成{who}失败（已重试{max_retries}次）: {e}")
+                        # 保存可疑内容到文件
+                        self.save_suspicious_content(
+                            prompts_dir,
+                            original_prompt,
+                            f"{who}提示词",
+                            f"内容审核未通过，已尝试{max_retries}次自动修改仍失败",
+                        )
+                        print(f"  📝 可疑内容已保存到: {os.path.basename(self.suspicious_content_file)}")
+                        print("  💡 请查看可疑内容文件，手动修改后重新运行脚本")
+                        break
+                else:
+                    print(f"\n❌ 生成{who}失败: {e}")
+                    break
+
+        return None
+
     def generate_all_images(self, prompts_file: str) -> None:
         """
         生成所有图片
@@ -1429,9 +1943,9 @@ class ImageGenerator:
                 target_name = '封面' if is_cover else f'图{prompt_data.get("index", 0)}'
                 print(f"  ⚠️  检测到可疑内容（{target_name}），已自动修改")
                 prompt_data["prompt"] = modified_prompt
-                # 如果修改后仍然可疑，记录
-                is_safe_after, _ = self.check_content_safety(modified_prompt, "提示词")
-                if not is_safe_after:
+                # 如果修改后仍然可疑（移除敏感词后拼接出新的敏感词），记录
+                # 只需判断是否命中，不必再次替换和清理空白
+                if TextProcessor.SENSITIVE_KEYWORD_PATTERN.search(modified_prompt):
                     self.save_suspicious_content(
                         prompts_dir,
                         prompt,
@@ -1448,8 +1962,7 @@ class ImageGenerator:
                 if not is_safe:
                     print(f"  ⚠️  检测到可疑正文内容（图{idx}），已自动修改")
                     content_segments[idx - 1] = modified_segment
-                    is_safe_after, _ = self.check_content_safety(modified_segment, "正文内容")
-                    if not is_safe_after:
+                    if TextProcessor.SENSITIVE_KEYWORD_PATTERN.search(modified_segment):
                         self.save_suspicious_content(
                             prompts_dir, segment, f"图{idx}正文内容", "包含敏感词汇，自动修改后仍可能有问题"
                         )
@@ -1460,123 +1973,36 @@ class ImageGenerator:
         # 生成每张图片
         print(f"\n🎨 开始生成图片（模型: {self.image_model}）\n")
 
-        for prompt_data in prompts:
-            max_retries = 3  # 最多重试3次
-            retry_count = 0
-            success = False
-            original_prompt = prompt_data["prompt"]  # 保存原始提示词
+        # 图片生成与下载为网络 IO，多线程并发（并发数沿用 rate_limit.image.max_concurrent，
+        # 总请求速率仍由 RPM 令牌桶限制）；文字叠加共享字体对象，使用单线程串行执行
+        max_workers = max(1, int(self.config_manager.get("rate_limit.image.max_concurrent", 3)))
+        with ThreadPoolExecutor(max_workers=1) as overlay_executor, ThreadPoolExecutor(
+            max_workers=self.DOWNLOAD_WORKERS
+        ) as download_executor, ThreadPoolExecutor(max_workers=max_workers) as generate_executor:
+            pending = [
+                (
+                    prompt_data,
+                    generate_executor.submit(
+                        self._generate_one_image,
+                        prompt_data,
+                        content_segments,
+                        prompts_dir,
+                        download_executor,
+                        overlay_executor,
+                    ),
+                )
+                for prompt_data in prompts
+            ]
 
-            while retry_count <= max_retries and not success:
+            # 按原顺序等待所有生成、下载和文字叠加完成
+            for prompt_data, future in pending:
                 try:
-                    is_cover = prompt_data.get("is_cover", False)
-                    if is_cover:
-                        print(f"\n{'=' * 50}")
-                        print(f"封面: {prompt_data.get('title', '')}")
-                        print(f"{'=' * 50}")
-                        lbl = "封面"
-                    else:
-                        print(f"\n{'=' * 50}")
-                        print(f"图{prompt_data['index']}: {prompt_data['scene'][:60]}...")
-                        print(f"{'=' * 50}")
-                        lbl = prompt_data["index"]
-
-                    # 如果是重试，进一步修改提示词
-                    current_prompt = prompt_data["prompt"]
-                    if retry_count > 0:
-                        print(f"  🔄 第 {retry_count} 次重试，正在进一步修改提示词...")
-                        # 再次检查并修改
-                        is_safe, modified_prompt = self.check_content_safety(current_prompt, "提示词")
-                        if not is_safe:
-                            current_prompt = modified_prompt
-                        # 移除更多可能敏感的关键词
-                        sensitive_words = ["血腥", "暴力", "色情", "政治", "敏感", "争议", "战争", "武器"]
-                        for word in sensitive_words:
-                            current_prompt = current_prompt.replace(word, "")
-                        # 简化描述
-                        current_prompt = re.sub(r"\s+", " ", current_prompt).strip()
-                        prompt_data["prompt"] = current_prompt
-                        print("  ✅ 提示词已修改")
-
-                    image_url = self.generate_image_async(current_prompt, lbl, is_cover=is_cover)
-
-                    if is_cover:
-                        image_filename = "cover.png"
-                    else:
-                        image_filename = f"image_{prompt_data['index']:02d}.png"
-                    save_path = os.path.join(prompts_dir, image_filename)
-                    self.download_image(image_url, save_path)
-
-                    # 添加文字叠加
-                    if is_cover:
-                        # 封面图：叠加标题
-                        title = prompt_data.get("title", "")
-                        if title:
-                            print(f"  📝 正在添加文字叠加: {title}")
-                            self.add_text_overlay(save_path, title, is_cover=True, position="top")
-                    else:
-                        # 故事图：叠加正文内容分段
-                        idx = prompt_data.get("index", 0)
-                        if content_segments and idx > 0 and idx <= len(content_segments):
-                            content_segment = content_segments[idx - 1]
-                            if content_segment:
-                                print(f"  📝 正在添加文字叠加: {content_segment[:30]}...")
-                                self.add_text_overlay(save_path, content_segment, is_cover=False, position="bottom")
-                        else:
-                            # 如果没有正文分段，使用场景描述作为后备
-                            scene = prompt_data.get("scene", "")
-                            if scene:
-                                print(f"  📝 正在添加文字叠加（场景描述）: {scene[:30]}...")
-                                self.add_text_overlay(save_path, scene, is_cover=False, position="bottom")
-
-                    success = True
-
-                except ValueError as e:
-                    # 内容审核未通过的错误
-                    who = "封面" if prompt_data.get("is_cover") else f"图{prompt_data['index']}"
-                    if retry_count < max_retries:
-                        retry_count += 1
-                        print(f"\n⚠️  生成{who}失败（内容审核未通过）: {e}")
-                        print("  🔄 将尝试修改提示词后重试...")
-                    else:
-                        print(f"\n❌ 生成{who}失败（已重试{max_retries}次）: {e}")
-                        # 保存可疑内容到文件
-                        self.save_suspicious_content(
-                            prompts_dir,
-                            original_prompt,
-                            f"{who}提示词",
-                            f"内容审核未通过，已尝试{max_retries}次自动修改仍失败",
-                        )
-                        print(f"  📝 可疑内容已保存到: {os.path.basename(self.suspicious_content_file)}")
-                        print("  💡 请查看可疑内容文件，手动修改后重新运行脚本")
-                        success = False
-                        break
-
+                    download_future = future.result()
+                    if download_future is not None:
+                        download_future.result().result()
                 except Exception as e:
                     who = "封面" if prompt_data.get("is_cover") else f"图{prompt_data['index']}"
-                    error_msg = str(e)
-                    # 检查是否是内容不当的错误
-                    if "DataInspectionFailed" in error_msg or "inappropriate content" in error_msg.lower():
-                        if retry_count < max_retries:
-                            retry_count += 1
-                            print(f"\n⚠️  生成{who}失败（内容审核未通过）: {e}")
-                            print("  🔄 将尝试修改提示词后重试...")
-                        else:
-                            print(f"\n❌ 生成{who}失败（已重试{max_retries}次）: {e}")
-                            # 保存可疑内容到文件
-                            self.save_suspicious_content(
-                                prompts_dir,
-                                original_prompt,
-                                f"{who}提示词",
-                                f"内容审核未通过，已尝试{max_retries}次自动修改仍失败",
-                            )
-                            print(f"  📝 可疑内容已保存到: {os.path.basename(self.suspicious_content_file)}")
-                            print("  💡 请查看可疑内容文件，手动修改后重新运行脚本")
-                            success = False
-                            break
-                    else:
-                        print(f"\n❌ 生成{who}失败: {e}")
-                        success = False
-                        break
+                    print(f"\n❌ 生成{who}失败: {e}")
 
         print(f"\n{'=' * 60}")
         print("✅ 所有任务完成！")
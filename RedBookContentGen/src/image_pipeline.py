@@ -10,6 +10,7 @@
 from abc import ABC, abstractmethod
 from typing import Optional, Dict, Any
 from src.core.logger import Logger
+from src.text_processor import TextProcessor
 
 
 class ImageGenerationContext:
@@ -125,12 +126,7 @@ class PromptCleanHandler(ImageGenerationHandler):
 
     def _process(self, context: ImageGenerationContext) -> ImageGenerationContext:
         """清理提示词"""
-        import re
-
-        clean_prompt = re.sub(r"--ar\s*\d+:\d+", "", context.prompt)
-        clean_prompt = re.sub(r"--v\s*\d+(\.\d+)?", "", clean_prompt)
-        clean_prompt = re.sub(r"--style\s+\w+", "", clean_prompt)
-        context.clean_prompt = clean_prompt.strip()
+        context.clean_prompt = TextProcessor.PROMPT_PARAM_PATTERN.sub("", context.prompt).strip()
 
         return context
 
@@ -138,12 +134,15 @@ class PromptCleanHandler(ImageGenerationHandler):
 class ImageGenerationAPIHandler(ImageGenerationHandler):
     """图片生成API调用处理器"""
 
-    def __init__(self, api_key: str, image_model: str, image_generation_url: str, wait_for_completion_func):
+    def __init__(
+        self, api_key: str, image_model: str, image_generation_url: str, wait_for_completion_func, session=None
+    ):
         super().__init__()
         self.api_key = api_key
         self.image_model = image_model
         self.image_generation_url = image_generation_url
         self.wait_for_completion = wait_for_completion_func
+        self.session = session
 
     def _process(self, context: ImageGenerationContext) -> ImageGenerationContext:
         """调用API生成图片"""
@@ -167,7 +166,8 @@ class ImageGenerationAPIHandler(ImageGenerationHandler):
 
             print("  📤 正在生成图片...")
 
-            response = requests.post(self.image_generation_url, headers=headers, json=data, timeout=30)
+            http = self.session if self.session is not None else requests
+            response = http.post(self.image_generation_url, headers=headers, json=data, timeout=30)
 
             if response.status_code != 200:
                 print(f"  ❌ 创建任务失败: {response.status_code}")
@@ -243,6 +243,7 @@ class ImageGenerationPipeline:
             self.generator.image_model,
             self.generator.image_generation_url,
             self.generator._wait_for_task_completion,
+            session=self.generator.session,
         )
 
         cache_save = CacheSaveHandler(
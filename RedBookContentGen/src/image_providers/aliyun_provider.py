@@ -7,12 +7,12 @@
 实现阿里云通义万相的图片生成功能，支持文本生成图片。
 """
 
-import re
 import time
 import requests
 from typing import Optional
 from .base import BaseImageProvider
 from src.core.logger import Logger
+from src.text_processor import TextProcessor
 
 
 class AliyunImageProvider(BaseImageProvider):
@@ -151,10 +151,7 @@ class AliyunImageProvider(BaseImageProvider):
         }
 
         # 清理提示词，移除 --ar --v 等参数（通义万相不需要）
-        clean_prompt = re.sub(r"--ar\s*\d+:\d+", "", prompt)
-        clean_prompt = re.sub(r"--v\s*\d+(\.\d+)?", "", clean_prompt)
-        clean_prompt = re.sub(r"--style\s+\w+", "", clean_prompt)
-        clean_prompt = clean_prompt.strip()
+        clean_prompt = TextProcessor.PROMPT_PARAM_PATTERN.sub("", prompt).strip()
 
         # 构建请求数据
         data = {
@@ -220,8 +217,9 @@ class AliyunImageProvider(BaseImageProvider):
         headers = {"Authorization": f"Bearer {self.api_key}"}
 
         start_time = time.time()
-        # 优化: 缩短轮询间隔,从3秒降到2秒,加快获取结果
-        poll_interval = 2
+        # 轮询间隔指数退避：从0.5秒开始，每次乘1.5，最长4秒
+        # 快速完成的任务能尽早拿到结果，耗时较长的任务也不会过于频繁地轮询
+        poll_interval = 0.5
 
         while time.time() - start_time < max_wait:
             response = requests.get(status_url, headers=headers)
@@ -256,6 +254,7 @@ class AliyunImageProvider(BaseImageProvider):
                     logger_name="aliyun_provider"
                 )
                 time.sleep(poll_interval)
+                poll_interval = min(poll_interval * 1.5, 4.0)
 
             else:
                 Logger.warning(
@@ -263,6 +262,7 @@ class AliyunImageProvider(BaseImageProvider):
                     logger_name="aliyun_provider"
                 )
                 time.sleep(poll_interval)
+                poll_interval = min(poll_interval * 1.5, 4.0)
 
         raise Exception(f"任务超时（{max_wait}秒）")
 
@@ -8,6 +8,7 @@
 """
 
 import os
+import shutil
 import requests
 from contextlib import contextmanager
 
@@ -18,6 +19,12 @@ try:
 except ImportError:
     HAS_PIL = False
 
+# 流式下载的块大小和文件写缓冲区大小（1 MiB）
+DOWNLOAD_BUFFER_SIZE = 1 << 20
+
+# 下载图片共用的 HTTP 会话，复用到图片 CDN 的 TCP/TLS 连接
+_download_session = requests.Session()
+
 
 class ImageResourceManager:
     """图片资源管理器，使用上下文管理器确保资源正确释放"""
@@ -50,14 +57,16 @@ class ImageResourceManager:
 
     @staticmethod
     @contextmanager
-    def download_image(image_url: str, save_path: str, chunk_size: int = 8192):
+    def download_image(image_url: str, save_path: str, chunk_size: int = DOWNLOAD_BUFFER_SIZE):
         """
         下载图片的上下文管理器
 
+        响应体直接从底层连接流式写入磁盘，不在内存中缓存整张图片
+
         Args:
             image_url: 图片URL
             save_path: 保存路径
-            chunk_size: 下载块大小
+            chunk_size: 下载块大小（同时作为文件写缓冲区大小）
 
         Yields:
             保存路径
@@ -68,28 +77,22 @@ class ImageResourceManager:
             os.makedirs(save_dir, exist_ok=True)
 
         response = None
-        file_handle = None
         temp_path = save_path + ".tmp"
 
         try:
             headers = {"User-Agent": "Mozilla/5.0"}
-            response = requests.get(image_url, headers=headers, stream=True, timeout=30)
+            response = _download_session.get(image_url, headers=headers, stream=True, timeout=30)
 
             if response.status_code != 200:
                 raise Exception(f"下载图片失败: HTTP {response.status_code}")
 
-            file_handle = open(temp_path, "wb")
-            for chunk in response.iter_content(chunk_size=chunk_size):
-                if chunk:
-                    file_handle.write(chunk)
+            # 由 urllib3 处理 gzip 等传输编码，再整块拷贝到文件
+            response.raw.decode_content = True
+            with open(temp_path, "wb", buffering=chunk_size) as file_handle:
+                shutil.copyfileobj(response.raw, file_handle, length=chunk_size)
 
-            file_handle.close()
-            file_handle = None
-
-            # 下载成功，重命名临时文件
-            if os.path.exists(save_path):
-                os.remove(save_path)
-            os.rename(temp_path, save_path)
+            # 下载成功，替换为正式文件
+            os.replace(temp_path, save_path)
 
             yield save_path
 
@@ -102,11 +105,6 @@ class ImageResourceManager:
                     pass
             raise e
         finally:
-            if file_handle is not None:
-                try:
-                    file_handle.close()
-                except Exception:
-                    pass
             if response is not None:
                 try:
                     response.close()
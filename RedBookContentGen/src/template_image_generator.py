@@ -9,7 +9,8 @@
 import os
 import re
 import json
-from typing import List, Dict, Optional, Tuple
+import itertools
+from typing import Any, List, Dict, Optional, Tuple
 from PIL import Image, ImageDraw, ImageFont
 from src.core.logger import Logger
 
@@ -25,6 +26,46 @@ except ImportError:
     )
 
 
+# 文字清理时需要删除的字符：emoji（杂项符号、表情、交通图标等）、箭头、书名号类括号
+_DISPLAY_DELETE_TABLE = dict.fromkeys(
+    itertools.chain(
+        range(0x1F300, 0x1FA00),
+        range(0x2600, 0x27C0),
+        map(ord, "⭐\uFE0F→←↑↓⇒⇐⇑⇓↗↘↙↖【】《》〈〉「」『』"),
+    )
+)
+
+# 文字清理时保留的字符之外的内容
+_DISPLAY_DISALLOWED_PATTERN = re.compile(r'[^\w\s\u4e00-\u9fff。，！？：；、""' "（）——…\n]")
+_HORIZONTAL_SPACE_PATTERN = re.compile(r"[ \t]+")
+
+# 残留字母 n（[^\S\n] 为不跨行的空白）：整行只有 n、行首 n、中文/标点与中文之间的 n、行尾 n
+_STRAY_N_PATTERN = re.compile(
+    r"^[^\S\n]*(?:n[^\S\n]*)*$"
+    r"|^n[^\S\n]*"
+    r"|([\u4e00-\u9fff]|[，。！？：；、])[^\S\n]*n[^\S\n]*(?=[\u4e00-\u9fff])"
+    r"|[^\S\n]*n$",
+    re.MULTILINE,
+)
+_BLANK_LINE_PATTERN = re.compile(r"^[^\S\n]*\n|\n[^\S\n]*\Z", re.MULTILINE)
+
+# 空行与分句：连续3个及以上换行、行首/行尾空格、句末标点（可含换行，保留分隔符）
+_EXTRA_BLANK_LINES_PATTERN = re.compile(r"\n{3,}")
+_SPACES_BEFORE_NEWLINE_PATTERN = re.compile(r" +\n")
+_SPACES_AFTER_NEWLINE_PATTERN = re.compile(r"\n +")
+_SENTENCE_OR_LINE_SPLIT_PATTERN = re.compile(r"([。！？\n])")
+_SENTENCE_SPLIT_PATTERN = re.compile(r"([。！？])")
+
+# 换行时不应单独成行的标点
+_WRAP_PUNCTUATION = frozenset(["。", "，", "！", "？", "；", "：", "、"])
+
+# 需要清理的迹象：待删除符号、制表符/换行、连续空格、可能残留的字母 n
+_DISPLAY_DIRTY_PATTERN = re.compile(
+    r"[\U0001F300-\U0001F9FF\u2600-\u27BF\u2B50\uFE0F\u2190-\u21FF【】《》〈〉「」『』\t\n]"
+    r"| {2}|^\s*n|n\s*$|[\u4e00-\u9fff，。！？：；、]\s*n"
+)
+
+
 class TemplateImageGenerator:
     """模板图片生成器 - 纯编程生成，无需API Key"""
 
@@ -47,6 +88,8 @@ class TemplateImageGenerator:
         self.config = self._load_config(config_path)
 
         self.output_image_dir = self.config.get("output_image_dir", "output/images")
+        # PNG 的 zlib 压缩级别（0-9），级别越低编码越快、文件略大
+        self.compress_level = int(self.config.get("image_compress_level", 1))
         self.image_width = 1024
         self.image_height = 1365
         self.aspect_ratio = 3 / 4
@@ -63,6 +106,8 @@ class TemplateImageGenerator:
             "/usr/share/fonts/truetype/wqy/wqy-microhei.ttc",
             "/usr/share/fonts/truetype/arphic/uming.ttc",
         ]
+        # 字体对象缓存（按字号和是否粗体），避免每张图都重新解析字体文件
+        self._font_cache: Dict[Tuple[int, bool], Any] = {}
 
         self._load_common_chars()
 
@@ -72,11 +117,14 @@ class TemplateImageGenerator:
             "output_image_dir": "output/images",
             "template_style": "retro_chinese",
             "enable_ai_rewrite": False,
+            "image_compress_level": 1,
         }
 
         if os.path.exists(config_path):
             with open(config_path, "r", encoding="utf - 8") as f:
                 user_config = json.load(f)
+            # 配置文件为空对象时无需合并
+            if user_config:
                 default_config.update(user_config)
 
         return default_config
@@ -228,7 +276,7 @@ class TemplateImageGenerator:
             y = content_y + i * int(self.image_height * 0.07)
             draw.text((50, y), line, fill=colors["text_secondary"], font=font_content)
 
-        img.save(output_path, "PNG", quality=95)
+        img.save(output_path, "PNG", compress_level=self.compress_level)
         Logger.info("图片已保存", logger_name="template_image_generator", file_path=output_path)
         return output_path
 
@@ -241,7 +289,16 @@ class TemplateImageGenerator:
         return (r, g, b, alpha)
 
     def _load_font(self, size: int, bold: bool = False):
-        """加载指定大小的字体"""
+        """加载指定大小的字体（同一字号只解析一次字体文件）"""
+        key = (size, bold)
+        font = self._font_cache.get(key)
+        if font is None:
+            font = self._create_font(size, bold)
+            self._font_cache[key] = font
+        return font
+
+    def _create_font(self, size: int, bold: bool = False):
+        """创建指定大小的字体对象"""
         for font_path in self.font_paths:
             if os.path.exists(font_path):
                 try:
@@ -279,34 +336,23 @@ class TemplateImageGenerator:
         if not text:
             return ""
 
-        text = re.sub(r"[\U0001F300-\U0001F9FF]", "", text)
-        text = re.sub(r"[\U0001F600-\U0001F64F]", "", text)
-        text = re.sub(r"[\U0001F680-\U0001F6FF]", "", text)
-        text = re.sub(r"[\U00002600-\U000026FF]", "", text)
-        text = re.sub(r"[\U00002700-\U000027BF]", "", text)
-        text = re.sub(r"[👇👆🔔🌿👴💡⭐🌟✨🔥💯📝📖📕📝🎨🏷️]", "", text)
-        text = re.sub(r"[→←↑↓⇒⇐⇑⇓↗↘↙↖]", "", text)
-        text = re.sub(r"[【】《》〈〉「」『』]", "", text)
-        text = re.sub(r'[^\w\s\u4e00-\u9fff。，！？：；、""' "（）——…\n]", "", text)
-        text = re.sub(r"[ \t]+", " ", text)
+        # 已经是干净的单行文字（如场景标题）时，跳过整套清理
+        if not _DISPLAY_DIRTY_PATTERN.search(text) and not _DISPLAY_DISALLOWED_PATTERN.search(text):
+            return text.strip()
+
+        # emoji、箭头、书名号等一次 translate 删除，代替逐类 re.sub
+        text = text.translate(_DISPLAY_DELETE_TABLE)
+        text = _DISPLAY_DISALLOWED_PATTERN.sub("", text)
+        text = _HORIZONTAL_SPACE_PATTERN.sub(" ", text)
         text = text.replace("\\\\n", "\n").replace("\\n", "\n")
 
-        lines = text.split("\n")
-        cleaned = []
-        for line in lines:
-            stripped = line.strip()
-            if re.fullmatch(r"[n\s]+", stripped):
-                continue
-            line = re.sub(r"^n\s*", "", line)
-            line = re.sub(r"([\u4e00-\u9fff]|[，。！？：；、])\s*n\s*(?=[\u4e00-\u9fff])", r"\1", line)
-            line = re.sub(r"\s*n$", "", line)
-            if line.strip():
-                cleaned.append(line)
-
-        text = "\n".join(cleaned)
-        text = re.sub(r"\n{3,}", "\n\n", text)
-        text = re.sub(r" +\n", "\n", text)
-        text = re.sub(r"\n +", "\n", text)
+        # 清理残留的换行符字母 n：整行只有 n、行首 n、中文之间的 n、行尾 n，
+        # 合并为一个多行正则对全文一次替换，再删除空行
+        text = _STRAY_N_PATTERN.sub(lambda m: m.group(1) or "", text)
+        text = _BLANK_LINE_PATTERN.sub("", text)
+        text = _EXTRA_BLANK_LINES_PATTERN.sub("\n\n", text)
+        text = _SPACES_BEFORE_NEWLINE_PATTERN.sub("\n", text)
+        text = _SPACES_AFTER_NEWLINE_PATTERN.sub("\n", text)
         text = text.strip()
 
         return text
@@ -318,7 +364,7 @@ class TemplateImageGenerator:
 
         lines = []
         current_line = ""
-        punctuation = set(["。", "，", "！", "？", "；", "：", "、"])
+        punctuation = _WRAP_PUNCTUATION
 
         for char in text:
             test = current_line + char
@@ -578,12 +624,10 @@ class TemplateImageGenerator:
             x = (width - line_width) // 2
             y = start_y + i * line_height
 
-            for dx in range(-shadow_offset, shadow_offset + 1):
-                for dy in range(-shadow_offset, shadow_offset + 1):
-                    if abs(dx) + abs(dy) <= shadow_offset:
-                        draw.text((x + dx, y + dy), line, font=font, fill=shadow_color)
-
-            draw.text((x, y), line, font=font, fill=text_color)
+            # PIL 原生描边，一次光栅化完成描边和主文字
+            draw.text(
+                (x, y), line, font=font, fill=text_color, stroke_width=shadow_offset, stroke_fill=shadow_color
+            )
 
         return img
 
@@ -610,7 +654,7 @@ class TemplateImageGenerator:
             output_path = f"{style_prefix}-cover.png"
 
         os.makedirs(os.path.dirname(output_path) if os.path.dirname(output_path) else ".", exist_ok=True)
-        img.save(output_path, "PNG", quality=95)
+        img.save(output_path, "PNG", compress_level=self.compress_level)
         Logger.info("已生成封面图", logger_name="template_image_generator", file_path=output_path)
 
         return output_path
@@ -640,7 +684,7 @@ class TemplateImageGenerator:
             output_path = f"{style_prefix}-story-{index:02d}.png"
 
         os.makedirs(os.path.dirname(output_path) if os.path.dirname(output_path) else ".", exist_ok=True)
-        img.save(output_path, "PNG", quality=95)
+        img.save(output_path, "PNG", compress_level=self.compress_level)
         Logger.info(f"已生成故事图 {index}", logger_name="template_image_generator", file_path=output_path, index=index)
 
         return output_path
@@ -758,13 +802,13 @@ class TemplateImageGenerator:
         if not content or not num_parts:
             return []
 
-        clean_content = re.sub(r"\n{3,}", "\n\n", content)
+        clean_content = _EXTRA_BLANK_LINES_PATTERN.sub("\n\n", content)
         paragraphs = [p.strip() for p in clean_content.split("\n\n") if p.strip()]
 
         refined = []
         for para in paragraphs:
             if len(para) > 150:
-                sentences = re.split(r"([。！？\n])", para)
+                sentences = _SENTENCE_OR_LINE_SPLIT_PATTERN.split(para)
                 current = ""
                 for i in range(0, len(sentences), 2):
                     if i < len(sentences):
@@ -783,7 +827,7 @@ class TemplateImageGenerator:
             expanded = []
             for para in paragraphs:
                 if len(para) > 100:
-                    sentences = re.split(r"([。！？])", para)
+                    sentences = _SENTENCE_SPLIT_PATTERN.split(para)
                     current = ""
                     for i in range(0, len(sentences), 2):
                         if i < len(sentences):
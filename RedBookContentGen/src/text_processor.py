@@ -8,7 +8,7 @@
 """
 
 import re
-from typing import List
+from typing import Callable, List
 
 try:
     HAS_PIL = True
@@ -20,9 +20,48 @@ class TextProcessor:
     """文字处理器类，提供文字换行、截断、清理等功能"""
 
     # 标点符号集合
-    PUNCTUATION = set(["。", "，", "！", "？", "；", "：", "、", "…", ".", ",", "!", "?", ";", ":"])
-    OPENING_PUNCTUATION = set(["（", "(", "【", "[", "《", "<", '"', '"', """, """])
-    CLOSING_PUNCTUATION = set(["）", ")", "】", "]", "》", ">", '"', '"', """, """])
+    PUNCTUATION = frozenset(["。", "，", "！", "？", "；", "：", "、", "…", ".", ",", "!", "?", ";", ":"])
+    OPENING_PUNCTUATION = frozenset(["（", "(", "【", "[", "《", "<", '"', '"', """, """])
+    CLOSING_PUNCTUATION = frozenset(["）", ")", "】", "]", "》", ">", '"', '"', """, """])
+
+    # 显示文字允许保留的字符范围之外的字符（emoji、特殊符号等）：
+    # ASCII可打印字符、中文字符、CJK符号和标点、全角ASCII和全角标点
+    DISALLOWED_CHAR_PATTERN = re.compile(r"[^\u0020-\u007E\u4E00-\u9FFF\u3000-\u303F\uFF00-\uFFEF]+")
+    WHITESPACE_PATTERN = re.compile(r"\s+")
+    # 提示词中的 Midjourney 风格参数（--ar 3:4、--v 5.2、--style raw），图片生成API不需要
+    PROMPT_PARAM_PATTERN = re.compile(r"--(?:ar\s*\d+:\d+|v\s*\d+(?:\.\d+)?|style\s+\w+)")
+    # 正文分段：连续3个及以上换行、句末标点/换行（保留分隔符）
+    EXTRA_BLANK_LINES_PATTERN = re.compile(r"\n{3,}")
+    SENTENCE_SPLIT_PATTERN = re.compile(r"([。！？\n])")
+    # 真正敏感的词汇（只检查明显不当的内容），内容生成与图片生成共用
+    # 注意：不包含"天安门"、"广场"、"故宫"等正常历史文化词汇
+    SENSITIVE_KEYWORDS = (
+        # 明显政治敏感（不含正常历史描述）
+        "革命",
+        "暴动",
+        "叛乱",
+        "政变",
+        # 明显暴力
+        "血腥",
+        "杀戮",
+        "屠杀",
+        "武器",
+        "枪",
+        "刀",
+        # 明显色情
+        "色情",
+        "裸露",
+        "情色",
+        # 其他明显敏感
+        "恐怖",
+        "爆炸",
+        "毒品",
+        "赌博",
+    )
+    # 敏感词匹配模式：长词优先，一次扫描完成检测与移除
+    SENSITIVE_KEYWORD_PATTERN = re.compile("|".join(map(re.escape, sorted(SENSITIVE_KEYWORDS, key=len, reverse=True))))
+    # 查找每行最长前缀时探测上界的初始字符数
+    _FIT_PREFIX_HINT = 8
 
     def __init__(self):
         """初始化文字处理器"""
@@ -41,27 +80,11 @@ class TextProcessor:
         if not text:
             return ""
 
-        # 移除emoji（使用更简单的方法）
-        # 只保留中文、英文、数字、常用标点
-        cleaned = []
-        for char in text:
-            code = ord(char)
-            # 保留：
-            # - 基本拉丁字母和数字 (0x0020 - 0x007E)
-            # - 中文字符 (0x4E00 - 0x9FFF)
-            # - 中文标点 (0x3000 - 0x303F, 0xFF00 - 0xFFEF)
-            if (
-                0x0020 <= code <= 0x007E  # ASCII可打印字符
-                or 0x4E00 <= code <= 0x9FFF  # 中文字符
-                or 0x3000 <= code <= 0x303F  # CJK符号和标点
-                or 0xFF00 <= code <= 0xFFEF
-            ):  # 全角ASCII、全角标点
-                cleaned.append(char)
-
-        text = "".join(cleaned)
+        # 移除emoji和特殊符号，只保留中文、英文、数字、常用标点
+        text = TextProcessor.DISALLOWED_CHAR_PATTERN.sub("", text)
 
         # 规范化空白字符
-        text = re.sub(r"\s+", " ", text)
+        text = TextProcessor.WHITESPACE_PATTERN.sub(" ", text)
 
         return text.strip()
 
@@ -83,30 +106,28 @@ class TextProcessor:
         if not text:
             return []
 
-        lines = []
-        current_line = ""
-
-        for char in text:
-            test = current_line + char
-            try:
-                bbox = draw.textbbox((0, 0), test, font=font)
-                test_width = bbox[2] - bbox[0]
-            except (AttributeError, TypeError, ValueError):
-                test_width = len(test) * (font.size if hasattr(font, "size") else 60)
-
-            if test_width <= max_width:
-                current_line = test
-            else:
-                if current_line:
-                    lines.append(current_line)
-                    if len(lines) >= max_lines:
-                        break
-                    current_line = char
-                else:
-                    current_line = char
-
-        if current_line and len(lines) < max_lines:
-            lines.append(current_line)
+        # 只探测一次 textbbox 是否可用，避免每次测量都走异常处理
+        try:
+            draw.textbbox((0, 0), "a", font=font)
+            use_bbox = True
+        except (AttributeError, TypeError, ValueError):
+            use_bbox = False
+        font_size = getattr(font, "size", 60)
+
+        def measure(segment: str) -> float:
+            if use_bbox:
+                bbox = draw.textbbox((0, 0), segment, font=font)
+                return float(bbox[2] - bbox[0])
+            return float(len(segment) * font_size)
+
+        # 每行以上一行长度为起点探测上界后二分查找能放下的最长前缀，代替逐字测量
+        lines: list[str] = []
+        start = 0
+        while start < len(text) and len(lines) < max_lines:
+            hint = len(lines[-1]) if lines else TextProcessor._FIT_PREFIX_HINT
+            end = TextProcessor._fit_prefix_end(text, start, max_width, measure, hint)
+            lines.append(text[start:end])
+            start = end
 
         # 后处理：合并单独的标点符号
         result: list[str] = []
@@ -121,6 +142,50 @@ class TextProcessor:
 
         return result if result else [text[:20]]
 
+    @staticmethod
+    def _fit_prefix_end(
+        text: str, start: int, max_width: float, measure: Callable[[str], float], hint: int = _FIT_PREFIX_HINT
+    ) -> int:
+        """
+        查找从 start 开始能放入 max_width 的最长片段的结束位置
+
+        先从 hint 个字符起按倍数探测上界，再在上界内二分查找，
+        测量的片段长度不超过实际结果的两倍左右，与剩余文字长度无关。
+        文字宽度随字符数单调增加，结果与逐字累加测量一致；
+        单个字符就超宽时也至少返回一个字符
+
+        Args:
+            text: 原始文字
+            start: 起始位置
+            max_width: 最大宽度
+            measure: 测量片段宽度的函数
+            hint: 探测上界的初始字符数（通常取上一行的长度）
+
+        Returns:
+            片段结束位置（不含）
+        """
+        lo = start + 1
+        if measure(text[start:lo]) > max_width:
+            return lo
+
+        # 指数探测：lo 始终放得下，hi 超宽或到达文字末尾时停止
+        step = max(hint, 1)
+        hi = min(start + step, len(text))
+        while hi < len(text) and measure(text[start:hi]) <= max_width:
+            lo = hi
+            step *= 2
+            hi = min(start + step, len(text))
+        if hi < len(text):
+            hi -= 1
+
+        while lo < hi:
+            mid = (lo + hi + 1) // 2
+            if measure(text[start:mid]) <= max_width:
+                lo = mid
+            else:
+                hi = mid - 1
+        return lo
+
     @staticmethod
     def smart_truncate_simple(text: str, max_lines: int, max_width: int, font, draw) -> List[str]:
         """
@@ -143,18 +208,17 @@ class TextProcessor:
         result = lines[: max_lines - 1] if max_lines > 1 else []
         last = "".join(lines[max_lines - 1 :])
 
+        def measure(segment: str) -> float:
+            bbox = draw.textbbox((0, 0), segment, font=font)
+            return float(bbox[2] - bbox[0])
+
         ellipsis = "…"
-        ellipsis_w = draw.textbbox((0, 0), ellipsis, font=font)[2] - draw.textbbox((0, 0), ellipsis, font=font)[0]
+        ellipsis_w = measure(ellipsis)
         available = max_width - ellipsis_w - 5
 
         last_line = ""
-        for char in last:
-            test = last_line + char
-            bbox = draw.textbbox((0, 0), test, font=font)
-            if bbox[2] - bbox[0] <= available:
-                last_line = test
-            else:
-                break
+        if last and measure(last[:1]) <= available:
+            last_line = last[: TextProcessor._fit_prefix_end(last, 0, available, measure)]
 
         if last_line:
             result.append(last_line + ellipsis)
@@ -289,14 +353,14 @@ class TextProcessor:
             return []
 
         # 清理内容
-        clean_content = re.sub(r"\n{3,}", "\n\n", content)
+        clean_content = TextProcessor.EXTRA_BLANK_LINES_PATTERN.sub("\n\n", content)
         paragraphs = [p.strip() for p in clean_content.split("\n\n") if p.strip()]
 
         # 如果段落很长，进一步分割
         refined_paragraphs = []
         for para in paragraphs:
             if len(para) > 120:
-                sentences = re.split(r"([。！？\n])", para)
+                sentences = TextProcessor.SENTENCE_SPLIT_PATTERN.split(para)
                 current_sentence = ""
                 for i in range(0, len(sentences), 2):
                     if i < len(sentences):
@@ -311,26 +375,13 @@ class TextProcessor:
 
         paragraphs = refined_paragraphs if refined_paragraphs else paragraphs
 
-        # 分配段落到图片
-        result = []
-        para_index = 0
-
-        for i, scene in enumerate(scenes):
-            segments_for_image = []
-
-            if i == 0:
-                if para_index < len(paragraphs):
-                    segments_for_image.append(paragraphs[para_index])
-                    para_index += 1
-            elif i < len(scenes) - 1:
-                if para_index < len(paragraphs):
-                    segments_for_image.append(paragraphs[para_index])
-                    para_index += 1
-            else:
-                while para_index < len(paragraphs):
-                    segments_for_image.append(paragraphs[para_index])
-                    para_index += 1
-
-            result.append("\n\n".join(segments_for_image) if segments_for_image else "")
+        # 分配段落到图片：前面每张图一段，最后一张图承接剩余全部段落（只有一张图时只取第一段）
+        # 直接按下标切片，不再逐段追加
+        last = len(scenes) - 1
+        if last == 0:
+            return [paragraphs[0] if paragraphs else ""]
 
+        result = paragraphs[:last]
+        result.extend([""] * (last - len(result)))
+        result.append("\n\n".join(paragraphs[last:]))
         return result
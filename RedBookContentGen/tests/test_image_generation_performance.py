@@ -237,6 +237,35 @@ class TestImageGenerationPerformance:
         print(f"  并发限制: 3")
         print(f"  并发控制正常 ✓")
 
+    @pytest.mark.asyncio
+    async def test_on_result_called_as_each_image_finishes(self, async_service, test_prompts):
+        """测试结果回调：每张图片完成即回调，异常图片也以失败结果回调"""
+
+        async def mock_generate(
+            prompt: str, index: int = 0, is_cover: bool = False, size: str = None, max_retries: int = 3
+        ) -> ImageGenerationResult:
+            """图片越靠后完成越早，图3抛出异常"""
+            await asyncio.sleep(0.02 * (5 - index))
+            if index == 3:
+                raise RuntimeError("网络中断")
+            return ImageGenerationResult(success=True, image_url=f"https://example.com/image_{index}.png", index=index)
+
+        async_service.generate_single_image_async = mock_generate
+
+        callback_order = []
+
+        async def on_result(result, prompt_data):
+            callback_order.append((prompt_data["index"], result.success))
+
+        results = await async_service.generate_batch_images_async(
+            prompts=test_prompts, max_concurrent=5, on_result=on_result
+        )
+
+        # 回调按完成顺序触发，返回值仍按提示词顺序
+        assert callback_order == [(4, True), (3, False), (2, True), (1, True), (0, True)]
+        assert [r.index for r in results] == [0, 1, 2, 3, 4]
+        assert results[3].error == "网络中断"
+
 
 class TestRealWorldScenario:
     """真实场景测试（需要真实API Key）"""
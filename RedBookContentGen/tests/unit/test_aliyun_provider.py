@@ -344,6 +344,48 @@ def test_aliyun_provider_integration_with_image_generator():
     print()
 
 
+def test_aliyun_provider_poll_interval_backoff():
+    """测试任务轮询间隔按指数退避增长"""
+    print("=" * 60)
+    print("测试: 任务轮询间隔指数退避")
+    print("=" * 60)
+
+    from unittest.mock import Mock, patch
+
+    config_manager = ConfigManager()
+    config_manager.set("openai_api_key", "sk-test-key")
+    Logger.initialize(config_manager)
+
+    provider = AliyunImageProvider(
+        config_manager=config_manager,
+        logger=Logger,
+        rate_limiter=None,
+        cache=None
+    )
+
+    # 前 6 次返回 RUNNING，第 7 次返回成功
+    running = Mock(status_code=200)
+    running.json.return_value = {"output": {"task_status": "RUNNING"}}
+    succeeded = Mock(status_code=200)
+    succeeded.json.return_value = {
+        "output": {"task_status": "SUCCEEDED", "results": [{"url": "https://example.com/a.png"}]}
+    }
+
+    with patch("src.image_providers.aliyun_provider.requests.get",
+               side_effect=[running] * 6 + [succeeded]), \
+         patch("src.image_providers.aliyun_provider.time.sleep") as mock_sleep:
+        image_url = provider._wait_for_task_completion("task-123")
+
+    assert image_url == "https://example.com/a.png", "应返回任务结果中的图片 URL"
+    intervals = [c.args[0] for c in mock_sleep.call_args_list]
+    assert intervals[0] == 0.5, "首次轮询间隔应为 0.5 秒"
+    assert all(b >= a for a, b in zip(intervals, intervals[1:])), "轮询间隔应单调不减"
+    assert max(intervals) <= 4.0, "轮询间隔不应超过 4 秒"
+
+    print("✅ 任务轮询间隔指数退避正确")
+    print()
+
+
 def run_all_tests():
     """运行所有测试"""
     print("\n" + "=" * 60)
@@ -361,6 +403,7 @@ def run_all_tests():
         test_aliyun_provider_with_cache()
         test_aliyun_provider_with_rate_limiter()
         test_aliyun_provider_integration_with_image_generator()
+        test_aliyun_provider_poll_interval_backoff()
         
         print("=" * 60)
         print("✅ 所有测试通过！")
@@ -137,6 +137,46 @@ class TestAPIHandler:
         call_kwargs = mock_client.chat.completions.create.call_args[1]
         assert call_kwargs["response_format"] == response_format
 
+    @patch("src.core.api_handler.Logger")
+    def test_call_openai_stream(self, mock_logger):
+        """测试流式接收响应并拼接为完整文本"""
+        chunks = []
+        for piece in ['{"result": ', None, '"test"}']:
+            chunk = Mock()
+            chunk.choices = [Mock()]
+            chunk.choices[0].delta.content = piece
+            chunks.append(chunk)
+        mock_client = Mock()
+        mock_client.chat.completions.create.return_value = iter(chunks)
+
+        handler = APIHandler(rate_limit_enabled=False, stream=True)
+
+        messages = [{"role": "user", "content": "test"}]
+        response = handler.call_openai(client=mock_client, model="gpt-4", messages=messages)
+
+        assert response.choices[0].message.content == '{"result": "test"}'
+        call_kwargs = mock_client.chat.completions.create.call_args[1]
+        assert call_kwargs["stream"] is True
+
+    @patch("src.core.api_handler.Logger")
+    def test_call_openai_logs_prompt_cache_usage(self, mock_logger):
+        """测试记录服务端提示词前缀缓存命中情况"""
+        mock_client = Mock()
+        mock_response = Mock()
+        mock_response.choices = [Mock()]
+        mock_response.choices[0].message.content = '{"result": "test"}'
+        mock_response.usage.prompt_tokens = 1000
+        mock_response.usage.prompt_tokens_details.cached_tokens = 800
+        mock_client.chat.completions.create.return_value = mock_response
+
+        handler = APIHandler(rate_limit_enabled=False)
+        handler.call_openai(client=mock_client, model="gpt-4", messages=[{"role": "user", "content": "test"}])
+
+        cache_logs = [c for c in mock_logger.debug.call_args_list if c.args[0] == "提示词前缀缓存命中情况"]
+        assert len(cache_logs) == 1
+        assert cache_logs[0].kwargs["cached_tokens"] == 800
+        assert cache_logs[0].kwargs["cache_hit_ratio"] == "80.00%"
+
     @patch("src.core.api_handler.Logger")
     def test_call_openai_with_evaluation(self, mock_logger):
         """测试带评估的 API 调用"""
@@ -9,6 +9,8 @@ import sys
 import tempfile
 from pathlib import Path
 
+import pytest
+
 # 添加项目根目录到路径
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
@@ -199,6 +201,67 @@ def test_generate_env_var_name():
     print("✅ 测试通过: 生成环境变量名称")
 
 
+def test_load_config_cache_follows_file_changes():
+    """测试配置解析缓存：文件未改动时复用，改动后重新解析"""
+    with tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False) as f:
+        json.dump({"password": "first"}, f)
+        temp_path = f.name
+
+    try:
+        first = ConfigSecurityChecker(temp_path)
+        second = ConfigSecurityChecker(temp_path)
+        assert first.load_config() and second.load_config()
+        assert first.config_data is second.config_data
+
+        Path(temp_path).write_text(json.dumps({"password": "changed-value"}), encoding="utf-8")
+
+        third = ConfigSecurityChecker(temp_path)
+        assert third.load_config()
+        assert third.config_data == {"password": "changed-value"}
+
+        print("✅ 测试通过: 配置解析缓存")
+
+    finally:
+        Path(temp_path).unlink()
+
+
+def test_check_stream_matches_check():
+    """测试流式检查与完整加载后检查的结果一致"""
+    pytest.importorskip("ijson")
+
+    config_data = {
+        "_comment": {"token": "abc123def456ghi789jkl012mno345pqr678"},
+        "api": {"openai": {"api_key": "sk-1234567890abcdefghijklmnopqrstuvwxyz", "model": "qwen"}},
+        "services": [{"password": "mypassword123"}, ["Bearer abc", "plain"], {"secret": "${SECRET}"}],
+        "auth": {"token": "abc123def456ghi789jkl012mno345pqr678", "timeout": 30},
+    }
+
+    with tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False) as f:
+        json.dump(config_data, f)
+        temp_path = f.name
+
+    try:
+        checker = ConfigSecurityChecker(temp_path)
+        assert checker.load_config()
+        expected = [(i.severity, i.key_path, i.issue_type, i.description) for i in checker.check()]
+
+        stream_checker = ConfigSecurityChecker(temp_path)
+        assert stream_checker.check_stream()
+        actual = [(i.severity, i.key_path, i.issue_type, i.description) for i in stream_checker.issues]
+
+        assert actual == expected
+        assert [key_path for _, key_path, _, _ in actual] == [
+            "api.openai.api_key",
+            "services[0].password",
+            "auth.token",
+        ]
+
+        print("✅ 测试通过: 流式检查")
+
+    finally:
+        Path(temp_path).unlink()
+
+
 def run_all_tests():
     """运行所有测试"""
     print("=" * 70)
@@ -214,6 +277,8 @@ def run_all_tests():
         test_generate_fixed_config,
         test_mask_value,
         test_generate_env_var_name,
+        test_load_config_cache_follows_file_changes,
+        test_check_stream_matches_check,
     ]
 
     passed = 0
@@ -566,6 +566,39 @@ def test_cache_integration_multiple_inputs(generator_with_cache, mock_openai_res
             assert results1[i] == results2[i]
 
 
+@pytest.mark.unit
+def test_persistent_cache_reused_across_instances(temp_dir, mock_openai_response):
+    """测试开启持久化后，新的生成器实例可复用上次运行的结果"""
+    config_data = {
+        "input_file": str(temp_dir / "input.txt"),
+        "output_excel": str(temp_dir / "output" / "test.xlsx"),
+        "output_image_dir": str(temp_dir / "output" / "images"),
+        "openai_api_key": "test-api-key-12345",
+        "openai_model": "qwen-plus",
+        "cache": {"enabled": True, "persist_content_cache": True, "cache_dir": str(temp_dir / "cache")},
+        "rate_limit": {"openai": {"enable_rate_limit": False}},
+    }
+    config_file = temp_dir / "config.json"
+    with open(config_file, "w", encoding="utf-8") as f:
+        json.dump(config_data, f, ensure_ascii=False, indent=2)
+
+    input_text = "老北京的胡同文化"
+
+    first = RedBookContentGenerator(config_manager=ConfigManager(str(config_file)))
+    with patch.object(first.api_handler, "call_openai_with_evaluation") as mock_call:
+        mock_call.return_value = mock_openai_response
+        result1 = first.generate_content(input_text)
+
+    # 模拟下一次运行：新实例的内存缓存为空
+    second = RedBookContentGenerator(config_manager=ConfigManager(str(config_file)))
+    with patch.object(second.api_handler, "call_openai_with_evaluation") as mock_call:
+        result2 = second.generate_content(input_text)
+        mock_call.assert_not_called()
+
+    assert result2 == result1
+    assert list((temp_dir / "cache" / "content").glob("*.json"))
+
+
 if __name__ == "__main__":
     pytest.main([
         __file__,
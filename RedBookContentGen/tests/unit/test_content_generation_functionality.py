@@ -17,6 +17,7 @@
 import pytest
 import json
 import tempfile
+import zipfile
 from pathlib import Path
 from unittest.mock import Mock, patch, MagicMock
 from typing import Dict, Any
@@ -291,6 +292,29 @@ def test_content_safety_check(generator):
     assert "的内容" in modified
 
 
+@pytest.mark.unit
+def test_suspicious_content_reuses_safety_scan(generator):
+    """测试记录可疑内容时复用已缓存的敏感词扫描结果，只记录仍含敏感词的字段"""
+    from src.content_generator import _scan_sensitive_keywords
+
+    content_data = {
+        "content": "胡同里的老北京记忆，邻里之间的温情",
+        "image_prompts": [{"prompt": "胡同里的老人手持大刀表演"}, {"prompt": "四合院清晨"}],
+        "cover": {"prompt": "老北京胡同全景"},
+    }
+    for prompt_data in content_data["image_prompts"]:
+        generator.check_content_safety(prompt_data["prompt"])
+
+    hits_before = _scan_sensitive_keywords.cache_info().hits
+    generator._save_suspicious_content(content_data)
+
+    assert _scan_sensitive_keywords.cache_info().hits >= hits_before + 2
+    text = (Path(generator.image_dir) / "suspicious_content.txt").read_text(encoding="utf-8")
+    assert "## 图1提示词" in text
+    assert "图2提示词" not in text
+    assert "正文内容" not in text
+
+
 # ============================================================================
 # 测试 5: 缓存键生成
 # ============================================================================
@@ -372,6 +396,143 @@ def test_generate_single_content(generator, mock_openai_client):
         assert isinstance(result["raw_data"], dict)
 
 
+
+@pytest.mark.unit
+def test_openai_client_reused_across_calls(generator, mock_openai_client):
+    """测试多次生成复用同一个 OpenAI 客户端，close 后释放"""
+    with patch("openai.OpenAI", return_value=mock_openai_client) as mock_openai_class:
+        with generator:
+            generator.generate_content("老北京的胡同文化")
+            generator.generate_content("老北京的四合院")
+
+    assert mock_openai_class.call_count == 1
+    mock_openai_client.close.assert_called_once()
+    assert generator._openai_client is None
+
+
+@pytest.mark.unit
+def test_generate_content_combined_single_request(generator):
+    """测试多条输入合并为一次请求生成，结果按输入顺序返回"""
+    items = [
+        {"titles": [f"标题{i}"], "content": f"正文{i}", "tags": "#老北京", "image_prompts": [], "cover": {}}
+        for i in range(3)
+    ]
+    mock_client = Mock()
+    mock_response = Mock()
+    mock_response.choices = [Mock(message=Mock(content=json.dumps({"results": items}, ensure_ascii=False)))]
+    mock_client.chat.completions.create.return_value = mock_response
+
+    with patch("openai.OpenAI", return_value=mock_client):
+        results = generator.generate_content_combined(["胡同", "四合院", "天坛"])
+
+    assert mock_client.chat.completions.create.call_count == 1
+    assert [r["content"] for r in results] == ["正文0", "正文1", "正文2"]
+    prompt = mock_client.chat.completions.create.call_args[1]["messages"][1]["content"]
+    assert prompt.index("胡同") < prompt.index("四合院") < prompt.index("天坛")
+
+
+@pytest.mark.unit
+def test_generate_content_combined_falls_back_on_count_mismatch(generator):
+    """测试合并请求返回数量不符时回退为逐条生成"""
+    with patch.object(generator, "_generate_combined_group", side_effect=ValueError("数量不符")), patch.object(
+        generator, "generate_content", side_effect=lambda raw: {"content": raw}
+    ):
+        results = generator.generate_content_combined(["胡同", "四合院"])
+
+    assert results == [{"content": "胡同"}, {"content": "四合院"}]
+
+
+@pytest.mark.unit
+def test_generate_content_batch_api(generator):
+    """测试通过 Batch API 上传请求、轮询任务并按 custom_id 解析结果"""
+    def batch_output(custom_id, content):
+        result = {"titles": ["标题"], "content": content, "tags": "#老北京", "image_prompts": [], "cover": {}}
+        message = {"content": json.dumps(result, ensure_ascii=False)}
+        return {"custom_id": custom_id, "response": {"status_code": 200, "body": {"choices": [{"message": message}]}}}
+
+    # 输出文件中的顺序与输入不同，需按 custom_id 对应回输入
+    outputs = [batch_output("doc-1", "四合院正文"), batch_output("doc-0", "胡同正文")]
+    mock_client = Mock()
+    mock_client.files.create.return_value = Mock(id="file-input")
+    mock_client.batches.create.return_value = Mock(id="batch-1", status="in_progress")
+    mock_client.batches.retrieve.return_value = Mock(id="batch-1", status="completed", output_file_id="file-output")
+    mock_client.files.content.return_value = Mock(text="\n".join(json.dumps(o, ensure_ascii=False) for o in outputs))
+
+    with patch("openai.OpenAI", return_value=mock_client):
+        results = generator.generate_content_batch_api(["胡同", "四合院"], poll_interval=0)
+
+    assert [r["content"] for r in results] == ["胡同正文", "四合院正文"]
+    uploaded = mock_client.files.create.call_args[1]["file"][1].decode("utf-8").splitlines()
+    assert [json.loads(line)["custom_id"] for line in uploaded] == ["doc-0", "doc-1"]
+    mock_client.files.content.assert_called_once_with("file-output")
+
+
+@pytest.mark.unit
+def test_generate_content_failure_saves_input(generator, temp_dir):
+    """测试重试后仍失败时保存原始输入，并把 max_retries 交给 OpenAI 客户端"""
+    with patch("openai.OpenAI") as mock_openai_class, patch.object(
+        generator, "_generate_with_iterations", side_effect=RuntimeError("服务不可用")
+    ):
+        with pytest.raises(RuntimeError):
+            generator.generate_content("老北京的胡同文化")
+
+    assert mock_openai_class.call_args[1]["max_retries"] == 3
+    failed_files = list((temp_dir / "output" / "failed").glob("*.txt"))
+    assert len(failed_files) == 1
+    text = failed_files[0].read_text(encoding="utf-8")
+    assert "服务不可用" in text
+    assert text.endswith("老北京的胡同文化")
+
+
+@pytest.mark.unit
+def test_invalid_generated_structure_triggers_regeneration(generator, mock_openai_client):
+    """测试生成结果缺少必要字段时作废并重新生成"""
+    invalid_response = Mock()
+    invalid_response.choices = [Mock(message=Mock(content=json.dumps({"content": "只有正文"}, ensure_ascii=False)))]
+    valid_response = mock_openai_client.chat.completions.create.return_value
+    eval_response = Mock()
+    eval_response.choices = [Mock(message=Mock(content="PASS"))]
+    mock_openai_client.chat.completions.create.side_effect = [invalid_response, valid_response, eval_response]
+
+    with patch("openai.OpenAI", return_value=mock_openai_client):
+        result = generator.generate_content("老北京的胡同文化")
+
+    assert len(result["titles"]) == 5
+    assert mock_openai_client.chat.completions.create.call_count == 3
+
+
+@pytest.mark.unit
+def test_validate_generated_content_reports_field_errors(generator):
+    """测试结构校验指出类型不符的字段，多余字段不影响校验"""
+    from src.core.exceptions import ContentValidationError
+
+    valid = {"titles": ["标题"], "content": "正文", "tags": ["#老北京"], "image_prompts": [], "cover": {}}
+    generator._validate_generated_content({**valid, "_self_review": "无修改"})
+
+    with pytest.raises(ContentValidationError) as exc_info:
+        generator._validate_generated_content({**valid, "titles": "只有一个标题"})
+    assert "titles" in str(exc_info.value)
+
+
+@pytest.mark.unit
+def test_self_review_generates_in_single_request(generator, mock_openai_client):
+    """测试开启自审后只发起一次生成请求，不再单独评估"""
+    generator.config_manager.set("api.openai.self_review", True)
+    result_data = json.loads(mock_openai_client.chat.completions.create.return_value.choices[0].message.content)
+    result_data["_self_review"] = "加强了胡同细节描写"
+    response = Mock()
+    response.choices = [Mock(message=Mock(content=json.dumps(result_data, ensure_ascii=False)))]
+    mock_openai_client.chat.completions.create.return_value = response
+
+    with patch("openai.OpenAI", return_value=mock_openai_client):
+        result = generator.generate_content("老北京的胡同文化")
+
+    assert mock_openai_client.chat.completions.create.call_count == 1
+    assert "_self_review" not in result
+    prompt = mock_openai_client.chat.completions.create.call_args[1]["messages"][1]["content"]
+    assert "## Self-Review" in prompt
+    assert prompt.rstrip().endswith("老北京的胡同文化")
+
 # ============================================================================
 # 测试 8: 错误处理
 # ============================================================================
@@ -470,5 +631,243 @@ def test_generator_with_rate_limit_disabled(test_config):
     assert generator.tpm_limiter is None
 
 
+
+# ============================================================================
+# 测试 10: Excel 保存
+# ============================================================================
+
+
+@pytest.mark.unit
+def test_save_to_excel_creates_and_appends(generator, test_config):
+    """测试新建Excel写入表头和数据行，已有文件追加数据行"""
+    import openpyxl
+
+    content_data = {
+        "titles": ["胡同里的老北京记忆"],
+        "content": "记得小时候的老北京胡同吗？",
+        "tags": "#老北京 #胡同文化",
+        "image_prompts": [{"scene": "胡同清晨", "prompt": "老北京胡同清晨场景"}],
+        "cover": {"title": "老北京胡同记忆", "prompt": "老北京胡同全景"},
+    }
+
+    generator.save_to_excel(content_data, "第一条原始内容")
+    generator.save_to_excel(content_data, "第二条原始内容")
+
+    excel_path = generator.config_manager.get("output_excel")
+    ws = openpyxl.load_workbook(excel_path).active
+
+    assert ws.title == "小红书内容"
+    assert ws.max_row == 3
+    assert ws["A1"].value == "生成时间"
+    assert ws["A1"].font.bold is True
+    assert ws.column_dimensions["H"].width == 60
+    assert [ws["B2"].value, ws["B3"].value] == ["第一条原始内容", "第二条原始内容"]
+    assert ws["J2"].value == "胡同清晨: 老北京胡同清晨场景"
+    assert ws["B3"].alignment.wrap_text is True
+
+
+@pytest.mark.unit
+def test_save_batch_to_excel_saves_once_with_checkpoints(generator):
+    """测试批量写入Excel只打开一次工作簿，并按检查点间隔保存"""
+    import openpyxl
+
+    items = [({"titles": [f"标题{i}"], "content": f"正文{i}"}, f"原始内容{i}") for i in range(5)]
+
+    with patch.object(generator, "_close_workbook", wraps=generator._close_workbook) as mock_close:
+        generator.save_batch_to_excel(items, checkpoint_interval=2)
+
+    # 第 2、4 行后各保存一次检查点，最后再保存一次
+    assert mock_close.call_count == 3
+
+    ws = openpyxl.load_workbook(generator.config_manager.get("output_excel")).active
+    assert ws.max_row == 6
+    assert [ws.cell(row=r, column=2).value for r in range(2, 7)] == [f"原始内容{i}" for i in range(5)]
+    assert ws["A1"].font.bold is True
+    assert ws["B6"].alignment.wrap_text is True
+
+
+@pytest.mark.unit
+def test_close_workbook_uses_configured_compress_level(generator, temp_dir):
+    """测试保存 Excel 时默认以压缩级别 1 写出 zip 包"""
+    import openpyxl
+
+    excel_path = str(temp_dir / "level.xlsx")
+    with patch("src.content_generator.zipfile.ZipFile", wraps=zipfile.ZipFile) as mock_zip:
+        generator._close_workbook(openpyxl.Workbook(), excel_path)
+
+    assert mock_zip.call_args.kwargs["compresslevel"] == 1
+    assert openpyxl.load_workbook(excel_path).active is not None
+
+
+@pytest.mark.unit
+def test_close_workbook_falls_back_when_excel_writer_fails(generator, temp_dir):
+    """测试 openpyxl 内部 ExcelWriter 调用失败时回退到 Workbook.save"""
+    import openpyxl
+
+    wb = openpyxl.Workbook()
+    wb.active["A1"] = "胡同"
+    excel_path = str(temp_dir / "fallback.xlsx")
+    with patch("src.content_generator.ExcelWriter", side_effect=TypeError("signature changed")):
+        generator._close_workbook(wb, excel_path)
+
+    assert openpyxl.load_workbook(excel_path).active["A1"].value == "胡同"
+
+@pytest.mark.unit
+def test_save_to_jsonl_and_export_excel(generator, temp_dir):
+    """测试JSONL日志逐行追加，并能据此重新导出Excel"""
+    import openpyxl
+
+    content_data = {"titles": ["胡同里的老北京记忆"], "content": "胡同故事", "tags": "#老北京"}
+
+    generator.save_to_jsonl(content_data, "第一条原始内容")
+    generator.save_to_jsonl(content_data, "第二条原始内容")
+
+    jsonl_path = Path(generator.config_manager.get("output_excel")).with_suffix(".jsonl")
+    records = [json.loads(line) for line in jsonl_path.read_text(encoding="utf-8").splitlines()]
+    assert [r["原始内容"] for r in records] == ["第一条原始内容", "第二条原始内容"]
+    assert records[0]["标题1"] == "胡同里的老北京记忆"
+
+    excel_path = temp_dir / "exported.xlsx"
+    assert generator.export_excel_from_jsonl(excel_path=str(excel_path)) == 2
+
+    ws = openpyxl.load_workbook(excel_path).active
+    assert ws.max_row == 3
+    assert ws["A1"].value == "生成时间"
+    assert ws["B3"].value == "第二条原始内容"
+
+
+@pytest.mark.unit
+def test_export_excel_from_jsonl_without_xlsxwriter(generator, temp_dir):
+    """测试未安装 xlsxwriter 时回退到 openpyxl write_only 导出"""
+    import openpyxl
+
+    content_data = {"titles": ["胡同里的老北京记忆"], "content": "胡同故事", "tags": "#老北京"}
+    generator.save_to_jsonl(content_data, "原始内容")
+
+    excel_path = temp_dir / "exported.xlsx"
+    with patch("src.content_generator.HAS_XLSXWRITER", False):
+        assert generator.export_excel_from_jsonl(excel_path=str(excel_path)) == 1
+
+    ws = openpyxl.load_workbook(excel_path).active
+    assert ws.title == "小红书内容"
+    assert ws["B2"].value == "原始内容"
+
+
+@pytest.mark.unit
+def test_redbook_content_from_dict():
+    """测试生成结果解析为 RedBookContent：缺省字段填空值，故事图只保留前 4 张"""
+    from src.content_generator import RedBookContent
+
+    item = RedBookContent.from_dict(
+        {
+            "titles": ["标题"],
+            "tags": ["#老北京", "#胡同"],
+            "image_prompts": [{"scene": f"场景{i}", "prompt": f"提示词{i}"} for i in range(6)],
+            "cover": {"title": "封面"},
+        }
+    )
+
+    assert item.content == ""
+    assert item.tags == "#老北京 #胡同"
+    assert [p.scene for p in item.image_prompts] == ["场景0", "场景1", "场景2", "场景3"]
+    assert item.cover.title == "封面" and item.cover.prompt == ""
+    assert RedBookContent.coerce(item) is item
+    assert not hasattr(item, "__dict__")
+
+
+@pytest.mark.unit
+def test_save_outputs_writes_all_files(generator):
+    """测试并发保存时 Excel、JSONL、图片提示词和完整内容均被写出"""
+    content_data = {
+        "titles": ["胡同里的老北京记忆"],
+        "content": "胡同故事",
+        "tags": "#老北京",
+        "image_prompts": [{"scene": "胡同清晨", "prompt": "老北京胡同清晨场景"}],
+        "cover": {"title": "老北京胡同记忆", "prompt": "老北京胡同全景"},
+    }
+
+    generator.save_outputs(content_data, "原始内容")
+
+    excel_path = Path(generator.config_manager.get("output_excel"))
+    assert excel_path.exists()
+    assert excel_path.with_suffix(".jsonl").exists()
+    assert (Path(generator.image_dir) / "image_prompts.txt").exists()
+    assert (Path(generator.image_dir) / "content.md").exists()
+
+    # 各文件记录的生成时间一致（只取一次）
+    record = json.loads(excel_path.with_suffix(".jsonl").read_text(encoding="utf-8"))
+    generated_at = record["生成时间"]
+    assert f"生成时间: {generated_at}" in (Path(generator.image_dir) / "image_prompts.txt").read_text(encoding="utf-8")
+    assert f"**生成时间**: {generated_at}" in (Path(generator.image_dir) / "content.md").read_text(encoding="utf-8")
+
+
+@pytest.mark.unit
+def test_save_outputs_skips_excel_when_per_run_disabled(generator):
+    """测试关闭 output_excel_per_run 后只追加 JSONL 日志，Excel 可按需导出"""
+    generator.config_manager.set("output_excel_per_run", False)
+    content_data = {"titles": ["胡同里的老北京记忆"], "content": "胡同故事", "tags": "#老北京"}
+
+    generator.save_outputs(content_data, "第一条原始内容")
+    generator.save_outputs(content_data, "第二条原始内容")
+
+    excel_path = Path(generator.config_manager.get("output_excel"))
+    assert not excel_path.exists()
+    assert len(excel_path.with_suffix(".jsonl").read_text(encoding="utf-8").splitlines()) == 2
+
+    assert generator.export_excel_from_jsonl() == 2
+    assert excel_path.exists()
+
+
+@pytest.mark.unit
+def test_run_batch_saves_each_input_separately(generator, temp_dir):
+    """测试批量处理多个输入文件：结果按输入顺序返回，输出按文件名分目录保存"""
+    import openpyxl
+
+    paths = []
+    for name in ("hutong", "siheyuan"):
+        path = temp_dir / f"{name}.txt"
+        path.write_text(f"{name}原文", encoding="utf-8")
+        paths.append(str(path))
+    paths.append(str(temp_dir / "missing.txt"))
+
+    def fake_generate(raw_content):
+        return {"titles": ["标题"], "content": f"{raw_content}正文", "tags": "#老北京"}
+
+    with patch.object(generator, "generate_content", side_effect=fake_generate):
+        results = generator.run_batch(paths)
+
+    assert [r["content"] for r in results[:2]] == ["hutong原文正文", "siheyuan原文正文"]
+    assert isinstance(results[2], Exception)
+    for name in ("hutong", "siheyuan"):
+        assert f"{name}原文" in (Path(generator.image_dir) / name / "content.md").read_text(encoding="utf-8")
+
+    excel_path = Path(generator.config_manager.get("output_excel"))
+    assert openpyxl.load_workbook(excel_path).active.max_row == 3
+    assert len(excel_path.with_suffix(".jsonl").read_text(encoding="utf-8").splitlines()) == 2
+
+
+
+@pytest.mark.unit
+def test_run_batch_same_file_name_in_different_dirs(generator, temp_dir):
+    """测试不同目录下的同名输入文件分别保存到不同子目录，互不覆盖"""
+    paths = []
+    for sub in ("a", "b"):
+        (temp_dir / sub).mkdir()
+        path = temp_dir / sub / "input.txt"
+        path.write_text(f"{sub}目录原文", encoding="utf-8")
+        paths.append(str(path))
+
+    def fake_generate(raw_content):
+        return {"titles": ["标题"], "content": f"{raw_content}正文", "tags": "#老北京"}
+
+    with patch.object(generator, "generate_content", side_effect=fake_generate):
+        generator.run_batch(paths)
+
+    output_dirs = sorted(p for p in Path(generator.image_dir).iterdir() if p.name.startswith("input_"))
+    assert len(output_dirs) == 2
+    contents = sorted((d / "content.md").read_text(encoding="utf-8") for d in output_dirs)
+    assert "a目录原文" in contents[0]
+    assert "b目录原文" in contents[1]
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v", "--cov=src.content_generator", "--cov-report=term-missing"])
@@ -267,6 +267,27 @@ class TestContentGeneratorRateLimit:
         # 使用更宽松的断言
         assert consumed_tokens >= num_calls - 1  # 允许恢复 1 个令牌
 
+    def test_generate_content_batch_runs_concurrently(self, mock_config_with_rate_limit):
+        """测试批量生成并发执行，并按输入顺序返回结果和异常"""
+        generator = RedBookContentGenerator(config_manager=mock_config_with_rate_limit)
+
+        def fake_generate(raw_content):
+            time.sleep(0.2)
+            if raw_content == "坏输入":
+                raise ValueError("生成失败")
+            return {"content": raw_content}
+
+        with patch.object(generator, "generate_content", side_effect=fake_generate):
+            start = time.time()
+            results = generator.generate_content_batch(["胡同", "坏输入", "四合院"], max_concurrent=3)
+            elapsed = time.time() - start
+
+        assert results[0] == {"content": "胡同"}
+        assert isinstance(results[1], ValueError)
+        assert results[2] == {"content": "四合院"}
+        # 三条并发执行，总耗时应明显小于串行的 0.6 秒
+        assert elapsed < 0.5
+
     def test_rate_limit_config_from_environment(self, tmp_path, monkeypatch):
         """测试从环境变量读取速率限制配置"""
         # 设置环境变量
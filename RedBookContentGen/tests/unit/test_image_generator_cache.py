@@ -366,6 +366,111 @@ def test_cache_disabled_no_caching():
             return False
 
 
+def test_rewrite_cache_skips_repeated_api_call():
+    """测试AI改写结果缓存：相同文案只调用一次API，且结果持久化到文件"""
+    print("\n测试 9: AI改写结果缓存")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        config_data = {
+            "openai_api_key": "test-key",
+            "enable_ai_rewrite": True,
+            "cache": {"enabled": False, "cache_dir": os.path.join(temp_dir, "cache")},
+        }
+
+        config_file = os.path.join(temp_dir, "config.json")
+        with open(config_file, "w", encoding="utf-8") as f:
+            json.dump(config_data, f)
+
+        config_manager = ConfigManager(config_file)
+        generator = ImageGenerator(config_manager=config_manager)
+
+        long_text = "老北京的胡同里藏着无数故事，" * 5
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {"choices": [{"message": {"content": "胡同里的老故事"}}]}
+
+        with patch.object(generator.session, "post", return_value=mock_response) as mock_post:
+            first = generator.rewrite_text_for_display(long_text, 20)
+            second = generator.rewrite_text_for_display(long_text, 20)
+
+        assert first == second == "胡同里的老故事"
+        assert mock_post.call_count == 1
+
+        # 新实例从文件缓存读取，不再调用API
+        another = ImageGenerator(config_manager=config_manager)
+        with patch.object(another.session, "post") as mock_post:
+            assert another.rewrite_text_for_display(long_text, 20) == "胡同里的老故事"
+            mock_post.assert_not_called()
+
+        print("  ✅ AI改写结果缓存测试通过")
+        return True
+
+
+def test_text_layout_cache_reuses_wrapped_lines():
+    """测试相同文字重复排版时复用换行结果"""
+    print("\n测试 10: 换行结果缓存")
+
+    from PIL import Image, ImageDraw, ImageFont
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        config_data = {"openai_api_key": "test-key", "cache": {"enabled": False}}
+
+        config_file = os.path.join(temp_dir, "config.json")
+        with open(config_file, "w", encoding="utf-8") as f:
+            json.dump(config_data, f)
+
+        config_manager = ConfigManager(config_file)
+        generator = ImageGenerator(config_manager=config_manager)
+
+        draw = ImageDraw.Draw(Image.new("RGB", (1024, 1365), color="white"))
+        font = ImageFont.load_default()
+        text = "老北京的胡同里藏着无数故事，每一块砖瓦都见证着岁月的变迁。"
+
+        first = generator._wrap_text(text, 200, font, draw)
+        with patch.object(generator, "_compute_wrapped_lines") as mock_compute:
+            second = generator._wrap_text(text, 200, font, draw)
+            mock_compute.assert_not_called()
+
+        assert second == first
+        # 返回的是副本，修改结果不影响缓存
+        second.append("额外行")
+        assert generator._wrap_text(text, 200, font, draw) == first
+
+        print("  ✅ 换行结果缓存测试通过")
+        return True
+
+
+def test_text_layout_cache_concurrent_access():
+    """测试多线程并发排版时 LRU 缓存不出错且大小不超过上限"""
+    print("\n测试 11: 换行结果缓存并发访问")
+
+    from concurrent.futures import ThreadPoolExecutor
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        config_data = {"openai_api_key": "test-key", "cache": {"enabled": False}}
+
+        config_file = os.path.join(temp_dir, "config.json")
+        with open(config_file, "w", encoding="utf-8") as f:
+            json.dump(config_data, f)
+
+        config_manager = ConfigManager(config_file)
+        generator = ImageGenerator(config_manager=config_manager)
+        generator.TEXT_LAYOUT_CACHE_SIZE = 8
+
+        def layout(i):
+            key = ("wrap", f"文字{i % 20}")
+            return generator._cached_text_layout(key, lambda: [f"文字{i % 20}"])
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(layout, range(2000)))
+
+        assert results == [[f"文字{i % 20}"] for i in range(2000)]
+        assert len(generator._text_layout_cache) <= 8
+
+        print("  ✅ 换行结果缓存并发访问测试通过")
+        return True
+
+
 def main():
     """运行所有缓存测试"""
     print("=" * 60)
@@ -381,6 +486,9 @@ def main():
         test_generate_single_image_with_cache,
         test_generate_image_async_with_cache,
         test_cache_disabled_no_caching,
+        test_rewrite_cache_skips_repeated_api_call,
+        test_text_layout_cache_reuses_wrapped_lines,
+        test_text_layout_cache_concurrent_access,
     ]
 
     results = []
@@ -170,7 +170,7 @@ class TestImageGeneratorRateLimit:
             final_tokens = generator.rpm_limiter.get_available_tokens()
             assert final_tokens < initial_tokens
 
-    @patch("requests.post")
+    @patch("requests.Session.post")
     def test_generate_image_sync_with_rate_limit(self, mock_post, mock_config_with_rate_limit):
         """测试带速率限制的同步图片生成"""
         # 设置 mock 响应
@@ -260,6 +260,25 @@ class TestImageGeneratorRateLimit:
             # 由于令牌桶会自动恢复，所以消耗的令牌数可能略小于调用次数
             assert consumed_tokens >= num_calls - 1  # 允许恢复 1 个令牌
 
+    @patch("src.image_generator.time.sleep")
+    @patch("requests.Session.post")
+    def test_generate_image_sync_retries_on_429(self, mock_post, mock_sleep, mock_config_without_rate_limit):
+        """测试接口返回 429 时按 Retry-After 等待后重试"""
+        throttled = Mock()
+        throttled.status_code = 429
+        throttled.headers = {"Retry-After": "2"}
+        ok = Mock()
+        ok.status_code = 200
+        ok.json.return_value = {"output": {"image_url": "https://example.com/image.png"}}
+        mock_post.side_effect = [throttled, ok]
+
+        generator = ImageGenerator(config_manager=mock_config_without_rate_limit)
+        result = generator.generate_image_sync("测试提示词")
+
+        assert result == "https://example.com/image.png"
+        assert mock_post.call_count == 2
+        mock_sleep.assert_called_once_with(2.0)
+
     def test_rate_limit_config_from_environment(self, tmp_path, monkeypatch):
         """测试从环境变量读取速率限制配置"""
         # 设置环境变量
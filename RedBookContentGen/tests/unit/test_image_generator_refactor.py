@@ -54,6 +54,25 @@ class TestTextProcessor:
         assert len(lines) > 0
         assert len(lines) <= 3
 
+    def test_wrap_text_simple_long_text_measures_short_segments(self):
+        """测试长文字换行时只测量与行宽相当的片段，不测量到文字末尾"""
+        mock_font = Mock()
+        mock_font.size = 60
+        mock_draw = Mock()
+        measured = []
+
+        def mock_textbbox(pos, text, font):
+            measured.append(len(text))
+            return (0, 0, len(text) * font.size, font.size)
+
+        mock_draw.textbbox = mock_textbbox
+
+        text = "胡同" * 5000
+        lines = TextProcessor.wrap_text_simple(text, 300, mock_font, mock_draw, max_lines=3)
+
+        assert lines == ["胡同胡同胡", "同胡同胡同", "胡同胡同胡"]
+        assert max(measured) <= 20
+
 
 class TestImageGenerationContext:
     """测试 ImageGenerationContext 类"""
@@ -109,6 +128,50 @@ class TestImageResourceManager:
             assert not os.path.exists(temp_file2)
             assert os.path.exists(normal_file)
 
+    def test_download_image_streams_to_file(self):
+        """测试下载图片直接流式写入目标文件，不留下临时文件"""
+        import io
+        import tempfile
+        import os
+
+        image_bytes = b"\x89PNG\r\n" + b"x" * 5000
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.raw = io.BytesIO(image_bytes)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            save_path = os.path.join(tmpdir, "sub", "image.png")
+
+            with patch("src.image_resource_manager._download_session") as mock_session:
+                mock_session.get.return_value = mock_response
+                with ImageResourceManager.download_image("http://example.com/a.png", save_path) as path:
+                    assert path == save_path
+
+            with open(save_path, "rb") as f:
+                assert f.read() == image_bytes
+            assert not os.path.exists(save_path + ".tmp")
+            mock_response.close.assert_called_once()
+
+    def test_download_image_http_error_cleans_up(self):
+        """测试下载失败时抛出异常且不留下文件"""
+        import tempfile
+        import os
+
+        mock_response = Mock()
+        mock_response.status_code = 404
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            save_path = os.path.join(tmpdir, "image.png")
+
+            with patch("src.image_resource_manager._download_session") as mock_session:
+                mock_session.get.return_value = mock_response
+                with pytest.raises(Exception, match="HTTP 404"):
+                    with ImageResourceManager.download_image("http://example.com/a.png", save_path):
+                        pass
+
+            assert not os.path.exists(save_path)
+            assert not os.path.exists(save_path + ".tmp")
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
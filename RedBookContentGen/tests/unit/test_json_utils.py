@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+JSON 编解码工具单元测试
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.core import json_utils
+
+
+@pytest.fixture(params=[True, False], ids=["orjson", "stdlib"])
+def backend(request, monkeypatch):
+    """分别在 orjson 与标准库 json 两种实现下运行"""
+    if request.param and not json_utils.HAS_ORJSON:
+        pytest.skip("未安装 orjson")
+    monkeypatch.setattr(json_utils, "HAS_ORJSON", request.param)
+    return request.param
+
+
+def test_roundtrip_keeps_chinese(backend):
+    """序列化保留中文原文，并能解析回原对象"""
+    value = {"标题": "老北京胡同", "tags": ["怀旧", "文化"], "count": 3}
+    data = json_utils.dumps(value)
+
+    assert isinstance(data, bytes)
+    assert "老北京胡同" in data.decode("utf-8")
+    assert json_utils.loads(data) == value
+    assert json_utils.loads(data.decode("utf-8")) == value
+
+
+def test_dumps_non_str_keys(backend):
+    """非字符串键与标准库 json 一样转换为字符串"""
+    assert json_utils.loads(json_utils.dumps({1: "a"})) == {"1": "a"}
+
+
+def test_dumps_indent(backend):
+    """indent=True 时缩进 2 格输出"""
+    text = json_utils.dumps({"a": {"b": 1}}, indent=True).decode("utf-8")
+
+    assert text == json.dumps({"a": {"b": 1}}, indent=2)
+
+
+def test_loads_invalid_raises_json_decode_error(backend):
+    """两种实现的解析错误都是 json.JSONDecodeError"""
+    with pytest.raises(json.JSONDecodeError):
+        json_utils.loads(b"{invalid")